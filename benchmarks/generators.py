@@ -0,0 +1,179 @@
+"""
+generators.py
+=================
+
+Este módulo genera datos sintéticos con los formatos de entrada del ETL
+para medir su rendimiento a cualquier escala:
+
+- Archivos `.data` de la NOAA/PSL (línea de rango de años, bloque de 12
+  columnas por año, valor faltante declarado y texto al pie).
+- Archivos estacionales de la CPC (`SEAS YR ANOM`).
+- Series mensuales en memoria (tablas wide) para el modo por lotes.
+
+Descripción:
+------------
+- `syntheticValues`: Matriz `(series, años, 12)` de anomalías tipo ENSO con faltantes.
+- `writePSL`: Escribe una serie en formato `.data` de la PSL.
+- `writeCPC`: Escribe una serie en formato estacional de la CPC.
+- `syntheticTree`: Carpeta de datos (`raw` y `processed`) con los archivos
+  de todos los índices de `pipeline`, lista para `pipeline.buildGraph`.
+- `syntheticPSLFolder`: Carpeta `raw` con `n` archivos `.data`.
+- `syntheticBatch`: Tablas wide y nombres para `indexes.alignIndices`.
+
+Notas:
+------
+- Las anomalías son un proceso AR(1) mensual (persistencia 0.95), con
+  desviación similar a la del ONI, así que producen rachas de eventos
+  parecidas a las reales.
+- Los faltantes se escriben con los centinelas de la PSL (`-99.99`, `-99.9`,
+  `-999`); el último año queda incompleto, como en los archivos de la NOAA.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `numpy >= 1.24.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from modules import pipeline
+from modules.indexes import REGISTRO
+from modules.LongtoWide import ESTACIONES
+
+ANIO_INICIO = 1950
+CENTINELAS = (-99.99, -99.9, -999.0)
+
+
+def syntheticValues(n_series, n_anios, faltantes=0.01, meses_finales=4, semilla=0):
+    """
+    Anomalías mensuales sintéticas.
+
+    Args:
+        n_series (int): Número de series.
+        n_anios (int): Años por serie.
+        faltantes (float): Fracción de meses sin dato al azar.
+        meses_finales (int): Meses con dato del último año (el resto queda vacío).
+        semilla (int): Semilla del generador.
+
+    Returns:
+        np.ndarray: Matriz `(n_series, n_anios, 12)` con NaN en los meses sin dato.
+    """
+    rng = np.random.default_rng(semilla)
+    n_meses = n_anios * 12
+    # AR(1) sobre el mismo arreglo del ruido, sin copias
+    valores = rng.normal(0, 0.25, (n_series, n_meses))
+    valores[:, 0] *= 3
+    for mes in range(1, n_meses):
+        valores[:, mes] += 0.95 * valores[:, mes - 1]
+    np.round(valores, 2, out=valores)
+
+    valores[rng.random(valores.shape) < faltantes] = np.nan
+    valores = valores.reshape(n_series, n_anios, 12)
+    valores[:, -1, meses_finales:] = np.nan
+    return valores
+
+
+def writePSL(path, valores, anio_inicio=ANIO_INICIO, centinela=-99.99):
+    """
+    Escribe una serie `(años, 12)` en formato `.data` de la PSL.
+    """
+    anios = np.arange(anio_inicio, anio_inicio + len(valores))
+    bloque = np.where(np.isnan(valores), centinela, valores)
+    with open(path, 'w') as file:
+        file.write(f" {anios[0]:5d}        {anios[-1]:5d}\n")
+        np.savetxt(file, np.column_stack([anios, bloque]), fmt=['%5d'] + ['%7.2f'] * 12)
+        file.write(f"  {centinela}\n  Serie sintética\n  Generada para pruebas de rendimiento\n")
+    return path
+
+
+def writeCPC(path, valores, anio_inicio=ANIO_INICIO):
+    """
+    Escribe una serie `(años, 12)` en formato estacional de la CPC; cada mes
+    es el centro de su estación (`DJF` -> enero). Los meses sin dato se omiten.
+    """
+    anios = np.repeat(np.arange(anio_inicio, anio_inicio + len(valores)), 12)
+    estaciones = np.tile(ESTACIONES, len(valores))
+    planos = valores.ravel()
+    validos = ~np.isnan(planos)
+    tabla = pd.DataFrame({'SEAS': estaciones[validos], 'YR': anios[validos], 'ANOM': planos[validos]})
+    tabla.to_csv(path, sep=' ', index=False, float_format='%.2f')
+    return path
+
+
+def syntheticTree(folder, n_anios, faltantes=0.01, semilla=0):
+    """
+    Crea una carpeta de datos con un archivo sintético por cada índice de
+    `pipeline.INDICES` y `pipeline.CPC_ESTACIONALES`, con los mismos nombres
+    que los reales.
+
+    Returns:
+        str: Carpeta creada.
+    """
+    raw = os.path.join(folder, 'raw')
+    os.makedirs(raw, exist_ok=True)
+    os.makedirs(os.path.join(folder, 'processed'), exist_ok=True)
+    nombres = list(pipeline.INDICES)
+    valores = syntheticValues(len(nombres), n_anios, faltantes, semilla=semilla)
+
+    for i, nombre in enumerate(nombres):
+        if nombre in pipeline.CPC_ESTACIONALES:
+            ruta = os.path.join(folder, pipeline.CPC_ESTACIONALES[nombre])
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            writeCPC(ruta, valores[i])
+        else:
+            writePSL(os.path.join(raw, f"{nombre}.data"), valores[i], centinela=CENTINELAS[i % len(CENTINELAS)])
+    return folder
+
+
+def syntheticPSLFolder(folder, n_series, n_anios, faltantes=0.01, semilla=0):
+    """
+    Crea `<folder>/raw` con `n_series` archivos `.data` sintéticos (para
+    `convertirCSV.dataprocesser`) y `<folder>/processed`.
+
+    Returns:
+        list: Rutas de los archivos.
+    """
+    raw = os.path.join(folder, 'raw')
+    os.makedirs(raw, exist_ok=True)
+    os.makedirs(os.path.join(folder, 'processed'), exist_ok=True)
+    valores = syntheticValues(n_series, n_anios, faltantes, semilla=semilla)
+    return [writePSL(os.path.join(raw, f"serie_{i:05d}.data"), valores[i], centinela=CENTINELAS[i % len(CENTINELAS)])
+            for i in range(n_series)]
+
+
+def syntheticBatch(n_series, n_anios, faltantes=0.01, semilla=0):
+    """
+    Series en memoria para el modo por lotes, con las reglas de `REGISTRO`
+    repartidas entre ellas.
+
+    Returns:
+        tuple: (`datos`, `nombres`): tablas wide (`year`, `01` ... `12`) por
+        nombre de serie y nombre de serie -> clave de `REGISTRO`.
+    """
+    valores = syntheticValues(n_series, n_anios, faltantes, semilla=semilla)
+    claves = list(REGISTRO)
+    columnas = [f"{m:02d}" for m in range(1, 13)]
+    anios = np.arange(ANIO_INICIO, ANIO_INICIO + n_anios)
+
+    datos, nombres = {}, {}
+    for i in range(n_series):
+        nombre = f"serie_{i:05d}"
+        wide = pd.DataFrame(valores[i], columns=columnas)
+        wide.insert(0, 'year', anios)
+        datos[nombre] = wide
+        nombres[nombre] = claves[i % len(claves)]
+    return datos, nombres
@@ -0,0 +1,277 @@
+"""
+run.py
+=================
+
+Este script mide el rendimiento de cada etapa del ETL y del pipeline
+completo con datos sintéticos (ver `generators`), guarda los resultados en
+un historial y marca las regresiones respecto a las ejecuciones anteriores.
+
+Etapas:
+-------
+- `dataprocesser`: Ingesta de una carpeta de archivos `.data` de la PSL.
+- `longtowide`: Ingesta de un archivo estacional de la CPC.
+- `Classifier`: Clasificación de eventos por persistencia, una serie a la vez.
+- `processIndex`: Procesamiento completo de cada serie con `indexes.processIndex`.
+- `classifyBatch`: `indexes.alignIndices` + `indexes.classifyBatch` de todas las series.
+- `batchToLong`: Tabla final long del lote.
+- `columnEvaluation`: Intensidad sobre la tabla final long.
+- `pipeline`: Grafo completo (`pipeline.buildGraph`) sin caché, con exportaciones.
+
+Escalas:
+--------
+- `pequena`: 75 años x 8 índices (como los datos reales).
+- `mediana`: 300 años x 100 índices.
+- `grande`: 10.000 años x 1.000 índices.
+
+Uso:
+----
+    python -m benchmarks.run                         # escala pequeña
+    python -m benchmarks.run --escala mediana --etapas classifyBatch batchToLong
+    python -m benchmarks.run --anios 500 --indices 50 --tolerancia 0.2 --estricto
+
+Notas:
+------
+- Cada etapa se repite `--repeticiones` veces y se guarda el menor tiempo.
+- El historial es `benchmarks/results/history.jsonl` (una línea por etapa y
+  ejecución). La referencia de una etapa es la mediana de sus últimas
+  `--ventana` mediciones en la misma máquina y escala; si el tiempo actual
+  la supera en más de `--tolerancia` se marca como regresión y, con
+  `--estricto`, el script termina con código 1.
+- Las etapas que producen fechas (`processIndex`, `batchToLong`,
+  `columnEvaluation`, `pipeline`) se omiten con más de `MAX_ANIOS_FECHAS`
+  años, porque las fechas `datetime64[ns]` sólo llegan hasta el año 2262.
+
+Librerías requeridas:
+---------------------
+- Las del ETL (`pandas`, `numpy`, `openpyxl`).
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from modules import convertirCSV
+from modules import LongtoWide
+from modules import eventClassifier
+from modules import indexes
+from modules import monthAxis
+from modules import pipeline
+from modules import taskgraph
+from benchmarks import generators
+
+ESCALAS = {
+    'pequena': {'anios': 75, 'indices': 8},
+    'mediana': {'anios': 300, 'indices': 100},
+    'grande': {'anios': 10000, 'indices': 1000},
+}
+ETAPAS = ['dataprocesser', 'longtowide', 'Classifier', 'processIndex', 'classifyBatch',
+          'batchToLong', 'columnEvaluation', 'pipeline']
+ETAPAS_CON_FECHAS = {'processIndex', 'batchToLong', 'columnEvaluation', 'pipeline'}
+MAX_ANIOS_FECHAS = 300
+HISTORIAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'history.jsonl')
+
+
+def _medir(funcion, repeticiones):
+    # Menor tiempo de `repeticiones` llamadas; la salida impresa se descarta
+    tiempos = []
+    for _ in range(repeticiones):
+        with redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - t0)
+    return min(tiempos)
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _serieLong(wide):
+    # Tabla wide -> (`mes`, `value`) para los clasificadores
+    anios = wide['year'].to_numpy()
+    valores = wide.drop(columns='year').to_numpy()
+    meses = monthAxis.toOrdinal(np.repeat(anios, 12), np.tile(np.arange(1, 13), len(anios)))
+    validos = ~np.isnan(valores.ravel())
+    return pd.DataFrame({'mes': meses[validos], 'value': valores.ravel()[validos]})
+
+
+def runBenchmarks(anios, indices, etapas=ETAPAS, repeticiones=3, carpeta=None):
+    """
+    Mide las etapas indicadas con datos sintéticos.
+
+    Args:
+        anios (int): Años por serie.
+        indices (int): Número de series (el pipeline completo siempre usa
+            los índices de `pipeline.INDICES`).
+        etapas (list): Etapas de `ETAPAS` a medir.
+        repeticiones (int): Repeticiones por etapa.
+        carpeta (str): Carpeta de trabajo. Por defecto, una temporal.
+
+    Returns:
+        dict: Etapa -> segundos (o None si se omitió).
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory(dir=carpeta) as tmp:
+        datos, nombres = generators.syntheticBatch(indices, anios)
+        con_fechas = anios <= MAX_ANIOS_FECHAS
+        lote, tabla = None, None
+
+        for etapa in etapas:
+            if etapa in ETAPAS_CON_FECHAS and not con_fechas:
+                resultados[etapa] = None
+                continue
+
+            if etapa == 'dataprocesser':
+                carpeta_psl = os.path.join(tmp, 'psl')
+                generators.syntheticPSLFolder(carpeta_psl, indices, anios)
+                funcion = lambda: convertirCSV.dataprocesser(carpeta_psl, escribir_csv=False)
+            elif etapa == 'longtowide':
+                ruta = generators.writeCPC(os.path.join(tmp, 'cpc.ascii.txt'),
+                                           generators.syntheticValues(1, anios)[0])
+                funcion = lambda: LongtoWide.longtowide(ruta, os.path.join(tmp, 'cpc.csv'), escribir_csv=False)
+            elif etapa == 'Classifier':
+                series = [_serieLong(df) for df in datos.values()]
+                funcion = lambda: [eventClassifier.Classifier(serie, 5, -0.5, 0.5) for serie in series]
+            elif etapa == 'processIndex':
+                funcion = lambda: [indexes.processIndex(datos[nombre], indice) for nombre, indice in nombres.items()]
+            elif etapa == 'classifyBatch':
+                funcion = lambda: indexes.classifyBatch(indexes.alignIndices(datos, nombres))
+            elif etapa == 'batchToLong':
+                lote = lote or indexes.classifyBatch(indexes.alignIndices(datos, nombres))
+                funcion = lambda: indexes.batchToLong(lote)
+            elif etapa == 'columnEvaluation':
+                lote = lote or indexes.classifyBatch(indexes.alignIndices(datos, nombres))
+                tabla = indexes.batchToLong(lote) if tabla is None else tabla
+                funcion = lambda: eventClassifier.columnEvaluation(tabla.copy(), 'event', 'value', 'type')
+            elif etapa == 'pipeline':
+                carpeta_datos = generators.syntheticTree(os.path.join(tmp, 'datos'), anios)
+                salida = os.path.join(tmp, 'Indices_Total')
+                funcion = lambda: taskgraph.run(pipeline.buildGraph(carpeta_datos, salida=salida),
+                                                jobs=os.cpu_count() or 1)
+            else:
+                raise ValueError(f"Etapa desconocida: {etapa}")
+
+            resultados[etapa] = _medir(funcion, repeticiones)
+    return resultados
+
+
+def loadHistory(path=HISTORIAL):
+    """
+    Lee el historial de resultados (lista vacía si no existe).
+    """
+    try:
+        with open(path, 'r', encoding='UTF-8') as file:
+            return [json.loads(linea) for linea in file if linea.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def compareHistory(resultados, historial, escala, tolerancia=0.25, ventana=5, maquina=None):
+    """
+    Compara los resultados con la mediana de las últimas `ventana`
+    mediciones de cada etapa en la misma máquina y escala.
+
+    Returns:
+        dict: Etapa -> (`segundos`, `referencia`, `cambio` relativo, `regresion`).
+    """
+    maquina = maquina or platform.node()
+    comparacion = {}
+    for etapa, segundos in resultados.items():
+        previas = [r['segundos'] for r in historial
+                   if r['etapa'] == etapa and r['escala'] == escala and r['maquina'] == maquina
+                   and r['segundos'] is not None][-ventana:]
+        if segundos is None or not previas:
+            comparacion[etapa] = (segundos, None, None, False)
+            continue
+        referencia = statistics.median(previas)
+        cambio = segundos / referencia - 1
+        comparacion[etapa] = (segundos, referencia, cambio, cambio > tolerancia)
+    return comparacion
+
+
+def appendHistory(resultados, escala, path=HISTORIAL):
+    """
+    Agrega una línea por etapa al historial.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    comun = {'fecha': datetime.now().isoformat(timespec='seconds'), 'commit': _commit(), 'escala': escala,
+             'maquina': platform.node(), 'python': platform.python_version(),
+             'numpy': np.__version__, 'pandas': pd.__version__}
+    with open(path, 'a', encoding='UTF-8') as file:
+        for etapa, segundos in resultados.items():
+            file.write(json.dumps({**comun, 'etapa': etapa, 'segundos': segundos}, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del ETL con datos sintéticos")
+    parser.add_argument("--escala", choices=ESCALAS, default='pequena')
+    parser.add_argument("--anios", type=int, help="Años por serie (reemplaza el de la escala)")
+    parser.add_argument("--indices", type=int, help="Número de series (reemplaza el de la escala)")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=ETAPAS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento relativo de tiempo a partir del cual se marca una regresión")
+    parser.add_argument("--ventana", type=int, default=5, help="Mediciones previas para la referencia")
+    parser.add_argument("--historial", default=HISTORIAL)
+    parser.add_argument("--no-guardar", action="store_true", help="No agrega los resultados al historial")
+    parser.add_argument("--estricto", action="store_true", help="Termina con código 1 si hay regresiones")
+    args = parser.parse_args(argv)
+
+    anios = args.anios or ESCALAS[args.escala]['anios']
+    n_indices = args.indices or ESCALAS[args.escala]['indices']
+    escala = args.escala if args.anios is None and args.indices is None else f"{anios}x{n_indices}"
+
+    print(f"Escala {escala}: {anios} años x {n_indices} series")
+    resultados = runBenchmarks(anios, n_indices, args.etapas, args.repeticiones)
+    comparacion = compareHistory(resultados, loadHistory(args.historial), escala, args.tolerancia, args.ventana)
+
+    regresiones = []
+    print(f"{'etapa':<18} {'seg':>10} {'referencia':>11} {'cambio':>8}")
+    for etapa, (segundos, referencia, cambio, regresion) in comparacion.items():
+        if segundos is None:
+            print(f"{etapa:<18} {'omitida':>10}")
+            continue
+        ref = f"{referencia:.4f}" if referencia is not None else "-"
+        delta = f"{cambio:+.0%}" if cambio is not None else "-"
+        print(f"{etapa:<18} {segundos:>10.4f} {ref:>11} {delta:>8}{'  REGRESIÓN' if regresion else ''}")
+        if regresion:
+            regresiones.append(etapa)
+
+    if not args.no_guardar:
+        appendHistory(resultados, escala, args.historial)
+    if regresiones:
+        print(f"Regresiones (> {args.tolerancia:.0%}): {', '.join(regresiones)}")
+        return 1 if args.estricto else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
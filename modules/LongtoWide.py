@@ -8,14 +8,21 @@ https://www.cpc.ncep.noaa.gov/data/indices/
 
 Descripción:
 ------------
-
+- `readCPCSeasonal`: Lee un archivo estacional de la CPC (SEAS/YR/[TOTAL]/ANOM)
+  directamente como serie mensual en formato long.
+- `seasonalToWide`: Reacomoda una serie long en una tabla wide (`year`, `01` ... `12`).
+- `cpcIngest`: Ingesta (incremental) de un archivo estacional en formato long.
+- `longtowide`: Ingesta de un archivo estacional en formato wide.
 
 Parámetros de entrada:
 ----------------------
-
+- Archivos `.ascii.txt` de la CPC, p. ej. `RONI.ascii.txt` (SEAS YR ANOM) u
+  `oni.ascii.txt` (SEAS YR TOTAL ANOM).
 
 Parámetros de salida:
 ---------------------
+- Serie mensual long con las columnas `year`, `month`, `value` (ANOM) y,
+  si el archivo la trae, `total` (TOTAL).
 
 
 Librerías requeridas:
@@ -25,7 +32,10 @@ Librerías requeridas:
 
 Notas:
 ------
-
+- Cada estación se asigna a su mes central (DJF -> 01, JFM -> 02, ...,
+  NDJ -> 12) con un arreglo de búsqueda precalculado.
+- Estaciones como NDJ/DJF abarcan dos años; se conservan en el año (YR)
+  que reporta la CPC.
 
 Autor:
 ------
@@ -40,45 +50,125 @@ Fecha de creación:
 1 de noviembre de 2024
 """
 
+import os
+import numpy as np
 import pandas as pd
+from modules import manifest as ingest_manifest
+from modules.atomicWrite import writeAtomic
+
+# Estaciones de 3 meses de la CPC en el orden de su mes central (DJF -> 01 ... NDJ -> 12)
+ESTACIONES = np.array(["DJF","JFM","FMA","MAM","AMJ","MJJ","JJA","JAS","ASO","SON","OND","NDJ"])
 
+# Arreglo de búsqueda: estaciones en orden alfabético y el mes central de cada una
+_ORDEN = np.argsort(ESTACIONES)
+_ESTACIONES_ORDENADAS = ESTACIONES[_ORDEN]
+_MES_CENTRAL = (_ORDEN + 1).astype(np.int8)
 
-def longtowide(path):
-    pass
 
+def readCPCSeasonal(path):
+    """
+    Lee un archivo estacional de la CPC como serie mensual long.
+
+    Args:
+        path (str): Ruta del archivo (`RONI.ascii.txt`, `oni.ascii.txt`...).
+
+    Returns:
+        pd.DataFrame: Columnas `year`, `month` (`01` ... `12`), `value`
+        (ANOM) y `total` (TOTAL, si el archivo la trae), ordenadas por fecha.
+    """
     data = pd.read_csv(path, sep=r"\s+", encoding='Utf-8')
-    orden = ["DJF","JFM","FMA","MAM","AMJ","MJJ","JJA","JAS","ASO","SON","OND","NDJ"]
-    data["SEAS"] = pd.Categorical(data["SEAS"], categories=orden, ordered=True)
-    data = data.sort_values(["YR", "SEAS"])
-    
-
-    mes_central = {
-        "DJF": "01",  # Ene
-        "JFM": "02",  # Feb
-        "FMA": "03",
-        "MAM": "04",
-        "AMJ": "05",
-        "MJJ": "06",
-        "JJA": "07",
-        "JAS": "08",
-        "ASO": "09",
-        "SON": "10",
-        "OND": "11",
-        "NDJ": "12",
-    }
-    data["month"] = data["SEAS"].map(mes_central)
-    # Nota: estaciones como NDJ/DJF abarcan dos años; dependiendo del análisis,
-    # podrías ajustar YR para DJF/NDJ si quieres anclarlo a DIC o ENE.
-    data["date"] = pd.to_datetime(dict(year=data["YR"], month=data["month"], day=15))
-    
-
-    data = data.rename(columns={
-        "YR": "year"
-    })
 
+    seas = data["SEAS"].to_numpy(dtype=str)
+    posicion = np.searchsorted(_ESTACIONES_ORDENADAS, seas).clip(0, len(ESTACIONES) - 1)
+    desconocidas = _ESTACIONES_ORDENADAS[posicion] != seas
+    if desconocidas.any():
+        raise ValueError(f"Estaciones desconocidas en {path}: {sorted(set(seas[desconocidas]))}")
 
-    data_filtrado = data[['year', 'month', 'ANOM']]
-    
+    anios = data["YR"].to_numpy(dtype=np.int32)
+    meses = _MES_CENTRAL[posicion]
+    orden = np.lexsort((meses, anios))
 
-    wide = data_filtrado.pivot(index="year", columns="month", values="ANOM")
-    wide.to_csv('./data/processed/roni.csv', index=True)
+    long = pd.DataFrame({
+        'year': anios[orden],
+        'month': np.char.zfill(meses[orden].astype(str), 2),
+        'value': data["ANOM"].to_numpy(dtype=np.float64)[orden],
+    })
+    if "TOTAL" in data.columns:
+        long['total'] = data["TOTAL"].to_numpy(dtype=np.float64)[orden]
+
+    return long
+
+
+def seasonalToWide(long, columna='value'):
+    """
+    Reacomoda una serie long en una tabla wide (`year`, `01` ... `12`)
+    ubicando cada valor por su posición (año, mes), sin `pivot`.
+    """
+    anios = long['year'].to_numpy()
+    meses = long['month'].astype(int).to_numpy()
+    primer_anio = anios.min()
+    todos = np.arange(primer_anio, anios.max() + 1)
+
+    valores = np.full((len(todos), 12), np.nan)
+    valores[anios - primer_anio, meses - 1] = long[columna].to_numpy()
+
+    wide = pd.DataFrame(valores, columns=[f"{m:02d}" for m in range(1, 13)])
+    wide.insert(0, 'year', todos)
+    return wide
+
+
+def cpcIngest(path, output_file='./data/processed/roni.csv', incremental=False, escribir_csv=True):
+    """
+    Ingesta de un archivo estacional de la CPC como serie mensual long.
+
+    Args:
+        path (str): Ruta del archivo `.ascii.txt` de la CPC.
+        output_file (str): Ruta del `.csv` wide de salida; su nombre sin
+            extensión es el nombre del índice.
+        incremental (bool): Si es True y el archivo de entrada no cambió
+            según el manifiesto de ingesta, no se vuelve a procesar. En este
+            modo el `.csv` siempre se escribe.
+        escribir_csv (bool): Si es False, la serie sólo se devuelve en memoria.
+
+    Returns:
+        dict: Serie long con el nombre del índice (`roni`) como clave, o un
+        diccionario vacío si se omitió.
+    """
+    nombre = os.path.splitext(os.path.basename(output_file))[0]
+
+    if incremental:
+        folder_path = os.path.dirname(os.path.dirname(output_file))
+        ruta_manifest = ingest_manifest.manifestPath(folder_path)
+        manifest = ingest_manifest.loadManifest(ruta_manifest)
+        if os.path.exists(output_file) and not ingest_manifest.changedFiles([path], manifest, folder_path):
+            print(f"Sin cambios: {os.path.basename(path)}")
+            ingest_manifest.saveManifest(manifest, ruta_manifest)
+            return {}
+
+    long = readCPCSeasonal(path)
+
+    if escribir_csv or incremental:
+        # Escritura atómica: un `.csv` truncado pasaría por válido en la
+        # siguiente ejecución incremental
+        wide = seasonalToWide(long)
+        writeAtomic(lambda tmp: wide.to_csv(tmp, index=False), output_file, newline='')
+
+    if incremental:
+        ingest_manifest.updateManifest(manifest, [path], folder_path)
+        ingest_manifest.saveManifest(manifest, ruta_manifest)
+
+    return {nombre: long}
+
+
+def longtowide(path, output_file='./data/processed/roni.csv', incremental=False, escribir_csv=True):
+    """
+    Convierte un archivo estacional de la CPC (SEAS/YR/ANOM) a formato wide.
+
+    Mismos argumentos que `cpcIngest`.
+
+    Returns:
+        dict: Tabla wide (`year`, `01` ... `12`) con el nombre del índice
+        (`roni`) como clave, o un diccionario vacío si se omitió.
+    """
+    datos = cpcIngest(path, output_file, incremental=incremental, escribir_csv=escribir_csv)
+    return {nombre: seasonalToWide(long) for nombre, long in datos.items()}
@@ -0,0 +1,83 @@
+"""
+atomicWrite.py
+=================
+
+Este módulo escribe archivos de forma atómica: el contenido se escribe en un
+temporal de la misma carpeta y se renombra al final, de modo que un proceso
+interrumpido nunca deja un archivo a medias ni reemplaza el anterior.
+
+Descripción:
+------------
+- `writeAtomic`: Escribe un archivo con una función que recibe el archivo abierto.
+
+Notas:
+------
+- `tempfile.mkstemp` crea el temporal con permisos `0600` y `os.replace`
+  los conserva; antes de renombrarlo se le dan los permisos que tendría un
+  archivo creado con `open` (`0666` menos la `umask` del proceso), para que
+  otros usuarios y servicios puedan seguir leyendo las salidas.
+- `os.umask` sólo se puede consultar cambiándola. Se lee en la primera
+  escritura, bajo un candado, y se guarda para las siguientes; importar el
+  módulo no la toca.
+
+Librerías requeridas:
+---------------------
+- Sólo la librería estándar.
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import tempfile
+import threading
+
+_umask = None
+_lock = threading.Lock()
+
+
+def _leerUmask():
+    global _umask
+    with _lock:
+        if _umask is None:
+            _umask = os.umask(0o077)
+            os.umask(_umask)
+    return _umask
+
+
+def writeAtomic(escribir, path, modo='w', encoding=None, newline=None):
+    """
+    Escribe `path` de forma atómica.
+
+    Args:
+        escribir (callable): Función que recibe el archivo temporal abierto
+            y escribe el contenido (p. ej. `lambda f: df.to_csv(f, index=False)`).
+        path (str): Ruta final del archivo.
+        modo (str): Modo de apertura (`'w'` o `'wb'`).
+        encoding (str): Codificación en modo texto.
+        newline (str): Igual que en `open`; `''` para `.csv`.
+
+    Returns:
+        str: Ruta escrita.
+    """
+    carpeta = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=carpeta, prefix=".tmp_", suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, modo, encoding=encoding, newline=newline) as tmp:
+            escribir(tmp)
+        os.chmod(tmp_path, 0o666 & ~_leerUmask())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
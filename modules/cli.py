@@ -0,0 +1,247 @@
+"""
+cli.py
+=================
+
+Este módulo es la línea de comandos del ETL de los índices climáticos.
+Importar este módulo (o `main.py`) no ejecuta nada ni carga pandas: cada
+subcomando importa lo que necesita al ejecutarse, y `openpyxl` sólo se
+carga cuando se exporta a `.xlsx`.
+
+Subcomandos:
+------------
+- `run` (por defecto): Ejecuta el grafo completo (ingesta, tabla final y exportaciones).
+- `ingest`: Lee los archivos de entrada y actualiza `processed`, la copia
+  binaria de las series, el manifiesto y el detector incremental.
+- `build`: Construye la tabla final y la escribe en `.csv`.
+- `export`: Escribe la tabla final en los formatos indicados (`csv`, `xlsx`,
+  `store`, `parquet`).
+- `compact`: Borra los deltas de la exportación delta (el `.csv` ya está al
+  día) y lo vuelve a escribir si falta.
+- `status`: Muestra qué archivos de entrada cambiaron desde la última
+  ingesta, qué tareas están pendientes y la fecha de las salidas, sin
+  ejecutar nada.
+
+Opciones comunes:
+-----------------
+`--data`, `--imt` (carpeta de los archivos mensuales del IMT; sin ella el
+IMT no se incluye en la tabla final), `--salida`, `--jobs N`, `--dry-run` (sólo muestra el plan
+de tareas), `--delta` (además del `.csv`, las filas que cambiaron en un delta, ver `deltaExport`),
+`--report` (reporte JSON de tiempos y filas por etapa, ver `instrument`),
+`--memory` (como `--report` y además el pico de memoria por etapa; usa un
+solo hilo),
+`--profile` (además, un `.prof` de cProfile por etapa), `--xlsx-por-indice`
+(el `.xlsx` con una hoja por índice y las descripciones aparte, ver
+`excelExport`), `--backend` (implementación de los núcleos numéricos:
+`numpy`, `numba` o `auto`, ver `kernels`) y `--suavizar` (agrega la columna
+`type_event` con la intensidad suavizada por evento, ver `pipeline`).
+
+Ejemplos:
+---------
+    python main.py
+    python main.py ingest --jobs 4
+    python main.py export --formato xlsx
+    python main.py export --formato xlsx --xlsx-por-indice
+    python main.py status
+    python main.py --delta
+    python main.py --imt ./IMT
+    python main.py build --profile
+    python main.py --backend numba
+    python main.py --suavizar
+
+Librerías requeridas:
+---------------------
+- Las de `pipeline` (pandas y NumPy); `openpyxl` sólo para `.xlsx`,
+  `pyarrow` sólo para `parquet` y `numba` sólo para `--backend numba`.
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import time
+import argparse
+
+FORMATOS = ('csv', 'xlsx', 'store', 'parquet')
+
+
+def _opciones(parser, por_defecto=True):
+    # Con `por_defecto=False` (copias de los subcomandos) las opciones que no
+    # se escriben no aparecen en el resultado, así que no pisan las que se
+    # dieron antes del subcomando (`--jobs 3 ingest`)
+    d = (lambda valor: valor) if por_defecto else (lambda valor: argparse.SUPPRESS)
+    parser.add_argument("--data", default=d("./data"), help="Carpeta con raw y processed")
+    parser.add_argument("--imt", default=d(None),
+                        help="Carpeta con los archivos mensuales del IMT (p. ej. ./IMT); sin ella el IMT no se procesa")
+    parser.add_argument("--salida", default=d("Indices_Total"), help="Nombre base de la tabla final")
+    parser.add_argument("--jobs", type=int, default=d(os.cpu_count() or 1),
+                        help="Número de tareas que se ejecutan en paralelo")
+    parser.add_argument("--dry-run", action="store_true", default=d(False),
+                        help="Muestra el plan de tareas sin ejecutarlas")
+    parser.add_argument("--report", action="store_true", default=d(False),
+                        help="Mide cada etapa y guarda un reporte JSON en <data>/processed/reports")
+    parser.add_argument("--memory", action="store_true", default=d(False),
+                        help="Como --report y además mide el pico de memoria de cada etapa "
+                             "(tracemalloc, más lento, usa un solo hilo)")
+    parser.add_argument("--profile", action="store_true", default=d(False),
+                        help="Como --report y además guarda un perfil cProfile por etapa (usa un solo hilo)")
+    parser.add_argument("--delta", action="store_true", default=d(False),
+                        help="Además del .csv, guarda las filas que cambiaron en un delta (ver modules/deltaExport.py)")
+    parser.add_argument("--xlsx-por-indice", action="store_true", default=d(False),
+                        help="El .xlsx con una hoja por índice y las descripciones en una hoja aparte")
+    parser.add_argument("--backend", choices=("numpy", "numba", "auto"), default=d("numpy"),
+                        help="Implementación de los núcleos numéricos (ver modules/kernels.py)")
+    parser.add_argument("--suavizar", action="store_true", default=d(False),
+                        help="Agrega la columna type_event con la intensidad suavizada por evento")
+    return parser
+
+
+def _parser():
+    # Las opciones comunes se aceptan antes y después del subcomando
+    comun = _opciones(argparse.ArgumentParser(add_help=False), por_defecto=False)
+    parser = _opciones(argparse.ArgumentParser(prog="main.py", description="ETL de los índices climáticos del ENSO"))
+    subparsers = parser.add_subparsers(dest="comando")
+    subparsers.add_parser("run", parents=[comun], help="Grafo completo (por defecto)")
+    subparsers.add_parser("ingest", parents=[comun], help="Ingesta de los archivos de entrada")
+    subparsers.add_parser("build", parents=[comun], help="Tabla final en .csv")
+    export = subparsers.add_parser("export", parents=[comun], help="Exportación de la tabla final")
+    export.add_argument("--formato", nargs="+", choices=FORMATOS, default=list(FORMATOS))
+    subparsers.add_parser("status", parents=[comun], help="Estado de las entradas y salidas")
+    subparsers.add_parser("compact", parents=[comun], help="Borra los deltas ya incluidos en el .csv")
+    return parser
+
+
+def _objetivos(args):
+    if args.comando == "ingest":
+        return ['series', 'detector']
+    if args.comando == "build":
+        return ['exportar:csv']
+    if args.comando == "export":
+        return [f'exportar:{formato}' for formato in args.formato]
+    return None
+
+
+def _ejecutar(args):
+    from modules import kernels
+    from modules import pipeline
+    from modules import taskgraph
+
+    try:
+        kernels.setBackend(args.backend)
+    except ValueError as error:
+        print(error)
+        return 1
+
+    tareas = pipeline.buildGraph(args.data, imt_folder=args.imt or None, salida=args.salida, delta=args.delta,
+                                 xlsx_por_indice=args.xlsx_por_indice, suavizar=args.suavizar)
+    objetivos = _objetivos(args)
+    faltantes = [o for o in objetivos or [] if o not in {t['nombre'] for t in tareas}]
+    if faltantes:
+        print(f"Tareas no disponibles: {', '.join(faltantes)} (el formato parquet requiere pyarrow)")
+        return 1
+
+    cache_dir = os.path.join(args.data, 'processed', 'cache')
+    if args.dry_run:
+        taskgraph.run(tareas, jobs=args.jobs, cache_dir=cache_dir, dry_run=True, objetivos=objetivos)
+        return 0
+
+    envolver = None
+    if args.report or args.memory or args.profile:
+        from modules import instrument
+        ruta = os.path.join(args.data, 'processed', 'reports', f"run_{time.strftime('%Y%m%dT%H%M%S')}")
+        instrument.startReport(memoria=args.memory, perfil_dir=ruta if args.profile else None)
+        envolver = instrument.wrap
+    # cProfile perfila un hilo a la vez y el pico de `tracemalloc` es de
+    # todo el proceso: con etapas en paralelo se mezclarían entre ellas
+    jobs = 1 if args.profile or args.memory else args.jobs
+    try:
+        resultados = taskgraph.run(tareas, jobs=jobs, cache_dir=cache_dir, objetivos=objetivos, envolver=envolver)
+    finally:
+        if envolver is not None:
+            reporte = instrument.stopReport()
+    if envolver is not None:
+        reporte.update(comando=args.comando or "run", jobs=jobs,
+                       tareas=resultados['_stats'])
+        print(instrument.summary(reporte))
+        print(f"Reporte: {instrument.writeReport(reporte, ruta + '.json')}")
+
+    ejecutadas = [nombre for nombre, stats in resultados['_stats'].items() if stats['origen'] == 'ejecutada']
+    if not ejecutadas:
+        print("Sin cambios en los datos de entrada; todas las tareas se tomaron de la caché")
+    else:
+        print(f"Tareas ejecutadas: {', '.join(ejecutadas)}")
+    if 'detector' in resultados and 'detector' in ejecutadas:
+        print(f"Filas nuevas o con evento modificado: {len(resultados['detector'])}")
+    return 0
+
+
+def _status(args):
+    from modules import manifest
+    from modules import pipeline
+    from modules import taskgraph
+
+    entradas = pipeline.inputFiles(args.data, args.imt or None)
+    guardado = manifest.loadManifest(manifest.manifestPath(args.data))
+    cambiados = set(manifest.changedFiles(list(entradas.values()), dict(guardado), args.data))
+
+    print("Entradas:")
+    for nombre, file_path in entradas.items():
+        clave = os.path.relpath(file_path, args.data).replace(os.sep, "/")
+        if clave not in guardado:
+            estado = "nuevo"
+        elif file_path in cambiados:
+            estado = "modificado"
+        else:
+            estado = "sin cambios"
+        print(f"  {nombre:<10} {clave:<60} {estado}")
+
+    tareas = pipeline.buildGraph(args.data, imt_folder=args.imt or None, salida=args.salida, delta=args.delta,
+                                 xlsx_por_indice=args.xlsx_por_indice, suavizar=args.suavizar)
+    en_cache = taskgraph.cacheStatus(tareas, os.path.join(args.data, 'processed', 'cache'))
+    pendientes = [nombre for nombre, vigente in en_cache.items() if not vigente]
+    print(f"Tareas pendientes: {', '.join(pendientes) if pendientes else 'ninguna'}")
+
+    print("Salidas:")
+    for salida in (f"{args.salida}.csv", f"{args.salida}.xlsx", f"{args.salida}_store",
+                   f"{args.salida}_parquet"):
+        if os.path.exists(salida):
+            fecha = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(salida)))
+        else:
+            fecha = "no existe"
+        print(f"  {salida:<71} {fecha}")
+    return 0
+
+
+def _compact(args):
+    from modules import deltaExport
+
+    if deltaExport.loadManifest(f"{args.salida}_deltas")['base'] is None:
+        print(f"No hay exportaciones delta de {args.salida}")
+        return 1
+    datos = deltaExport.compact(args.salida)
+    print(f"{datos['tabla']['archivo']} compactado en la versión {datos['base']['version']} "
+          f"({datos['tabla']['filas']} filas)")
+    return 0
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: Código de salida.
+    """
+    args = _parser().parse_args(argv)
+    if args.comando == "status":
+        return _status(args)
+    if args.comando == "compact":
+        return _compact(args)
+    return _ejecutar(args)
@@ -1,69 +1,368 @@
+"""
+convertirCSV.py
+=================
+
+Este módulo convierte los archivos `.data` de la NOAA/PSL (formato de tabla
+anual con una fila por año y una columna por mes) en archivos `.csv` con
+formato wide.
+
+https://psl.noaa.gov/data/climateindices/list/
+
+Descripción:
+------------
+- `parsePSL`: Decodifica un archivo `.data` completo en un arreglo `(años, 12)`.
+- `dataprocesser`: Procesa todos los archivos de `raw`, en serie o repartiendo
+  los archivos en un grupo de procesos, y devuelve sus tablas wide en memoria.
+  Los `.csv` de `processed` son una salida opcional.
+- `readIMT` / `latestIMT` / `imtIngest`: Leen la tabla wide del IMT de los
+  archivos `IMT/Valores_mensuales_*.xlsx` de la DIMAR/CCCP.
+
+Formato PSL:
+------------
+La primera línea con dos enteros contiene el rango de años (`1950 2025`);
+antes de ella puede haber líneas de encabezado. Le siguen
+exactamente `fin - inicio + 1` filas con el año y los valores mensuales, una
+línea con el valor usado para los datos faltantes (`-99.90`, `-99.99`,
+`-999.00`...) y, al final, las notas de la fuente.
+
+Formato IMT:
+------------
+La hoja `IMT tabla` tiene una fila por año y una columna por trimestre
+móvil (`DEF`, `EFM` ... `NDE`); cada trimestre se asigna a su mes central,
+igual que el ONI de la PSL (`DEF` -> `01`).
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `numpy >= 1.24.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.1
+
+Fecha de creación:
+------------------
+1 de noviembre de 2024
+"""
 
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+from modules import manifest as ingest_manifest
+from modules.atomicWrite import writeAtomic
 
-def dataprocesser(folder_path, expected_months=12):
-    
-    folder_raw = os.path.join(folder_path,"raw")
-    
-    for file_name in os.listdir(folder_raw):
-        file_path = os.path.join(folder_raw, file_name)
-        file_outpath = os.path.join(folder_path, "processed")
-        
-        if not os.path.isfile(file_path):
+# Valores centinela de datos faltantes usados en los archivos de la NOAA/PSL
+SENTINELAS = np.array([-99.9, -99.99, -999.0, -99.0])
+
+# Meses en los nombres de los archivos mensuales del IMT (`Valores_mensuales__ENERO_2026.xlsx`)
+MESES_IMT = {'ENERO': 1, 'FEBRERO': 2, 'MARZO': 3, 'ABRIL': 4, 'MAYO': 5, 'JUNIO': 6, 'JULIO': 7,
+             'AGOSTO': 8, 'SEPTIEMBRE': 9, 'OCTUBRE': 10, 'NOVIEMBRE': 11, 'DICIEMBRE': 12}
+
+
+def _esRangoAnios(tokens):
+    return len(tokens) == 2 and all(t.lstrip('-').isdigit() for t in tokens)
+
+
+def _parseFilas(lineas, expected_months):
+    """
+    Decodifica fila por fila un bloque irregular (filas incompletas o tokens
+    no numéricos). Sólo se usa cuando el bloque no es rectangular.
+    """
+    anios = []
+    filas = []
+    bad_rows = 0
+
+    for line in lineas:
+        columns = re.split(r"\s+", line.strip())
+        try:
+            year = int(columns[0])
+        except ValueError:
+            bad_rows += 1
             continue
 
-        print(f"Procesando archivo: {file_name}")
+        fila = np.full(expected_months, np.nan)
+        valores = pd.to_numeric(pd.Series(columns[1:expected_months + 1], dtype=object), errors='coerce')
+        fila[:len(valores)] = valores.to_numpy(dtype=float)
+        anios.append(year)
+        filas.append(fila)
 
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
+    if not filas:
+        return np.empty(0, dtype=int), np.empty((0, expected_months)), bad_rows
 
-        data = []
-        bad_rows = 0
+    return np.array(anios), np.vstack(filas), bad_rows
 
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("Nino") or "https://" in line:
-                continue
 
-            columns = re.split(r"\s+", line)
-            if len(columns) < 2:
-                bad_rows += 1
-                continue
+def parsePSL(file_path, expected_months=12):
+    """
+    Lee un archivo `.data` de la NOAA/PSL y devuelve sus valores como arreglo.
 
+    Usa la línea de rango de años (`1950 2025`) para ubicar el bloque de
+    datos y lo decodifica completo en una sola llamada de NumPy. Los valores
+    centinela (los de `SENTINELAS` y el declarado al final del bloque) se
+    reemplazan por NaN con una máscara vectorizada.
+
+    Args:
+        file_path (str): Ruta del archivo `.data`.
+        expected_months (int): Número de columnas de valores por año.
+
+    Returns:
+        tuple: (`anios` (np.ndarray de int), `valores` (np.ndarray `(años, expected_months)`),
+        `bad_rows` (int) con las líneas descartadas dentro del bloque).
+        Si el archivo no tiene una línea de rango de años lo informa y
+        devuelve `None`.
+    """
+    with open(file_path, 'r') as file:
+        lines = file.read().splitlines()
+
+    # --- 1) Ubicar la línea con el rango de años (puede haber texto antes) ---
+    inicio = None
+    for i, line in enumerate(lines):
+        tokens = line.split()
+        if _esRangoAnios(tokens) and int(tokens[0]) <= int(tokens[1]):
+            inicio = i
+            anio_inicio, anio_fin = int(tokens[0]), int(tokens[1])
+            break
+
+    if inicio is None:
+        print(f"Sin línea de rango de años, se omite: {os.path.basename(file_path)}")
+        return None
+
+    n_anios = anio_fin - anio_inicio + 1
+    bloque = lines[inicio + 1:inicio + 1 + n_anios]
+
+    # El valor faltante declarado por la fuente va justo después del bloque
+    faltante = []
+    if inicio + 1 + n_anios < len(lines):
+        pie = lines[inicio + 1 + n_anios].split()
+        if len(pie) == 1:
             try:
-                year = int(columns[0])
+                faltante = [float(pie[0])]
             except ValueError:
-                bad_rows += 1
-                continue
-
-            raw_values = columns[1:]
-
-            # Normaliza a EXACTAMENTE expected_months
-            normalized = []
-            for i in range(expected_months):
-                if i < len(raw_values):
-                    v = raw_values[i]
-                    if v in {'-99.90','-99.99', '-999',  '-99', 'NA', 'NaN', 'nan', '-999.0'}:
-                        normalized.append(None)
-                    else:
-                        try:
-                            normalized.append(float(v))
-                        except ValueError:
-                            normalized.append(None)
-                else:
-                    normalized.append(None)
-
-            data.append([year] + normalized)
-
-        if not data:
+                pass
+
+    # --- 2) Decodificar el bloque completo de una vez ---
+    bad_rows = 0
+    try:
+        tabla = np.array(" ".join(bloque).split(), dtype=float)
+        tabla = tabla.reshape(len(bloque), expected_months + 1)
+        anios = tabla[:, 0].astype(int)
+        valores = tabla[:, 1:]
+    except ValueError:
+        anios, valores, bad_rows = _parseFilas(bloque, expected_months)
+
+    # --- 3) Máscara vectorizada de centinelas ---
+    centinelas = np.concatenate((SENTINELAS, faltante))
+    valores[np.isin(valores, centinelas)] = np.nan
+
+    return anios, valores, bad_rows
+
+
+def _escribirCSV(df, output_file):
+    # `.csv` atómico: un proceso interrumpido nunca deja un archivo a medias
+    writeAtomic(lambda tmp: df.to_csv(tmp, sep=',', header=True, index=False), output_file, newline='')
+
+
+def processFile(file_path, file_outpath, expected_months=12, escribir_csv=True):
+    """
+    Procesa un archivo `.data` y devuelve su tabla wide junto con sus
+    estadísticas de ingesta.
+    """
+    t0 = time.perf_counter()
+    file_name = os.path.basename(file_path)
+    stats = {'archivo': file_name, 'filas': 0, 'filas_descartadas': 0, 'segundos': 0.0, 'salida': None}
+    df = None
+
+    resultado = parsePSL(file_path, expected_months)
+
+    if resultado is not None and len(resultado[0]) > 0:
+        anios, valores, bad_rows = resultado
+
+        column_names = [f"{m:02d}" for m in range(1, expected_months + 1)]
+        df = pd.DataFrame(valores, columns=column_names)
+        df.insert(0, 'year', anios)
+        stats.update(filas=len(df), filas_descartadas=bad_rows)
+
+        if escribir_csv:
+            output_file = os.path.join(file_outpath, f"{os.path.splitext(file_name)[0]}.csv")
+            _escribirCSV(df, output_file)
+            stats['salida'] = output_file
+
+    stats['segundos'] = time.perf_counter() - t0
+    return df, stats
+
+
+def _reportar(resultados):
+    datos = {}
+    for df, stats in resultados:
+        file_name = stats['archivo']
+        if df is None:
             print(f"No se encontraron datos válidos en {file_name}")
             continue
+        destino = stats['salida'] or "memoria"
+        print(f"Archivo procesado: {file_name} -> {destino} (filas: {stats['filas']}, "
+              f"líneas descartadas/atípicas: {stats['filas_descartadas']}, {stats['segundos']:.3f} s)")
+        df.attrs['ingesta'] = stats
+        datos[os.path.splitext(file_name)[0]] = df
+    return datos
+
+
+def dataprocesser(folder_path, expected_months=12, workers=1, incremental=False, escribir_csv=True):
+    """
+    Procesa todos los archivos de `<folder_path>/raw` y devuelve sus tablas
+    wide. Opcionalmente escribe cada tabla como `.csv` en `<folder_path>/processed`.
+
+    Args:
+        folder_path (str): Carpeta que contiene `raw` y `processed`.
+        expected_months (int): Número de columnas de valores por año.
+        workers (int): Número de procesos para la ingesta. Con 1 los archivos
+            se procesan en serie; con `None` se usan todos los núcleos.
+        incremental (bool): Si es True, sólo se procesan los archivos cuyo
+            contenido cambió según el manifiesto de ingesta (o cuyo `.csv`
+            de salida no existe). En este modo los `.csv` siempre se
+            escriben, porque son la copia de los índices que no cambian.
+        escribir_csv (bool): Si es False, las tablas sólo se devuelven en memoria.
+
+    Returns:
+        dict: Tablas wide (`year`, `01` ... `12`) con el nombre del archivo
+        sin extensión como clave. Las estadísticas de cada archivo (`filas`,
+        `filas_descartadas`, `segundos`, `salida`) quedan en
+        `df.attrs['ingesta']`. En modo incremental sólo se incluyen los
+        índices modificados.
+    """
+    folder_raw = os.path.join(folder_path,"raw")
+    file_outpath = os.path.join(folder_path, "processed")
+    escribir_csv = escribir_csv or incremental
+
+    archivos = [os.path.join(folder_raw, file_name) for file_name in sorted(os.listdir(folder_raw))]
+    archivos = [file_path for file_path in archivos if os.path.isfile(file_path)]
+
+    if incremental:
+        ruta_manifest = ingest_manifest.manifestPath(folder_path)
+        manifest = ingest_manifest.loadManifest(ruta_manifest)
+        sin_salida = [file_path for file_path in archivos
+                      if not os.path.exists(os.path.join(file_outpath, f"{os.path.splitext(os.path.basename(file_path))[0]}.csv"))]
+        cambiados = set(ingest_manifest.changedFiles(archivos, manifest, folder_path)) | set(sin_salida)
+        for file_path in archivos:
+            if file_path not in cambiados:
+                print(f"Sin cambios: {os.path.basename(file_path)}")
+        archivos = [file_path for file_path in archivos if file_path in cambiados]
+
+    if workers == 1 or len(archivos) <= 1:
+        resultados = (processFile(file_path, file_outpath, expected_months, escribir_csv) for file_path in archivos)
+        datos = _reportar(resultados)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = [pool.submit(processFile, file_path, file_outpath, expected_months, escribir_csv)
+                       for file_path in archivos]
+            datos = _reportar(futuro.result() for futuro in as_completed(futuros))
+
+    if incremental:
+        ingest_manifest.updateManifest(manifest, archivos, folder_path)
+        ingest_manifest.saveManifest(manifest, ruta_manifest)
+
+    # Orden estable de las claves, sin importar el orden en que terminen los procesos
+    return {nombre: datos[nombre] for nombre in sorted(datos)}
+
+
+def _fechaIMT(file_name):
+    """
+    Año y mes de publicación de un archivo mensual del IMT, tomados del nombre
+    (`..._AGOSTO_2025...` o, si no tiene el mes escrito, `..._202508_...`).
+    """
+    nombre = re.search(r"(" + "|".join(MESES_IMT) + r")_(\d{4})", file_name.upper())
+    if nombre:
+        return int(nombre.group(2)), MESES_IMT[nombre.group(1)]
+    numerico = re.search(r"_(\d{4})(\d{2})_", file_name)
+    if numerico:
+        return int(numerico.group(1)), int(numerico.group(2))
+    return None
+
+
+def latestIMT(folder_path):
+    """
+    Devuelve la ruta del archivo `Valores_mensuales_*.xlsx` más reciente de
+    `folder_path`, o `None` si no hay ninguno con fecha reconocible.
+    """
+    candidatos = []
+    for file_name in os.listdir(folder_path):
+        if not (file_name.startswith("Valores_mensuales") and file_name.endswith(".xlsx")):
+            continue
+        fecha = _fechaIMT(file_name)
+        if fecha is not None:
+            candidatos.append((fecha, file_name))
+
+    if not candidatos:
+        return None
+    return os.path.join(folder_path, max(candidatos)[1])
+
+
+def readIMT(file_path, sheet_name='IMT tabla'):
+    """
+    Lee la tabla anual del IMT de un archivo mensual de la DIMAR/CCCP.
+
+    Args:
+        file_path (str): Ruta del archivo `.xlsx`.
+        sheet_name (str): Hoja con un año por fila y los trimestres en columnas.
+
+    Returns:
+        pd.DataFrame: Tabla wide (`year`, `01` ... `12`); los trimestres aún
+        sin publicar quedan como NaN.
+    """
+    tabla = pd.read_excel(file_path, sheet_name=sheet_name)
+    valores = tabla.iloc[:, 1:13].to_numpy(dtype=float)
+
+    df = pd.DataFrame(valores, columns=[f"{m:02d}" for m in range(1, 13)])
+    df.insert(0, 'year', tabla.iloc[:, 0].to_numpy(dtype=int))
+    return df
+
+
+def imtIngest(folder_path, output_file='./data/processed/imt.csv', incremental=False, escribir_csv=True):
+    """
+    Ingesta del archivo mensual más reciente del IMT.
+
+    Args:
+        folder_path (str): Carpeta con los archivos `Valores_mensuales_*.xlsx`.
+        output_file (str): Ruta del `.csv` wide de salida; su nombre sin
+            extensión es el nombre del índice.
+        incremental (bool): Si es True y el archivo más reciente no cambió
+            según el manifiesto de ingesta, no se vuelve a procesar. En este
+            modo el `.csv` siempre se escribe.
+        escribir_csv (bool): Si es False, la tabla sólo se devuelve en memoria.
+
+    Returns:
+        dict: Tabla wide con el nombre del índice (`imt`) como clave, o un
+        diccionario vacío si se omitió o no hay archivos.
+    """
+    nombre = os.path.splitext(os.path.basename(output_file))[0]
+    file_path = latestIMT(folder_path)
+    if file_path is None:
+        print(f"No se encontraron archivos del IMT en {folder_path}")
+        return {}
+
+    if incremental:
+        data_path = os.path.dirname(os.path.dirname(output_file))
+        ruta_manifest = ingest_manifest.manifestPath(data_path)
+        manifest = ingest_manifest.loadManifest(ruta_manifest)
+        if os.path.exists(output_file) and not ingest_manifest.changedFiles([file_path], manifest, data_path):
+            print(f"Sin cambios: {os.path.basename(file_path)}")
+            ingest_manifest.saveManifest(manifest, ruta_manifest)
+            return {}
+
+    df = readIMT(file_path)
+    print(f"Archivo procesado: {os.path.basename(file_path)} (filas: {len(df)})")
+
+    if escribir_csv or incremental:
+        _escribirCSV(df, output_file)
 
-        column_names = ['year'] + [f"{m:02d}" for m in range(1, expected_months + 1)]
-        df = pd.DataFrame(data, columns=column_names)
+    if incremental:
+        ingest_manifest.updateManifest(manifest, [file_path], data_path)
+        ingest_manifest.saveManifest(manifest, ruta_manifest)
 
-        output_file = os.path.join(file_outpath, f"{os.path.splitext(file_name)[0]}.csv")
-        df.to_csv(output_file, sep=',', header=True, index=False)
-        print(f"Archivo guardado: {output_file} (líneas descartadas/atípicas: {bad_rows})")
+    return {nombre: df}
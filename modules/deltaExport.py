@@ -0,0 +1,260 @@
+"""
+deltaExport.py
+=================
+
+Este módulo exporta la tabla final (`Indices_Total.csv`) en modo delta: en
+cada ejecución compara la tabla nueva con la última exportada por
+(`index_name`, `date`) y escribe las filas nuevas, modificadas o eliminadas
+en un archivo delta con fecha, para los consumidores que sincronizan por
+cambios. El `.csv` completo se reescribe (de forma atómica) en la misma
+ejecución, así que quien lo lee directamente (p. ej.
+`scripts/CreacionTablas.py`) siempre ve la última tabla.
+
+Descripción:
+------------
+- `diffTables`: Filas que cambian entre dos versiones de la tabla.
+- `applyDelta`: Aplica un delta a una tabla (lo que hace un consumidor).
+- `exportDelta`: Escribe el delta de una ejecución, el `.csv` completo y
+  actualiza el manifiesto.
+- `compact`: Descarta los deltas ya incluidos en el `.csv`.
+- `loadManifest`: Lee el manifiesto de la carpeta de deltas.
+
+Estructura de la carpeta:
+-------------------------
+    Indices_Total_deltas/
+    ├─ manifest.json
+    ├─ estado/                                (última tabla, ver `store.saveTable`)
+    ├─ delta_000002_20261017T120000.csv
+    └─ ...
+
+Manifiesto:
+-----------
+    {"version": 3,
+     "tabla": {"archivo": "Indices_Total.csv", "version": 3, "filas": 7720, "sha256": "..."},
+     "base": {"version": 1},
+     "deltas": [{"version": 2, "archivo": "delta_000002_....csv", "fecha": "...",
+                 "nuevas": 2, "modificadas": 1, "eliminadas": 0, "sha256": "..."}, ...]}
+
+`tabla` describe el `.csv` completo, que siempre está en la última versión.
+Un consumidor que tiene la versión `v` aplica, en orden, los deltas con
+`version > v`; si `v` es menor que `base.version` (los deltas que le
+faltan ya se descartaron) vuelve a descargar el `.csv`.
+
+Notas:
+------
+- Cada delta tiene las columnas de la tabla y una columna `cambio`
+  (`nueva`, `modificada` o `eliminada`).
+- La comparación se hace contra la copia binaria de la última tabla
+  (`estado`), no contra el `.csv`, así que no se vuelve a leer texto.
+- Se compacta cuando se acumulan `compactar_cada` deltas; compactar sólo
+  borra deltas, el `.csv` ya está al día.
+- Las filas nuevas y modificadas se aplican como reemplazo por clave, así
+  que aplicar dos veces un mismo delta no cambia el resultado.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from modules import store
+from modules import manifest
+from modules.atomicWrite import writeAtomic
+
+CLAVES = ('index_name', 'date')
+MANIFEST_NAME = "manifest.json"
+ESTADO = "estado"
+
+
+def _normalizar(tabla):
+    # Categorías -> texto para comparar tablas leídas de `store` con tablas en memoria
+    return tabla.astype({c: object for c in tabla.columns if isinstance(tabla[c].dtype, pd.CategoricalDtype)})
+
+
+def diffTables(anterior, nueva, claves=CLAVES):
+    """
+    Compara dos versiones de la tabla por sus claves.
+
+    Args:
+        anterior (pd.DataFrame): Tabla exportada anteriormente.
+        nueva (pd.DataFrame): Tabla nueva.
+        claves (tuple): Columnas que identifican una fila.
+
+    Returns:
+        pd.DataFrame: Filas nuevas y modificadas (con los valores de `nueva`)
+        y eliminadas (con sus últimos valores), con la columna `cambio`.
+    """
+    claves = list(claves)
+    orden = list(nueva.columns) + ['cambio']
+    columnas = [c for c in nueva.columns if c not in claves]
+    anterior = _normalizar(anterior).set_index(claves)
+    nueva = _normalizar(nueva).set_index(claves)
+
+    comunes = nueva.index.intersection(anterior.index)
+    a = anterior.loc[comunes, columnas].to_numpy(dtype=object)
+    n = nueva.loc[comunes, columnas].to_numpy(dtype=object)
+    iguales = (a == n) | (pd.isna(a) & pd.isna(n))
+    modificadas = comunes[~iguales.all(axis=1)]
+
+    partes = [
+        nueva.loc[~nueva.index.isin(anterior.index)].assign(cambio='nueva'),
+        nueva.loc[modificadas].assign(cambio='modificada'),
+        anterior.loc[~anterior.index.isin(nueva.index), columnas].assign(cambio='eliminada'),
+    ]
+    partes = [p for p in partes if len(p)]
+    if not partes:
+        return pd.DataFrame(columns=orden)
+    return pd.concat(partes, axis=0).reset_index()[orden]
+
+
+def applyDelta(tabla, delta, claves=CLAVES):
+    """
+    Aplica un delta de `diffTables` a una tabla: reemplaza las filas que ya
+    existen, quita las eliminadas y agrega las demás al final. Aplicar dos
+    veces el mismo delta no cambia el resultado.
+
+    Returns:
+        pd.DataFrame: Tabla actualizada, con las columnas de `tabla`.
+    """
+    claves = list(claves)
+    tabla = _normalizar(tabla).reset_index(drop=True)
+    if 'date' in claves:
+        delta = delta.assign(date=pd.to_datetime(delta['date']))
+    indice = pd.MultiIndex.from_frame(tabla[claves])
+
+    eliminada = delta['cambio'].to_numpy() == 'eliminada'
+    cambios = delta.loc[~eliminada, tabla.columns]
+    cambian = pd.MultiIndex.from_frame(cambios[claves])
+    existe = cambian.isin(indice)
+
+    actualizada = tabla.copy()
+    posicion = pd.Series(np.arange(len(tabla)), index=indice)
+    actualizada.iloc[posicion.loc[cambian[existe]].to_numpy()] = cambios.loc[existe].to_numpy()
+
+    eliminadas = indice.isin(pd.MultiIndex.from_frame(delta.loc[eliminada, claves]))
+    return pd.concat([actualizada.loc[~eliminadas], cambios.loc[~existe]], ignore_index=True)
+
+
+def loadManifest(folder):
+    """
+    Lee el manifiesto de la carpeta de deltas (vacío si no existe).
+    """
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME), 'r', encoding='UTF-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'version': 0, 'tabla': None, 'base': None, 'deltas': []}
+
+
+def _guardarManifest(datos, folder):
+    writeAtomic(lambda tmp: json.dump(datos, tmp, indent=2, ensure_ascii=False),
+                os.path.join(folder, MANIFEST_NAME), encoding='UTF-8', newline='')
+
+
+def _escribirTabla(tabla, salida, datos):
+    # `.csv` completo en la versión actual del manifiesto
+    path = f"{salida}.csv"
+    writeAtomic(lambda tmp: tabla.to_csv(tmp, index=False), path, encoding='UTF-8', newline='')
+    datos['tabla'] = {'archivo': os.path.basename(path), 'version': datos['version'], 'filas': len(tabla),
+                      'sha256': manifest.fileSignature(path)['sha256']}
+
+
+def compact(salida, datos=None):
+    """
+    Mueve la base del manifiesto a la versión actual y borra los deltas (ya
+    incluidos en el `.csv`). Si falta el `.csv`, lo vuelve a escribir desde
+    `estado`.
+
+    Args:
+        salida (str): Nombre base de la tabla final (p. ej. 'Indices_Total').
+        datos (dict): Manifiesto ya cargado. Por defecto, se lee.
+
+    Returns:
+        dict: Manifiesto actualizado.
+    """
+    folder = f"{salida}_deltas"
+    datos = datos or loadManifest(folder)
+    if not os.path.exists(f"{salida}.csv"):
+        _escribirTabla(store.loadTable(os.path.join(folder, ESTADO), mmap=False), salida, datos)
+
+    datos['base'] = {'version': datos['version']}
+    anteriores, datos['deltas'] = datos['deltas'], []
+    _guardarManifest(datos, folder)
+    # Los deltas se borran después de que el manifiesto deja de nombrarlos
+    for entrada in anteriores:
+        delta_path = os.path.join(folder, entrada['archivo'])
+        if os.path.exists(delta_path):
+            os.remove(delta_path)
+    return datos
+
+
+def exportDelta(tabla, salida, compactar_cada=30):
+    """
+    Exporta la tabla final en modo delta.
+
+    La primera vez (o si falta el `.csv`) escribe la tabla completa como
+    base. Después escribe un delta con las filas que cambiaron respecto a
+    la última exportación y reescribe el `.csv`; si no cambió nada no
+    escribe archivos.
+
+    Args:
+        tabla (pd.DataFrame): Tabla final.
+        salida (str): Nombre base de la tabla final (p. ej. 'Indices_Total').
+        compactar_cada (int): Número de deltas a partir del cual se compacta.
+
+    Returns:
+        dict: Manifiesto actualizado.
+    """
+    folder = f"{salida}_deltas"
+    os.makedirs(folder, exist_ok=True)
+    datos = loadManifest(folder)
+    estado = os.path.join(folder, ESTADO)
+
+    if datos['base'] is None or not os.path.exists(f"{salida}.csv") or not store.loadMetadata(estado):
+        datos['version'] += 1
+        _escribirTabla(tabla, salida, datos)
+        datos = compact(salida, datos)
+        store.saveTable(tabla, estado)
+        return datos
+
+    delta = diffTables(store.loadTable(estado, mmap=False), tabla)
+    if delta.empty:
+        return datos
+
+    datos['version'] += 1
+    archivo = f"delta_{datos['version']:06d}_{datetime.now():%Y%m%dT%H%M%S}.csv"
+    delta_path = os.path.join(folder, archivo)
+    writeAtomic(lambda tmp: delta.to_csv(tmp, index=False), delta_path, encoding='UTF-8', newline='')
+    conteo = delta['cambio'].value_counts()
+    datos['deltas'].append({
+        'version': datos['version'], 'archivo': archivo, 'fecha': datetime.now().isoformat(timespec='seconds'),
+        'nuevas': int(conteo.get('nueva', 0)), 'modificadas': int(conteo.get('modificada', 0)),
+        'eliminadas': int(conteo.get('eliminada', 0)), 'sha256': manifest.fileSignature(delta_path)['sha256'],
+    })
+
+    _escribirTabla(tabla, salida, datos)
+    if len(datos['deltas']) >= compactar_cada:
+        datos = compact(salida, datos)
+    else:
+        _guardarManifest(datos, folder)
+    # El estado se guarda al final: si el proceso se corta antes, la
+    # próxima ejecución repite el delta y aplicarlo dos veces no cambia nada
+    store.saveTable(tabla, estado)
+    return datos
@@ -0,0 +1,134 @@
+"""
+detector.py
+=================
+
+Este módulo mantiene el detector incremental de eventos: guarda, por índice,
+el estado de la racha final (lado, inicio, largo y si ya se confirmó como
+evento) y, cuando llegan meses nuevos, sólo actualiza esa racha en lugar de
+volver a clasificar la serie completa.
+
+Descripción:
+------------
+- `statePath`: Ruta del archivo de estado para una carpeta de datos.
+- `loadState` / `saveState`: Leen y escriben el estado de todos los índices.
+- `initState`: Construye el estado de un índice a partir de su historia.
+- `update`: Agrega los meses nuevos de cada índice y devuelve sólo las filas
+  de la tabla final que son nuevas o cuyo evento cambió.
+
+Notas:
+------
+- El costo de una actualización mensual es constante por índice; el
+  reetiquetado retroactivo cuando una racha llega a la duración mínima
+  (5 meses) se devuelve como parte del delta.
+- El detector sólo agrega meses: si la fuente corrige valores ya
+  publicados, la tabla completa se regenera con `pipeline.buildTable` y el
+  estado se reconstruye con `initState`.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `numpy >= 1.24.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from modules import indexes
+from modules.atomicWrite import writeAtomic
+from modules.eventClassifier import streamInit, streamUpdate
+
+STATE_NAME = "detector.json"
+
+
+def statePath(folder_path):
+    """
+    Ruta del estado del detector para una carpeta de datos (`./data`).
+    """
+    return os.path.join(folder_path, "processed", STATE_NAME)
+
+
+def loadState(path):
+    """
+    Lee el estado del detector. Si no existe o está dañado devuelve un estado vacío.
+    """
+    try:
+        with open(path, 'r', encoding='UTF-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def saveState(estados, path):
+    """
+    Escribe el estado del detector de forma atómica.
+    """
+    writeAtomic(lambda tmp: json.dump(estados, tmp, indent=2, sort_keys=True), path, encoding='UTF-8')
+
+
+def initState(df, indice):
+    """
+    Construye el estado del detector de un índice a partir de su historia.
+
+    Args:
+        df (pd.DataFrame): Tabla wide o long del índice.
+        indice (str): Clave del índice en `REGISTRO`.
+
+    Returns:
+        dict: Estado de `eventClassifier.streamInit` con la clave del índice en `indice`.
+    """
+    lote = indexes.alignIndices({indice: df}, {indice: indice})
+    estado = streamInit(lote['valores'][0], lote['calendario'], *indexes.eventParameters(indice))
+    estado['indice'] = indice
+    return estado
+
+
+def update(estados, datos, nombres):
+    """
+    Agrega al detector los meses nuevos de cada índice.
+
+    Args:
+        estados (dict): Estado por nombre de archivo (ver `loadState`); se
+            actualiza en el lugar. Los índices sin estado se inicializan con
+            su historia completa y no producen delta.
+        datos (dict): Tablas wide o long con el nombre del archivo como clave.
+        nombres (dict): Nombre del archivo -> clave del índice en `REGISTRO`.
+
+    Returns:
+        pd.DataFrame: Filas de la tabla final (mismas columnas que
+        `pipeline.buildTable`) nuevas o cuyo evento cambió.
+    """
+    deltas = []
+    for archivo, indice in nombres.items():
+        if archivo not in datos:
+            continue
+        if archivo not in estados or estados[archivo].get('indice') != indice:
+            estados[archivo] = initState(datos[archivo], indice)
+            continue
+
+        estado = estados[archivo]
+        lote = indexes.alignIndices({archivo: datos[archivo]}, {archivo: indice})
+        nuevos = lote['calendario'] > (estado['ultimo_mes'] if estado['ultimo_mes'] is not None else -np.inf)
+        meses, valores, codigos = streamUpdate(estado, lote['calendario'][nuevos], lote['valores'][0, nuevos])
+        if len(meses) == 0:
+            continue
+
+        cambios = {'indices': [indice], 'calendario': meses, 'valores': valores[None, :]}
+        deltas.append(indexes.batchToLong(indexes.classifyBatch(cambios, evento=codigos[None, :])))
+
+    if not deltas:
+        return pd.DataFrame(columns=indexes.COLUMNAS)
+    return pd.concat(deltas, ignore_index=True)
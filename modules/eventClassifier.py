@@ -7,13 +7,24 @@ y evaluar otros atributos requeridos para el seguimiento de El Niño Oscilación
 
 Descripción:
 ------------
-- `oniClassifier`: Identifica eventos climáticos (El Niño, La Niña y Neutro) basados en un índice climático (ONI).
+- `Classifier`: Identifica eventos climáticos (El Niño, La Niña y Neutro) basados en un índice climático (ONI).
+- `SOIClassifier`: Igual que `Classifier` para índices de polaridad invertida (SOI).
+- `MEIClassifier`: Clasifica eventos del MEI por umbral, mes a mes.
+- `persistenceCodes`: Códigos de evento por persistencia (rachas) alineados por posición con los valores.
+- `persistenceMatrix`: `persistenceCodes` para una matriz `(series, meses)` con parámetros por fila.
+- `streamInit` / `streamUpdate`: Detector incremental que sólo actualiza la racha final al agregar meses.
+- `persistenceSweep` / `sweepGrid`: Clasificación bajo una grilla de umbrales y duraciones en una sola pasada.
 - `typeClassifier`: Clasifica un valor numérico en categorías según su intensidad.
+- `IMTClassifier`: Clasifica valores del IMT en categorías C1-C5/F1-F5 con `np.searchsorted`.
+- `intensityClassifier`: Clasifica la intensidad de un arreglo de valores con `np.digitize`.
 - `columnEvaluation`: Evalúa y clasifica valores de dos columnas en un DataFrame, creando una nueva columna con la clasificación.
+- `intensityBatch`: Clasifica la intensidad de una tabla con varios índices a la vez.
+- `strengthCodes` / `strengthSmoothing`: Asigna a cada evento la intensidad más alta mantenida
+  al menos N meses consecutivos.
 
 Parámetros de entrada:
 ----------------------
-- `oniClassifier`: 
+- `Classifier` / `SOIClassifier`:
     - `data` (pd.DataFrame): DataFrame con las fechas y valores del índice climático.
     - `condicion` (int): Número mínimo de meses consecutivos para definir un evento.
     - `umbral_inferior` (float): Umbral inferior para clasificar eventos La Niña.
@@ -28,7 +39,7 @@ Parámetros de entrada:
 
 Parámetros de salida:
 ---------------------
-- `oniClassifier`: DataFrame con eventos clasificados (El Niño, La Niña, Neutro).
+- `Classifier` / `SOIClassifier`: DataFrame con eventos clasificados (El Niño, La Niña, Neutro).
 - `typeClassifier`: Categoría de intensidad como cadena de texto.
 - `columnEvaluation`: DataFrame con una nueva columna basada en las condiciones.
 
@@ -57,73 +68,293 @@ Fecha de creación:
 
 import numpy as np
 import pandas as pd
+from modules import monthAxis
+from modules import kernels
 
-def Classifier(data, condicion, umbral_inferior, umbral_superior):
+def _mesesEntrada(data):
     """
-    Clasifica eventos climáticos (El Niño, La Niña y Neutro) basados en el índice ONI.
-    data: DataFrame con columnas 'date' (datetime) y 'value' (float, ONI 3m).
-    """
-
-    # --- 1) Asegurar orden y fechas mensuales alineadas a inicio de mes ---
-    df = data[['date', 'value']].copy()
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date']).sort_values('date').reset_index(drop=True)
-
-    # Normaliza a mes-inicio para evitar desfases al hacer join/merge
-    total_meses = df['date'].dt.to_period('M').dt.to_timestamp()  # p.ej. 2024-05-01
-    vector_index = df['value'].to_numpy().flatten()               # mismo largo que total_meses
-
-    # --- 2) Identificar periodos El Niño (>= umbral_superior) ---
-    pos_nino = np.where(vector_index >= umbral_superior)[0]
-    if pos_nino.size > 0:
-        D = np.diff(np.concatenate(([0], (np.diff(pos_nino) == 1).astype(int), [0])))
-        pos_partida = np.where(D == 1)[0]
-        pos_llegada = np.where(D == -1)[0] + 1
-        posiciones = np.vstack((pos_partida, pos_llegada))
-        resultado = np.diff(posiciones, axis=0)
-        posiciones_nino = np.where(resultado >= condicion)[1]
-        meses_nino = []
-        for i in posiciones_nino:
-            periodos = pos_nino[pos_partida[i]:pos_llegada[i]]
-            meses_nino.extend(total_meses.iloc[periodos])
-        Nino = pd.to_datetime(meses_nino)
-    else:
-        Nino = pd.to_datetime([])
-
-    Nino_event = pd.DataFrame({'date': Nino, 'event': 'Niño'})
-
-    # --- 3) Identificar periodos La Niña (<= umbral_inferior) ---
-    pos_nina = np.where(vector_index <= umbral_inferior)[0]
-    if pos_nina.size > 0:
-        D = np.diff(np.concatenate(([0], (np.diff(pos_nina) == 1).astype(int), [0])))
-        pos_partida = np.where(D == 1)[0]
-        pos_llegada = np.where(D == -1)[0] + 1
-        posiciones = np.vstack((pos_partida, pos_llegada))
-        resultado = np.diff(posiciones, axis=0)
-        posiciones_nina = np.where(resultado >= condicion)[1]
-        meses_nina = []
-        for i in posiciones_nina:
-            periodos = pos_nina[pos_partida[i]:pos_llegada[i]]
-            meses_nina.extend(total_meses.iloc[periodos])
-        Nina = pd.to_datetime(meses_nina)
-    else:
-        Nina = pd.to_datetime([])
+    Devuelve la columna de tiempo de `data` como ordinales de `monthAxis`.
+    Acepta la columna `mes` (ordinal) o `date` (fechas).
+    """
+    if 'mes' in data.columns:
+        return 'mes', data['mes'].to_numpy(dtype=np.int32)
+    return 'date', monthAxis.fromDatetime(pd.to_datetime(data['date']))
+
+
+def _salidaEventos(clave, meses, eventos):
+    if clave == 'date':
+        return pd.DataFrame({'date': monthAxis.toDatetime(meses), 'event': eventos})
+    return pd.DataFrame({'mes': meses, 'event': eventos})
+
+
+# Etiquetas de evento en el orden de sus códigos
+EVENTOS = np.array(['Niña', 'Niño', 'Neutro'])
+NINA, NINO, NEUTRO = kernels.NINA, kernels.NINO, kernels.NEUTRO
+
+
+def persistenceMatrix(values, condicion, umbral_inferior, umbral_superior, invertido=False):
+    """
+    Clasifica eventos por persistencia en una matriz `(series, meses)`, con
+    umbrales, duración y polaridad propios de cada fila.
+
+    El cálculo lo hace `kernels.persistence` con la implementación elegida
+    (NumPy o Numba); ninguna racha cruza de una serie a otra.
+
+    Args:
+        values (np.ndarray): Matriz `(n, m)` de valores ordenados en el tiempo.
+        condicion, umbral_inferior, umbral_superior, invertido: Escalares o
+            arreglos de largo `n` (uno por fila); ver `persistenceCodes`.
+
+    Returns:
+        np.ndarray: Matriz `int8` `(n, m)` de códigos de `EVENTOS`.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[0]
+    condicion, inferior, superior, invertido = (np.broadcast_to(np.asarray(x), (n,)) for x in
+                                                (condicion, umbral_inferior, umbral_superior, invertido))
+    return kernels.persistence(values, condicion, inferior, superior, invertido)
+
 
-    Nina_event = pd.DataFrame({'date': Nina, 'event': 'Niña'})
+def persistenceCodes(values, condicion, umbral_inferior, umbral_superior, invertido=False):
+    """
+    Clasifica eventos por persistencia con una codificación por rachas (RLE).
+
+    Un mes es Niño (o Niña) si pertenece a una racha de al menos `condicion`
+    valores consecutivos por encima (o por debajo) del umbral; los demás son
+    Neutro. Las rachas se cuentan por posición, así que `values` debe estar
+    ordenado en el tiempo. Un NaN no cumple ningún umbral y corta la racha.
+
+    Args:
+        values (np.ndarray): Valores del índice ordenados en el tiempo.
+        condicion (int): Número mínimo de meses consecutivos para definir un evento.
+        umbral_inferior (float): Umbral inferior (La Niña; El Niño si `invertido`).
+        umbral_superior (float): Umbral superior (El Niño; La Niña si `invertido`).
+        invertido (bool): Polaridad invertida, como la del SOI.
+
+    Returns:
+        np.ndarray: Códigos `int8` de `EVENTOS` (0 Niña, 1 Niño, 2 Neutro)
+        alineados por posición con `values`.
+    """
+    values = np.asarray(values, dtype=float)
+    return persistenceMatrix(values[None, :], condicion, umbral_inferior, umbral_superior, invertido)[0]
 
-    # --- 4) Neutro: todo lo demás (sobre las MISMAS fechas de tu data) ---
-    en_nino = np.isin(total_meses, Nino)
-    en_nina = np.isin(total_meses, Nina)
-    Neutro = pd.to_datetime(total_meses[~(en_nino | en_nina)])
-    Neutro_event = pd.DataFrame({'date': Neutro, 'event': 'Neutro'})
 
-    # --- 5) Salida ordenada ---
-    out = (pd.concat([Nino_event, Nina_event, Neutro_event], ignore_index=True)
-             .drop_duplicates(subset=['date', 'event'])
-             .sort_values('date')
-             .reset_index(drop=True))
+def _largoRachas(mask):
+    """
+    Tabla de largos de racha de una matriz de máscaras `(k, n)`: cada posición
+    True recibe el largo total de la racha a la que pertenece y las False
+    reciben 0. Las filas se recorren aplanadas, separadas por una columna en False.
+    """
+    k, n = mask.shape
+    plano = np.zeros((k, n + 1), dtype=bool)
+    plano[:, :n] = mask
+    plano = plano.ravel()
+
+    bordes = np.flatnonzero(np.diff(np.concatenate(([False], plano, [False])).view(np.int8)))
+    inicios, fines = bordes[0::2], bordes[1::2]
+    largos = (fines - inicios).astype(np.int32)
+
+    marca = np.zeros(len(plano) + 1, dtype=np.int32)
+    marca[inicios] = largos
+    marca[fines] -= largos
+    return np.cumsum(marca[:-1], dtype=np.int32).reshape(k, n + 1)[:, :n]
+
+
+def sweepGrid(umbrales=(0.5, 0.7, 1.0), duraciones=(3, 4, 5, 6, 7)):
+    """
+    Grilla de ajustes `(inferior, superior, duración)` con umbrales simétricos
+    (`-u`, `u`) para cada combinación de `umbrales` y `duraciones`.
+    """
+    u, d = np.meshgrid(np.asarray(umbrales, dtype=float), np.asarray(duraciones, dtype=float), indexing='ij')
+    return np.column_stack((-u.ravel(), u.ravel(), d.ravel()))
+
+
+def persistenceSweep(values, ajustes, invertido=False):
+    """
+    Clasifica una serie bajo muchas definiciones de evento a la vez.
+
+    Los largos de racha se calculan una sola vez por umbral distinto (ver
+    `_largoRachas`) y todas las duraciones que usan ese umbral se evalúan
+    sobre la misma tabla, con una comparación vectorizada.
+
+    Args:
+        values (np.ndarray): Valores del índice ordenados en el tiempo.
+        ajustes (np.ndarray): Matriz `(g, 3)` de `(umbral_inferior,
+            umbral_superior, duración mínima)`; ver `sweepGrid`.
+        invertido (bool): Polaridad invertida, como la del SOI.
+
+    Returns:
+        dict: `ajustes`, `codigos` (matriz `int8` `(g, n)` de posiciones de
+        `EVENTOS`, igual a `persistenceCodes` con cada ajuste), y por ajuste
+        `eventos_nino` / `eventos_nina` (número de eventos) y `meses_nino` /
+        `meses_nina` (meses en evento), todos `int32`.
+    """
+    values = np.asarray(values, dtype=float)
+    ajustes = np.atleast_2d(np.asarray(ajustes, dtype=float))
+    duracion = ajustes[:, 2:3]
+
+    inferiores, pos_inferior = np.unique(ajustes[:, 0], return_inverse=True)
+    superiores, pos_superior = np.unique(ajustes[:, 1], return_inverse=True)
+    with np.errstate(invalid='ignore'):
+        largo_bajo = _largoRachas(values[None, :] <= inferiores[:, None])
+        largo_alto = _largoRachas(values[None, :] >= superiores[:, None])
+
+    bajo = largo_bajo[pos_inferior] >= duracion
+    alto = largo_alto[pos_superior] >= duracion
+    nina, nino = (alto, bajo) if invertido else (bajo, alto)
+
+    codigos = np.full(bajo.shape, NEUTRO, dtype=np.int8)
+    codigos[nina] = NINA
+    codigos[nino] = NINO
+
+    def inicios(mask):
+        return (mask & ~np.pad(mask, ((0, 0), (1, 0)))[:, :-1]).sum(axis=1, dtype=np.int32)
+
+    return {
+        'ajustes': ajustes,
+        'codigos': codigos,
+        'eventos_nino': inicios(nino),
+        'eventos_nina': inicios(nina),
+        'meses_nino': nino.sum(axis=1, dtype=np.int32),
+        'meses_nina': nina.sum(axis=1, dtype=np.int32),
+    }
+
+
+def _lado(valor, umbral_inferior, umbral_superior):
+    # -1 por debajo del umbral inferior, 1 por encima del superior, 0 entre ambos o NaN
+    if valor <= umbral_inferior:
+        return -1
+    if valor >= umbral_superior:
+        return 1
+    return 0
+
+
+def _codigoLado(lado, invertido):
+    if lado == 0:
+        return NEUTRO
+    return (NINO if lado < 0 else NINA) if invertido else (NINA if lado < 0 else NINO)
+
+
+def streamInit(values, meses, condicion, umbral_inferior, umbral_superior, invertido=False):
+    """
+    Construye el estado del detector incremental a partir de la historia de
+    un índice. Sólo se recorre la racha final.
+
+    Args:
+        values (np.ndarray): Valores del índice ordenados en el tiempo.
+        meses (np.ndarray): Ordinales de `monthAxis` de cada valor.
+        condicion, umbral_inferior, umbral_superior, invertido: Ver `persistenceCodes`.
+
+    Returns:
+        dict: Estado serializable en JSON: parámetros, `ultimo_mes`, `lado`
+        de la racha actual (-1, 0 o 1), su `inicio` y `largo`, si ya está
+        `confirmada` como evento y los `pendientes` (valores de una racha aún
+        sin confirmar, para reetiquetarlos al confirmarse). Los NaN del final
+        (meses aún sin publicar) no cuentan como observados.
+    """
+    values = np.asarray(values, dtype=float)
+    meses = np.asarray(meses)
+    observados = np.flatnonzero(~np.isnan(values))
+
+    estado = {'condicion': int(condicion), 'umbral_inferior': float(umbral_inferior),
+              'umbral_superior': float(umbral_superior), 'invertido': bool(invertido),
+              'ultimo_mes': None, 'lado': 0, 'inicio': None, 'largo': 0, 'confirmada': False, 'pendientes': []}
+    if observados.size == 0:
+        return estado
+
+    fin = observados[-1]
+    lado = _lado(values[fin], umbral_inferior, umbral_superior)
+    estado['ultimo_mes'] = int(meses[fin])
+    if lado == 0:
+        return estado
+
+    # Hacia atrás mientras el valor siga del mismo lado y los meses sean consecutivos
+    inicio = fin
+    while (inicio > 0 and meses[inicio - 1] == meses[inicio] - 1
+           and _lado(values[inicio - 1], umbral_inferior, umbral_superior) == lado):
+        inicio -= 1
+
+    largo = int(fin - inicio + 1)
+    confirmada = largo >= condicion
+    estado.update(lado=lado, inicio=int(meses[inicio]), largo=largo, confirmada=confirmada,
+                  pendientes=[] if confirmada else [float(v) for v in values[inicio:fin + 1]])
+    return estado
+
+
+def streamUpdate(estado, meses, values):
+    """
+    Agrega uno o más meses al detector incremental.
+
+    El costo es constante por mes: sólo se actualiza la racha final. Cuando
+    una racha llega a `condicion` meses se reetiquetan también sus meses
+    anteriores, que hasta entonces eran Neutro.
+
+    Args:
+        estado (dict): Estado de `streamInit`; se actualiza en el lugar.
+        meses (np.ndarray): Ordinales de los meses nuevos, crecientes y
+            posteriores a `estado['ultimo_mes']`.
+        values (np.ndarray): Valores de los meses nuevos. Los NaN se omiten.
+
+    Returns:
+        tuple: (`meses`, `valores`, `codigos`) de las filas nuevas o cuyo
+        evento cambió, ordenadas por mes. `codigos` son posiciones de `EVENTOS`.
+
+    Raises:
+        ValueError: Si un mes no es posterior al último procesado.
+    """
+    inferior, superior = estado['umbral_inferior'], estado['umbral_superior']
+    cambios = {}
+
+    for mes, valor in zip(np.asarray(meses).tolist(), np.asarray(values, dtype=float).tolist()):
+        if np.isnan(valor):
+            continue
+        if estado['ultimo_mes'] is not None and mes <= estado['ultimo_mes']:
+            raise ValueError(f"El mes {mes} ya fue procesado (último: {estado['ultimo_mes']})")
+
+        lado = _lado(valor, inferior, superior)
+        continua = (lado != 0 and lado == estado['lado'] and estado['ultimo_mes'] is not None
+                    and mes == estado['ultimo_mes'] + 1)
+
+        if continua:
+            estado['largo'] += 1
+        else:
+            estado.update(lado=lado, inicio=mes if lado else None, largo=1 if lado else 0,
+                          confirmada=False, pendientes=[])
+        estado['ultimo_mes'] = mes
+
+        if lado and not estado['confirmada'] and estado['largo'] >= estado['condicion']:
+            # Reetiquetado retroactivo de la racha que se acaba de confirmar
+            codigo = _codigoLado(lado, estado['invertido'])
+            for i, previo in enumerate(estado['pendientes']):
+                cambios[estado['inicio'] + i] = (previo, codigo)
+            estado.update(confirmada=True, pendientes=[])
+        elif lado and not estado['confirmada']:
+            estado['pendientes'].append(valor)
+
+        cambios[mes] = (valor, _codigoLado(lado, estado['invertido']) if estado['confirmada'] else NEUTRO)
+
+    orden = sorted(cambios)
+    return (np.array(orden, dtype=np.int32),
+            np.array([cambios[m][0] for m in orden], dtype=float),
+            np.array([cambios[m][1] for m in orden], dtype=np.int8))
+
+
+def _clasificarPersistencia(data, condicion, umbral_inferior, umbral_superior, invertido):
+    clave, meses = _mesesEntrada(data)
+    orden = np.argsort(meses, kind='stable')
+    codigos = persistenceCodes(data['value'].to_numpy(dtype=float)[orden], condicion,
+                               umbral_inferior, umbral_superior, invertido)
+    return _salidaEventos(clave, meses[orden], EVENTOS[codigos])
+
+
+def Classifier(data, condicion, umbral_inferior, umbral_superior):
+    """
+    Clasifica eventos climáticos (El Niño, La Niña y Neutro) basados en el índice ONI.
+    data: DataFrame con columnas 'mes' (ordinal de monthAxis) o 'date' (datetime)
+    y 'value' (float, ONI 3m). La salida usa la misma columna de tiempo, ordenada.
+    """
+    return _clasificarPersistencia(data, condicion, umbral_inferior, umbral_superior, invertido=False)
 
-    return out
 
 def typeClassifier(x):
     
@@ -147,35 +378,149 @@ def typeClassifier(x):
     else:
         return 'Muy Fuerte'
     
-def columnEvaluation(df, col1, col2, nueva_col):
+# Categorías de intensidad y bordes de |valor| que las separan:
+# Neutro < 0.5 <= Débil < 1.0 <= Moderado < 1.5 <= Fuerte < 2.0 <= Muy Fuerte
+INTENSIDADES = ['Neutro', 'Débil', 'Moderado', 'Fuerte', 'Muy Fuerte']
+BORDES_INTENSIDAD = (0.5, 1.0, 1.5, 2.0)
+
+
+def intensityCodes(values, bordes=BORDES_INTENSIDAD):
+    """
+    Calcula el código de intensidad (posición en `INTENSIDADES`) de cada valor
+    con `np.digitize` sobre `abs(values)`. Acepta arreglos de cualquier forma.
+
+    Los NaN quedan en la última categoría, como en `typeClassifier`.
+    """
+    return kernels.intensity(values, bordes)
+
+
+def _neutroMask(events):
+    """
+    Máscara de los eventos que contienen 'Neutro'. La comparación de texto se
+    hace una vez por evento distinto y no una vez por fila.
+    """
+    codigos, unicos = pd.factorize(np.asarray(events, dtype=object).ravel())
+    es_neutro = np.array(['Neutro' in str(u) for u in unicos] + [False])
+    return es_neutro[codigos].reshape(np.shape(events))
+
+
+def intensityClassifier(values, events=None, bordes=BORDES_INTENSIDAD, etiquetas=INTENSIDADES):
+    """
+    Clasifica la intensidad de un arreglo de valores.
+
+    Args:
+        values (array): Valores del índice.
+        events (array): Evento de cada valor. Los que contienen 'Neutro' se
+            clasifican como la primera etiqueta ('Neutro').
+        bordes (tuple): Bordes crecientes de `abs(values)` entre categorías.
+        etiquetas (list): Una etiqueta más que bordes.
+
+    Returns:
+        pd.Categorical: Intensidad de cada valor.
+    """
+    codigos = intensityCodes(values, bordes)
+    if events is not None:
+        codigos[_neutroMask(events)] = 0
+    return pd.Categorical.from_codes(codigos.ravel(), categories=etiquetas)
+
+
+def columnEvaluation(df, col1, col2, nueva_col, bordes=BORDES_INTENSIDAD):
 
     """
   Evalúa dos columnas en un DataFrame y crea una nueva columna basada en las condiciones especificadas.
 
   Args:
       df (pd.DataFrame): DataFrame con las columnas a evaluar.
-      col1 (str): Nombre de la primera columna a evaluar.
-      col2 (str): Nombre de la segunda columna a clasificar.
+      col1 (str): Nombre de la primera columna a evaluar (evento).
+      col2 (str): Nombre de la segunda columna a clasificar (valor).
       nueva_col (str): Nombre de la columna resultante.
+      bordes (tuple): Bordes de `abs(valor)` entre categorías de intensidad.
 
   Returns:
-      pd.DataFrame: DataFrame con la nueva columna añadida.
+      pd.DataFrame: DataFrame con la nueva columna (categórica) añadida.
   """
 
-    def conditions(row):
+    df[nueva_col] = intensityClassifier(df[col2].to_numpy(), df[col1].to_numpy(), bordes)
 
-        if 'Neutro' in row[col1]:
+    return df
 
-            return 'Neutro'
 
-        else:
+def intensityBatch(tabla, bordes=None, col_indice='index_name', col_evento='event', col_valor='value', nueva_col='type'):
+    """
+    Clasifica la intensidad de una tabla con varios índices a la vez.
+
+    Args:
+        tabla (pd.DataFrame): Tabla long con varios índices.
+        bordes (dict): Bordes por índice (`{'ONI': (0.5, 1.0, 1.5, 2.0)}`).
+            Los índices que no aparecen usan `BORDES_INTENSIDAD`.
+        col_indice, col_evento, col_valor (str): Columnas de la tabla.
+        nueva_col (str): Nombre de la columna resultante.
+
+    Returns:
+        pd.DataFrame: Tabla con la nueva columna (categórica) añadida.
+    """
+    bordes = bordes or {}
+    valores = tabla[col_valor].to_numpy()
+    codigos = intensityCodes(valores)
+
+    # Sólo se recalculan, por bloque, los índices con bordes propios
+    if bordes:
+        nombres = tabla[col_indice].to_numpy()
+        for nombre, bordes_indice in bordes.items():
+            filas = nombres == nombre
+            codigos[filas] = intensityCodes(valores[filas], bordes_indice)
+
+    codigos[_neutroMask(tabla[col_evento].to_numpy())] = 0
+    tabla[nueva_col] = pd.Categorical.from_codes(codigos, categories=INTENSIDADES)
+    return tabla
+
+def strengthCodes(codes, repeticiones=3, grupos=None):
+    """
+    Suaviza la intensidad por evento: en cada segmento de códigos distintos
+    de 0 (un evento), todo el segmento toma el código más alto que se haya
+    mantenido al menos `repeticiones` meses consecutivos. Los segmentos sin
+    ningún código que cumpla la condición no cambian.
 
-            return typeClassifier(row[col2])
+    Args:
+        codes (np.ndarray): Códigos de intensidad (posición en `INTENSIDADES`)
+            ordenados en el tiempo. Los códigos <= 0 (Neutro o sin dato) separan segmentos.
+        repeticiones (int): Meses consecutivos mínimos con el mismo código.
+        grupos (np.ndarray): Etiqueta de serie de cada posición (p. ej. el
+            nombre del índice); un cambio de grupo también separa segmentos.
+
+    Returns:
+        np.ndarray: Códigos suavizados, del mismo largo que `codes`.
+    """
+    codes = np.asarray(codes)
+    if len(codes) == 0:
+        return codes.copy()
+    grupos = np.zeros(len(codes), dtype=np.int64) if grupos is None else pd.factorize(np.asarray(grupos))[0]
+    return kernels.strength(codes, repeticiones, grupos).astype(codes.dtype, copy=False)
 
 
-    df[nueva_col] = df.apply(conditions, axis=1)
+def strengthSmoothing(tabla, repeticiones=3, col_indice='index_name', col_tipo='type', nueva_col='type_class'):
+    """
+    Aplica `strengthCodes` a la columna de intensidad de una tabla long con
+    uno o varios índices (ordenada por índice y fecha, como `Indices_Total`).
+
+    Args:
+        tabla (pd.DataFrame): Tabla con las columnas `col_indice` y `col_tipo`.
+        repeticiones (int): Meses consecutivos mínimos con la misma intensidad.
+        col_indice, col_tipo (str): Columnas de la tabla.
+        nueva_col (str): Nombre de la columna resultante. Los valores que no
+            están en `INTENSIDADES` (p. ej. 'No aplicable') se conservan.
+
+    Returns:
+        pd.DataFrame: Tabla con la nueva columna añadida.
+    """
+    tipo = tabla[col_tipo]
+    codigos = np.asarray(pd.Categorical(tipo, categories=INTENSIDADES).codes, dtype=np.int64)
+    suavizados = strengthCodes(codigos, repeticiones, tabla[col_indice].to_numpy())
+
+    etiquetas = np.array(INTENSIDADES, dtype=object)[np.clip(suavizados, 0, None)]
+    tabla[nueva_col] = np.where(codigos >= 0, etiquetas, tipo.to_numpy(dtype=object))
+    return tabla
 
-    return df
 
 def MEIClassifier(data):
     """
@@ -199,102 +544,59 @@ def MEIClassifier(data):
 
 
 
+# Categorías del IMT ordenadas de menor a mayor valor y bordes que las separan.
+# Cada categoría incluye su borde inferior: -4 <= F4 < -3, ..., 0 <= C1 < 1, ...
+CATEGORIAS_IMT = ['F5', 'F4', 'F3', 'F2', 'F1', 'C1', 'C2', 'C3', 'C4', 'C5', 'Desconocido']
+BORDES_IMT = np.array([-4.0, -3.0, -2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0])
+
+FASES_IMT = ['Fase fría muy fuerte', 'Fase fría fuerte', 'Fase fría moderada', 'Fase fría neutra',
+             'Fase cálida neutra', 'Fase cálida moderada', 'Fase cálida fuerte', 'Fase cálida muy fuerte',
+             'Fase desconocida']
+
+# Código de categoría -> código de fase descriptiva
+FASE_POR_CATEGORIA = np.array([0, 0, 1, 2, 3, 4, 5, 6, 7, 7, 8], dtype=np.int8)
+
+
+def imtCodes(values):
+    """
+    Código de categoría del IMT (posición en `CATEGORIAS_IMT`) de cada valor,
+    con una sola búsqueda binaria sobre `BORDES_IMT`. Acepta arreglos de
+    cualquier forma; los NaN quedan en 'Desconocido'.
+    """
+    values = np.asarray(values, dtype=float)
+    codigos = np.searchsorted(BORDES_IMT, values, side='right').astype(np.int8)
+    codigos[np.isnan(values)] = len(CATEGORIAS_IMT) - 1
+    return codigos
+
+
 def IMTClassifier(x):
-   
-    # Determinar intensidad (C5, F1, etc.)
-    if x >= 4:
-        intensidad = 'C5'
-    elif 3 <= x < 4:
-        intensidad = 'C4'
-    elif 2 <= x < 3:
-        intensidad = 'C3'
-    elif 1 <= x < 2:
-        intensidad = 'C2'
-    elif 0 <= x < 1:
-        intensidad = 'C1'
-    elif -1 <= x < 0:
-        intensidad = 'F1'
-    elif -2 <= x < -1:
-        intensidad = 'F2'
-    elif -3 <= x < -2:
-        intensidad = 'F3'
-    elif -4 <= x < -3:
-        intensidad = 'F4'
-    elif x <= -4:
-        intensidad = 'F5'
-    else:
-        intensidad = 'Desconocido'
-
-    # Mapear intensidad a fase descriptiva
-    fase_descripcion = {
-        'C5': 'Fase cálida muy fuerte',
-        'C4': 'Fase cálida muy fuerte',
-        'C3': 'Fase cálida fuerte',
-        'C2': 'Fase cálida moderada',
-        'C1': 'Fase cálida neutra',
-        'F1': 'Fase fría neutra',
-        'F2': 'Fase fría moderada',
-        'F3': 'Fase fría fuerte',
-        'F4': 'Fase fría muy fuerte',
-        'F5': 'Fase fría muy fuerte'
-    }.get(intensidad, 'Fase desconocida')
+    """
+    Clasifica valores del IMT en categorías C1-C5 (cálidas) y F1-F5 (frías).
+
+    Args:
+        x (float o array): Valor o arreglo de valores del IMT.
+
+    Returns:
+        dict: `intensidad` (categoría) y `fase` (descripción de la fase). Si
+        `x` es un escalar los valores son textos; si es un arreglo son
+        `pd.Categorical` del mismo largo. Los NaN quedan como 'Desconocido'.
+    """
+    valores = np.asarray(x, dtype=float)
+    codigos = imtCodes(valores.ravel())
+    codigos_fase = FASE_POR_CATEGORIA[codigos]
+
+    if valores.ndim == 0:
+        return {'intensidad': CATEGORIAS_IMT[codigos[0]], 'fase': FASES_IMT[codigos_fase[0]]}
 
     return {
-        'intensidad': intensidad,
-        'fase': fase_descripcion
+        'intensidad': pd.Categorical.from_codes(codigos, categories=CATEGORIAS_IMT),
+        'fase': pd.Categorical.from_codes(codigos_fase, categories=FASES_IMT),
     }
 
 def SOIClassifier(data, condicion, umbral_inferior, umbral_superior):
-   
-   
-    anio_inicio = 1951
-    anio_fin = data['date'].iloc[-1].year
-    final_month = data['date'].iloc[-1].month
-    total_meses = pd.date_range(start=f'{anio_inicio}-01-01', end=f'{anio_fin}-{final_month}-01', freq='MS')
-    vector_index = np.array(data['value']).flatten()
-    vector_index = vector_index[:len(total_meses)]
-    
-    # Identificar periodos El Niño
-    pos_nino = np.where(vector_index <= umbral_inferior)[0]
-    D = np.diff(np.concatenate(([0], np.diff(pos_nino) == 1, [0])))
-    pos_partida = np.where(D == 1)[0]
-    pos_llegada = np.where(D == -1)[0]+1
-    posiciones = np.vstack((pos_partida, pos_llegada))
-    resultado = np.diff(posiciones, axis=0)
-    posiciones_nino = np.where(resultado >= condicion)[1]
-    meses_nino = []
-
-    for i in posiciones_nino:
-        periodos = pos_nino[pos_partida[i]:pos_llegada[i]]
-        meses_nino.extend(total_meses[periodos])
-        
-    Nino = pd.to_datetime(meses_nino)
-    Nino_event = pd.DataFrame({'date': Nino, 'event': 'Niño'})
-
-    # Identificar periodos La Niña
-    pos_nina = np.where(vector_index >= umbral_superior)[0]
-    D = np.diff(np.concatenate(([0], np.diff(pos_nina) == 1, [0])))
-    pos_partida = np.where(D == 1)[0]
-    pos_llegada = np.where(D == -1)[0]+1
-    posiciones = np.vstack((pos_partida, pos_llegada))
-    resultado = np.diff(posiciones, axis=0)
-    posiciones_nina = np.where(resultado >= condicion)[1]
-    meses_nina = []
-
-    for i in posiciones_nina:
-        periodos = pos_nina[pos_partida[i]:pos_llegada[i]]
-        meses_nina.extend(total_meses[periodos])
-        
-    Nina = pd.to_datetime(meses_nina)
-    Nina_event = pd.DataFrame({'date': Nina, 'event': 'Niña'})
-    
-    # Identificar periodos Neutros
-    pos_neutro_1 = np.isin(total_meses, Nino)
-    pos_neutro_2 = np.isin(total_meses, Nina)
-    Neutro = total_meses[~(pos_neutro_1 | pos_neutro_2)]
-
-    Neutro = pd.to_datetime(Neutro)
-    
-    Neutro_event = pd.DataFrame({'date': Neutro, 'event': 'Neutro'})
-
-    return pd.concat([Nino_event, Nina_event, Neutro_event]).sort_values(by='date').reset_index(drop=True)
+    """
+    Clasifica eventos climáticos para índices de polaridad invertida (SOI):
+    El Niño cuando el valor es <= umbral_inferior y La Niña cuando es >= umbral_superior.
+    data: DataFrame con columnas 'mes' (ordinal de monthAxis) o 'date' y 'value'.
+    """
+    return _clasificarPersistencia(data, condicion, umbral_inferior, umbral_superior, invertido=True)
@@ -0,0 +1,141 @@
+"""
+excelExport.py
+=================
+
+Este módulo escribe la tabla final (`Indices_Total`) en `.xlsx` fila por
+fila con el modo `write_only` de openpyxl, en lugar de armar el libro
+completo en memoria como hace `DataFrame.to_excel`.
+
+Descripción:
+------------
+- `writeXLSX`: Escribe la tabla en un libro con una sola hoja `indices`
+  (o, opcionalmente, una hoja por índice y una hoja `descripciones` con los
+  textos descriptivos).
+
+Estructura del libro:
+---------------------
+- Por defecto, una hoja `indices` con todas las columnas de la tabla (el
+  mismo libro que `to_excel(..., sheet_name="indices", index=False)`).
+- Con `por_indice=True`, una hoja por índice (`ONI`, `Niño 3.4`, ...).
+- Con `descripciones_aparte=True`, las columnas de descripción salen de las
+  hojas de datos y van a la hoja `descripciones`: una fila por descripción
+  distinta con `index_name`, `columna`, `clave` y `descripcion`, p. ej.
+  (`ONI`, `phase_description`, `Fría`, `Esta fase se caracteriza ...`).
+
+Notas:
+------
+- Las descripciones ocupan la mayor parte del tamaño de la tabla y son las
+  mismas en todas las filas de un índice, fase o evento; con
+  `descripciones_aparte=True` se escriben una sola vez, lo que reduce el
+  tamaño del libro y el tiempo de escritura, pero cambia su estructura.
+- Las filas se convierten a objetos de Python por bloques de `bloque` filas,
+  así que la memoria usada no crece con el tamaño de la tabla.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `openpyxl`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import pandas as pd
+
+# Columna de descripción -> columnas que identifican el texto
+DESCRIPCIONES = {
+    'index_description': ('index_name',),
+    'phase_description': ('index_name', 'phase'),
+    'event_description': ('index_name', 'event'),
+}
+HOJA_DESCRIPCIONES = "descripciones"
+
+
+def _celdas(columna):
+    # Columna de pandas -> lista de valores que openpyxl sabe escribir
+    # (las fechas quedan como `Timestamp`, que es un `datetime`, y NaN/NaT
+    # como celdas vacías)
+    return columna.astype(object).where(columna.notna(), None).tolist()
+
+
+def _escribirHoja(hoja, tabla, bloque):
+    hoja.append([str(c) for c in tabla.columns])
+    for inicio in range(0, len(tabla), bloque):
+        parte = tabla.iloc[inicio:inicio + bloque]
+        for fila in zip(*(_celdas(parte[c]) for c in parte.columns)):
+            hoja.append(fila)
+
+
+def _tablaDescripciones(tabla):
+    partes = []
+    for columna, claves in DESCRIPCIONES.items():
+        if columna not in tabla.columns:
+            continue
+        unicas = tabla[list(claves) + [columna]].drop_duplicates().dropna(subset=[columna])
+        partes.append(pd.DataFrame({
+            'index_name': unicas['index_name'].to_numpy(),
+            'columna': columna,
+            'clave': unicas[claves[-1]].to_numpy(),
+            'descripcion': unicas[columna].to_numpy(),
+        }))
+    if not partes:
+        return pd.DataFrame(columns=['index_name', 'columna', 'clave', 'descripcion'])
+    return pd.concat(partes, ignore_index=True)
+
+
+def _nombreHoja(nombre, usados):
+    # Excel admite 31 caracteres y no admite []:*?/\ en el nombre de la hoja
+    limpio = "".join("_" if c in '[]:*?/\\' else c for c in str(nombre))[:31] or "_"
+    candidato, i = limpio, 1
+    while candidato.lower() in usados:
+        sufijo = f"_{i}"
+        candidato, i = limpio[:31 - len(sufijo)] + sufijo, i + 1
+    usados.add(candidato.lower())
+    return candidato
+
+
+def writeXLSX(tabla, path, por_indice=False, descripciones_aparte=False, bloque=5000):
+    """
+    Escribe la tabla final en `.xlsx` en modo `write_only`.
+
+    Args:
+        tabla (pd.DataFrame): Tabla final (columnas de `indexes.COLUMNAS`).
+        path (str): Ruta del `.xlsx`.
+        por_indice (bool): Una hoja por valor de `index_name`, en el orden
+            en que aparecen en la tabla; si es False, una sola hoja `indices`.
+        descripciones_aparte (bool): Escribe las descripciones en la hoja
+            `descripciones` en lugar de repetirlas en cada fila.
+        bloque (int): Filas que se convierten a la vez.
+
+    Returns:
+        str: Ruta del archivo escrito.
+    """
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    datos = tabla
+    if descripciones_aparte:
+        datos = tabla.drop(columns=[c for c in DESCRIPCIONES if c in tabla.columns])
+
+    usados = set()
+    if por_indice and 'index_name' in datos.columns:
+        for nombre, grupo in datos.groupby('index_name', sort=False):
+            _escribirHoja(libro.create_sheet(_nombreHoja(nombre, usados)), grupo, bloque)
+    else:
+        _escribirHoja(libro.create_sheet(_nombreHoja("indices", usados)), datos, bloque)
+
+    if descripciones_aparte:
+        _escribirHoja(libro.create_sheet(_nombreHoja(HOJA_DESCRIPCIONES, usados)),
+                      _tablaDescripciones(tabla), bloque)
+
+    libro.save(path)
+    return path
@@ -6,18 +6,31 @@ Descripción:
 ------------
 Este módulo procesa los datos de índices climáticos en formato wide que se
 toman desde la NOAA y los transforma en formato long, para luego generar los
-atributos necesarios para generar la 
-los índices climáticos. 
+atributos necesarios para el seguimiento de los índices climáticos.
+
+Cada índice se declara una sola vez en `REGISTRO` (nombre, descripción,
+unidad, umbrales, tipo de clasificador y textos de fases y eventos) y todos
+se procesan con el mismo motor, `processIndex`. Para agregar un índice basta
+con agregar su entrada al registro.
+
+Modo por lotes: `alignIndices` ubica todos los índices en una matriz
+`(índices, meses)` sobre un calendario común, `classifyBatch` calcula fases,
+eventos e intensidad de todas las filas a la vez (con umbrales y duraciones
+por fila) y `batchToLong` exporta el resultado a la tabla long. Los
+parámetros de persistencia de cada índice salen de `eventParameters`.
+`sweepIndex` compara los catálogos de eventos de un índice bajo una grilla
+de umbrales y duraciones.
 
 Parámetros de entrada:
 ----------------------
-- Un archivo `.csv` con los datos del índice climático (ONI).
+- Un DataFrame wide (`year`, `01` ... `12`) o long (`year`, `month`, `value`)
+  con los datos del índice climático.
 
 Parámetros de salida:
 ---------------------
-- Un archivo `.csv` procesado con las siguientes columnas:
+- Un DataFrame procesado con las siguientes columnas:
     - `date`: Fecha del registro.
-    - `value`: Valor del índice ONI.
+    - `value`: Valor del índice.
     - `index_name`: Nombre del índice.
     - `index_description`: Descripción del índice.
     - `unit`: Unidad del índice.
@@ -30,12 +43,19 @@ Parámetros de salida:
 Librerías requeridas:
 ---------------------
 - `pandas >= 1.2`
-- `eventClassifier` (con las funciones `oniClassifier` y `columnEvaluation`).
+- `numpy >= 1.24.3`
+- `eventClassifier` (con las funciones `persistenceCodes`, `MEIClassifier`,
+  `IMTClassifier` y `columnEvaluation`).
 
 Notas:
 ------
-- Este script está diseñado exclusivamente para trabajar con los índices ONI.
-- Las clasificaciones de eventos se basan en un umbral de +/-0.5 °C en las anomalías de TSM y una duración mínima de 5 meses consecutivos.
+- Las clasificaciones de eventos de los índices de TSM se basan en un umbral de +/-0.5 °C en las anomalías de TSM y una duración mínima de 5 meses consecutivos.
+- Las fases se etiquetan con `np.select` y sus descripciones se toman por
+  posición de un arreglo de textos, sin `apply` fila por fila.
+- En el modo por lotes el costo en Python es por regla de clasificación y no
+  por índice; el número de series sólo cambia el tamaño de la matriz.
+- Cada clasificación (fase, evento, intensidad) se mide como una etapa de
+  `instrument` cuando hay un reporte activo.
 
 Autor:
 ------
@@ -43,534 +63,547 @@ Christian Bermúdez Rivas
 
 Versión:
 --------
-1.0
+2.0
 
 Fecha de creación:
 ------------------
 1 de noviembre de 2024
 """
 
+import numpy as np
 import pandas as pd
-from modules.eventClassifier import Classifier, columnEvaluation, MEIClassifier, SOIClassifier, IMTClassifier
-
-
-"""
-    Procesa un DataFrame del índice ONI para incluir información transformada y clasificaciones de eventos.
-
-    Args:
-        df (pd.DataFrame): DataFrame con las columnas:
-            - `year`: Año del registro.
-            - Meses como columnas con valores del índice ONI.
-
-    Returns:
-        pd.DataFrame: DataFrame transformado con las siguientes columnas:
-            - `date`: Fecha (YYYY-MM-DD).
-            - `value`: Valor del índice ONI.
-            - `index_name`: Nombre del índice.
-            - `index_description`: Descripción detallada del índice ONI.
-            - `unit`: Unidad de medida (°C).
-            - `phase`: Clasificación de fase climática ('Cálida', 'Fría', 'Neutra').
-            - `phase_description`: Descripción de la fase climática.
-            - `event`: Clasificación del evento climático ('Niño', 'Niña', 'Neutro').
-            - `event_description`: Descripción del evento climático.
-            - `type`: Clasificación de intensidad del evento.
-"""
+from modules import monthAxis
+from modules import instrument
+from modules.eventClassifier import EVENTOS, NEUTRO, persistenceCodes, persistenceMatrix, columnEvaluation, MEIClassifier
+from modules.eventClassifier import persistenceSweep, sweepGrid
+from modules.eventClassifier import IMTClassifier, imtCodes, intensityCodes, INTENSIDADES
+from modules.eventClassifier import CATEGORIAS_IMT, FASES_IMT, FASE_POR_CATEGORIA
+
+
+# Etiquetas de fase en el orden de sus códigos (las de evento, `EVENTOS`,
+# vienen de `eventClassifier`)
+FASES = np.array(['Fría', 'Cálida', 'Neutra'])
+
+# Textos compartidos por los índices de TSM
+_FASE_NEUTRA_TSM = 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'
+
+_EVENTOS_PERSISTENCIA = {
+    'Niña': 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos',
+    'Niño': 'Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos',
+    'Neutro': 'Condiciones neutras',
+}
+
+_EVENTOS_SOI = {
+    'Niña': 'Este evento se caracteriza porque el valor del índice para el mes es positivo',
+    'Niño': 'Este evento se caracteriza porque el valor del índice para el mes es negativo',
+    'Neutro': 'Este evento se caracteriza porque el valor del índice para el mes es cero',
+}
+
+
+def _fasesTSM(region):
+    return {
+        'Fría': f'Esta fase se caracteriza porque las anomalías de TSM en la región {region} son inferiores a -0.5 °C',
+        'Cálida': f'Esta fase se caracteriza porque las anomalías de TSM en la región {region} son superiores a 0.5 °C',
+        'Neutra': _FASE_NEUTRA_TSM,
+    }
 
 
 """
-ÍNDICE ONI
-
-Oceanic Niño Index: From NOAA Climate Prediction Center (CPC)
-Three month running mean of NOAA ERSST.V5 SST anomalies in the Niño 3.4 region 
-(5N-5S, 120-170W), based on changing base period which onsist of multiple 
-centered 30-year base periods. These 30-year base periods will be used to 
-calculate the anomalies for successive 5-year periods in the historical record. 
-
+Registro de índices
+
+Cada entrada define:
+    - `index_name`, `index_description`, `unit`: Atributos del índice.
+    - `fase`: Regla de fases. `umbral` (Fría si value <= inferior, Cálida si
+      value >= superior), `signo_invertido` (Fría si value > 0, Cálida si
+      value < 0) o `imt` (categorías C1-C5/F1-F5 de `IMTClassifier`).
+    - `umbrales_fase`: (inferior, superior) para la regla `umbral`.
+    - `fases`: Descripción de cada fase.
+    - `clasificador`: `persistencia`, `persistencia_invertida` (polaridad del
+      SOI), ambos con `persistenceCodes`, o `mensual` (`MEIClassifier`).
+    - `condicion`, `umbrales_evento`: Meses consecutivos y umbrales del clasificador.
+    - `eventos`: Descripción de cada evento.
+    - `intensidad`: Si es True se calcula la columna `type` con
+      `columnEvaluation`; si no, `type` es 'No aplicable'.
 """
 
-def oniIndex(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
+REGISTRO = {
+
+    # Oceanic Niño Index: From NOAA Climate Prediction Center (CPC)
+    # Three month running mean of NOAA ERSST.V5 SST anomalies in the Niño 3.4 region
+    # (5N-5S, 120-170W), based on changing base period which onsist of multiple
+    # centered 30-year base periods. These 30-year base periods will be used to
+    # calculate the anomalies for successive 5-year periods in the historical record.
+    'ONI': {
+        'index_name': 'ONI',
+        'index_description': 'Índice Oceánico El Niño : Media móvil de 3 meses de las anomalías de la TSM ERSST.v5 en la región Niño 3.4 (5°N-5°S, 120°-170°W) Calculada a partir del ERSST V5 (en NOAA/CPC).',
+        'unit': '°C',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': _fasesTSM('3.4'),
+        'clasificador': 'persistencia',
+        'condicion': 5,
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': _EVENTOS_PERSISTENCIA,
+        'intensidad': True,
+    },
+
+    # The bi-monthly Multivariate El Niño/Southern Oscillation (ENSO) index (MEI.v2)
+    # is the time series of the leading combined Empirical Orthogonal Function (EOF)
+    # of five different variables (sea level pressure (SLP), sea surface temperature (SST),
+    # zonal and meridional components of the surface wind, and outgoing longwave radiation (OLR))
+    # over the tropical Pacific basin (30°S-30°N and 100°E-70°W).
+    'MEI': {
+        'index_name': 'MEI',
+        'index_description': 'Índice Multivariado ENOS: v.2 El índice bimensual Multivariado de El Niño/Oscilación del Sur (ENSO) (MEI.v2) es la serie temporal de la principal Función Ortogonal Empírica (EOF, por sus siglas en inglés) combinada de seis variables diferentes: temperatura superficiel, temperatura del aire, presión atmosférica al nivel del mar, nubosidad, componente zonal del viento y componente meridional del viento en la cuenca del Pacífico tropical (30°S-30°N y 100°E-70°W) (en NOAA/CPC https://www.psl.noaa.gov/enso/mei/).',
+        'unit': 'dmless',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': {
+            'Fría': 'Esta fase se caracteriza por condiciones frías asociadas a La Niña (anomalías negativas del MEI)',
+            'Cálida': 'Esta fase se caracteriza por condiciones oceánicas y atmosféricas cálidas asociadas a El Niño (anomalías positivas del MEI)',
+            'Neutra': 'Esta fase se caracteriza por condiciones neutrales, sin predominancia de El Niño ni La Niña',
+        },
+        'clasificador': 'mensual',
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': {
+            'Niña': 'Este evento se caracteriza porque el valor del índice para el mes es igual o inferior al umbral de -0.5',
+            'Niño': 'Este evento se caracteriza porque el valor del índice para el mes es igual o supera el umbral de 0.5',
+            'Neutro': 'Este evento se caracteriza porque el valor del índice para el mes no supera el umbral de 0.5 y no es inferior al umbral de -0.5',
+        },
+        'intensidad': False,
+    },
+
+    # Niño 1+2 Index: From NOAA Climate Prediction Center (CPC)
+    # Extreme Eastern Tropical Pacific SST (0-10S, 90W-80W)
+    # CPC uses the NOAA ERSST V5 anomalies.
+    # Now uses https://www.cpc.ncep.noaa.gov/data/indices/ersst5.nino.mth.91-20.ascii.
+    'Niño 1+2': {
+        'index_name': 'Niño 1+2',
+        'index_description': 'Índice Niño 1+2: representa las anomalías mensuales de la temperatura superficial del mar (TSM) en la región más oriental del Pacífico ecuatorial, delimitada entre los 0°–10°S y 80°W–90°W, frente a las costas de Perú y Ecuador. Calculada a partir del ERSST V5 (en NOAA/CPC).',
+        'unit': '°C',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': _fasesTSM('1+2'),
+        'clasificador': 'persistencia',
+        'condicion': 5,
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': _EVENTOS_PERSISTENCIA,
+        'intensidad': True,
+    },
+
+    # Niño 3 Index: From NOAA Climate Prediction Center (CPC)
+    # Eastern Tropical Pacific SST (5N-5S,150W-90W)
+    # CPC uses the NOAA ERSST V5 anomalies.
+    'Niño 3': {
+        'index_name': 'Niño 3',
+        'index_description': 'Índice Niño 3: El índice Niño 3 corresponde a las anomalías mensuales de la temperatura superficial del mar (TSM) en la región del Pacífico ecuatorial comprendida entre los 5°N–5°S y 90°W–150°W. Calculada a partir del ERSST V5 (en NOAA/CPC).',
+        'unit': '°C',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': _fasesTSM('3'),
+        'clasificador': 'persistencia',
+        'condicion': 5,
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': _EVENTOS_PERSISTENCIA,
+        'intensidad': True,
+    },
+
+    # Niño 3.4 Index: From NOAA Climate Prediction Center (CPC)
+    # East Central Tropical Pacific SST (5N-5S)(170-120W)
+    # CPC uses the NOAA ERSST V5 anomalies.
+    'Niño 3.4': {
+        'index_name': 'Niño 3.4',
+        'index_description': 'Índice Niño 3.4: El índice Niño 3.4 mide las anomalías mensuales de la temperatura superficial del mar (TSM) en la región comprendida entre los 5°N–5°S y 120°W–170°W del Pacífico central ecuatorial. Calculada a partir del ERSST V5 (en NOAA/CPC).',
+        'unit': '°C',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': _fasesTSM('3.4'),
+        'clasificador': 'persistencia',
+        'condicion': 5,
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': _EVENTOS_PERSISTENCIA,
+        'intensidad': True,
+    },
+
+    # Niño 4 Index: Central Tropical Pacific SST (5N-5S) (160E-150W): From CPC
+    # CPC uses the NOAA ERSST V5 anomalies.
+    'Niño 4': {
+        'index_name': 'Niño 4',
+        'index_description': 'Índice Niño 4: El índice Niño 4 representa las anomalías mensuales de la temperatura superficial del mar (TSM) en la región del Pacífico ecuatorial occidental, delimitada entre los 5°N–5°S y 160°E–150°W. Calculada a partir del ERSST V5 (en NOAA/CPC).',
+        'unit': '°C',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': _fasesTSM('4'),
+        'clasificador': 'persistencia',
+        'condicion': 5,
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': _EVENTOS_PERSISTENCIA,
+        'intensidad': True,
+    },
+
+    # Southern Oscillation Index (polaridad invertida: SOI negativo en El Niño)
+    'SOI': {
+        'index_name': 'SOI',
+        'index_description': 'Southern Oscillation Index: El Índice de la Oscilación del Sur es un indicador climático que mide la diferencia de presión atmosférica a nivel del mar entre dos estaciones del Pacífico tropical: Tahití (Polinesia Francesa) y Darwin (Australia). Calculada a partir del ERSST V5 (en NOAA/CPC https://www.psl.noaa.gov/data/timeseries/month/DS/SOI/).',
+        'unit': 'dmLess',
+        'fase': 'signo_invertido',
+        'fases': {
+            'Fría': 'Esta fase se caracteriza por presiones más altas en Tahití y más bajas en Darwin, típicas de La Niña (SOI positivo)',
+            'Cálida': 'Esta fase se caracteriza por presiones más bajas en Tahití y más altas en Darwin, típicas de El Niño (SOI negativo)',
+            'Neutra': 'Esta fase se caracteriza por condiciones neutrales, sin predominancia de El Niño ni La Niña',
+        },
+        'clasificador': 'persistencia_invertida',
+        'condicion': 5,
+        'umbrales_evento': (-0.7, 0.7),
+        'eventos': _EVENTOS_SOI,
+        'intensidad': False,
+    },
+
+    # Índice Multivariado de Tumaco (DIMAR/CCCP)
+    'IMT': {
+        'index_name': 'IMT',
+        'index_description': 'El Índice Multivariado de Tumaco (IMT) es un indicador climático utilizado para monitorear las condiciones oceánicas y atmosféricas en la región del Pacífico colombiano, específicamente en la ensenada de Tumaco. Este índice integra múltiples variables meteorológicas y oceanográficas para evaluar fenómenos como El Niño y La Niña, así como condiciones neutras en la zona. (en DIMAR/CCCP https://cccp.dimar.mil.co/IMT).',
+        'unit': 'dmLess',
+        'fase': 'imt',
+        'clasificador': 'persistencia_invertida',
+        'condicion': 5,
+        'umbrales_evento': (-0.7, 0.7),
+        'eventos': _EVENTOS_SOI,
+        'intensidad': False,
+    },
+
+    # Warm (red) and cold (blue) periods based on a threshold of +/- 0.5°C for the Relative Oceanic Niño Index (RONI),
+    # using the 1991–2020 base period [3 month running mean of ERSST.v5 SST anomalies in the Niño 3.4 region (5°N–5°S, 120°–170°W)
+    # with average tropical mean (20°N–20°S) SST anomalies subtracted. The difference is then adjusted so the variance equals the
+    # original Niño 3.4 index].
+    'RONI': {
+        'index_name': 'RONI',
+        'index_description': 'Índice Oceánico Relativo El Niño  : Media móvil de 3 meses de las anomalías de la TSM ERSST.v5 calculadas usando el período base 1991–2020 [promedio móvil de 3 meses de las anomalías de la temperatura superficial del mar (SST) ERSST.v5 en la región Niño 3.4 (5°N - 5°S, 120° - 170°O), con las anomalías promedio de SST de los trópicos (20°N - 20°S) restadas. Luego, la diferencia se ajusta para que la varianza sea igual a la del índice original de Niño 3.4] (en NOAA/CPC).',
+        'unit': '°C',
+        'fase': 'umbral',
+        'umbrales_fase': (-0.5, 0.5),
+        'fases': _fasesTSM('3.4'),
+        'clasificador': 'persistencia',
+        'condicion': 5,
+        'umbrales_evento': (-0.5, 0.5),
+        'eventos': _EVENTOS_PERSISTENCIA,
+        'intensidad': True,
+    },
+}
+
+
+def _toLong(df):
+    """
+    Convierte la tabla wide (`year`, `01` ... `12`) en una serie long
+    ordenada por mes con las columnas `mes` (ordinal de `monthAxis`) y
+    `value`. Si la tabla ya viene en formato long (`year`, `month`, `value`)
+    sólo se ordena.
+    """
+    if 'value' in df.columns:
+        anios = df['year'].to_numpy()
+        meses = df['month'].astype(int).to_numpy()
+        valores = df['value'].to_numpy(dtype=float)
+    else:
+        columnas = [c for c in df.columns if c != 'year']
+        bloque = df[columnas].to_numpy(dtype=float)
+        anios = np.repeat(df['year'].to_numpy(), len(columnas))
+        meses = np.tile(np.array([int(c) for c in columnas]), len(df))
+        valores = bloque.ravel()
+
+    ordinal = monthAxis.toOrdinal(anios, meses)
+    orden = np.argsort(ordinal, kind='stable')
+    df_long = pd.DataFrame({'mes': ordinal[orden], 'value': valores[orden]})
 
     df_long = df_long[df_long['value'] != -99.9]
     df_long['value'] = df_long['value'].round(1)
 
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
-
-    df_long['index_name'] = 'ONI'
-    df_long['index_description'] = 'Índice Oceánico El Niño : Media móvil de 3 meses de las anomalías de la TSM ERSST.v5 en la región Niño 3.4 (5°N-5°S, 120°-170°W) Calculada a partir del ERSST V5 (en NOAA/CPC).'
-    df_long['unit'] = '°C'
-
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza porque las anomalías de TSM en la región 3.4 son inferiores a -0.5 °C' 
-                                                    if x == 'Fría' else ('Esta fase se caracteriza porque las anomalías de TSM en la región 3.4 son superiores a 0.5 °C' 
-                                                                      if x == 'Cálida'  else 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'))
+    return df_long.reset_index(drop=True)
 
-    # Identificar eventos
-    event_total = Classifier(df_long, 5, -0.5, 0.5) # entradas de la función para el evenClassifier
 
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
+def phaseCodes(values, regla, umbrales=(-0.5, 0.5)):
+    """
+    Calcula el código de fase de cada valor (posición en `FASES`).
 
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos' 
-                                                                         if x == 'Niño' else 'Condiciones neutras'))
-    
-    df_long = columnEvaluation(df_long, 'event', 'value', 'type')
-   
-
-    return df_long
-
-"""
-ÍNDICE mei
+    Args:
+        values (np.ndarray): Valores del índice.
+        regla (str): `umbral` o `signo_invertido`.
+        umbrales (tuple): (inferior, superior) para la regla `umbral`.
 
-Oceanic Niño Index: From NOAA Climate Prediction Center (CPC)
-The bi-monthly Multivariate El Niño/Southern Oscillation (ENSO) index (MEI.v2) 
-is the time series of the leading combined Empirical Orthogonal Function (EOF) 
-of five different variables (sea level pressure (SLP), sea surface temperature (SST), 
-zonal and meridional components of the surface wind, and outgoing longwave radiation (OLR)) 
-over the tropical Pacific basin (30°S-30°N and 100°E-70°W).
+    Returns:
+        np.ndarray: Códigos 0 (Fría), 1 (Cálida) o 2 (Neutra). Los NaN son Neutra.
+    """
+    values = np.asarray(values, dtype=float)
+    if regla == 'signo_invertido':
+        condiciones = [values > 0, values < 0]
+    else:
+        condiciones = [values <= umbrales[0], values >= umbrales[1]]
+    return np.select(condiciones, [0, 1], default=2)
 
-"""
 
-def meiIndex(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
+def processIndex(df, nombre):
+    """
+    Procesa un índice del registro para incluir información transformada y
+    clasificaciones de eventos.
 
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
+    Args:
+        df (pd.DataFrame): Tabla wide (`year`, `01` ... `12`) o long
+            (`year`, `month`, `value`) con los valores del índice.
+        nombre (str): Clave del índice en `REGISTRO` (p. ej. 'ONI').
 
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
+    Returns:
+        pd.DataFrame: DataFrame transformado con las columnas `date`, `value`,
+        `index_name`, `index_description`, `unit`, `phase`,
+        `phase_description`, `event`, `event_description` y `type`.
+    """
+    config = REGISTRO[nombre]
+    df_long = _toLong(df)
+    valores = df_long['value'].to_numpy()
+
+    df_long['index_name'] = config['index_name']
+    df_long['index_description'] = config['index_description']
+    df_long['unit'] = config['unit']
+
+    # Fases: código por posición y textos tomados del arreglo de descripciones
+    with instrument.stage('clasificar:fase', filas_entrada=len(valores)):
+        if config['fase'] == 'imt':
+            clasificacion = IMTClassifier(valores)
+            df_long['phase'] = clasificacion['intensidad']
+            df_long['phase_description'] = clasificacion['fase']
+        else:
+            codigos = phaseCodes(valores, config['fase'], config.get('umbrales_fase', (-0.5, 0.5)))
+            df_long['phase'] = FASES[codigos]
+            df_long['phase_description'] = np.array([config['fases'][f] for f in FASES])[codigos]
+
+    # Eventos: códigos alineados por posición con `valores` (sin merge por fecha)
+    inferior, superior = config['umbrales_evento']
+    with instrument.stage('clasificar:evento', filas_entrada=len(valores)):
+        if config['clasificador'] == 'mensual':
+            df_long = MEIClassifier(df_long)
+            codigos_evento = pd.Categorical(df_long['event'], categories=EVENTOS).codes
+        else:
+            codigos_evento = persistenceCodes(valores, config['condicion'], inferior, superior,
+                                              invertido=config['clasificador'] == 'persistencia_invertida')
+            df_long['event'] = EVENTOS[codigos_evento]
+
+        df_long['event_description'] = np.array([config['eventos'][e] for e in EVENTOS])[codigos_evento]
+
+    # Intensidad
+    with instrument.stage('clasificar:intensidad', filas_entrada=len(df_long)):
+        if config['intensidad']:
+            df_long = columnEvaluation(df_long, 'event', 'value', 'type')
+        else:
+            df_long['type'] = 'No aplicable'
+
+    # La fecha sólo se construye para la salida
+    df_long.insert(0, 'date', monthAxis.toDatetime(df_long['mes'].to_numpy()))
+    return df_long.drop(columns='mes')
+
+
+# Modo por lotes
+
+# Etiqueta de intensidad de los índices sin intensidad (código `len(INTENSIDADES)`)
+TIPOS = np.array(INTENSIDADES + ['No aplicable'])
+
+# Columnas de la tabla final, en orden
+COLUMNAS = ['date', 'value', 'index_name', 'index_description', 'unit', 'phase',
+            'phase_description', 'event', 'event_description', 'type']
+
+
+def alignIndices(datos, nombres):
+    """
+    Ubica varios índices en una matriz `(índices, meses)` sobre un calendario
+    mensual común.
 
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
+    Args:
+        datos (dict): Tablas wide o long con el nombre del archivo como clave.
+        nombres (dict): Nombre del archivo -> clave del índice en `REGISTRO`,
+            en el orden de las filas.
 
-    df_long['index_name'] = 'MEI'
-    df_long['index_description'] = 'Índice Multivariado ENOS: v.2 El índice bimensual Multivariado de El Niño/Oscilación del Sur (ENSO) (MEI.v2) es la serie temporal de la principal Función Ortogonal Empírica (EOF, por sus siglas en inglés) combinada de seis variables diferentes: temperatura superficiel, temperatura del aire, presión atmosférica al nivel del mar, nubosidad, componente zonal del viento y componente meridional del viento en la cuenca del Pacífico tropical (30°S-30°N y 100°E-70°W) (en NOAA/CPC https://www.psl.noaa.gov/enso/mei/).'
-    df_long['unit'] = 'dmless'
+    Returns:
+        dict: `indices` (claves de `REGISTRO` por fila), `calendario`
+        (ordinales de `monthAxis`) y `valores` (matriz float con NaN en los
+        meses sin dato).
+    """
+    series = [_toLong(datos[archivo]) for archivo in nombres]
+    inicio = min(int(serie['mes'].iloc[0]) for serie in series if len(serie))
+    fin = max(int(serie['mes'].iloc[-1]) for serie in series if len(serie))
+    calendario = monthAxis.calendar(inicio, fin)
 
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza por condiciones oceánicas y atmosféricas cálidas asociadas a El Niño (anomalías positivas del MEI)' 
-                                                    if x == 'Cálida' else ('Esta fase se caracteriza por condiciones frías asociadas a La Niña (anomalías negativas del MEI)' 
-                                                                        if x == 'Fría' else 'Esta fase se caracteriza por condiciones neutrales, sin predominancia de El Niño ni La Niña'))
-    # Identificar eventos
-    df_long = MEIClassifier (df_long) # entradas de la función para el evenClassifier
+    valores = np.full((len(series), len(calendario)), np.nan)
+    for fila, serie in enumerate(series):
+        valores[fila] = monthAxis.align(serie['mes'].to_numpy(), serie['value'].to_numpy(), calendario)
 
-    
+    return {'indices': list(nombres.values()), 'calendario': calendario, 'valores': valores}
 
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque el valor del índice para el mes es igual o inferior al umbral de -0.5' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque el valor del índice para el mes es igual o supera el umbral de 0.5' 
-                                                                         if x == 'Niño' else 'Este evento se caracteriza porque el valor del índice para el mes no supera el umbral de 0.5 y no es inferior al umbral de -0.5'))
-    
-    df_long['type'] = 'No aplicable'
-   
 
-    return df_long
+def _porFila(configs, campo, defecto=None):
+    return [config.get(campo, defecto) for config in configs]
 
-"""
-ÍNDICE NIÑO 1+2
 
-Niño 1+2 Index: From NOAA Climate Prediction Center (CPC)
-Extreme Eastern Tropical Pacific SST (0-10S, 90W-80W)
-CPC uses the NOAA ERSST V5 anomalies. 
-Now uses https://www.cpc.ncep.noaa.gov/data/indices/ersst5.nino.mth.91-20.ascii. 
-Mean values also available.  
+def eventParameters(indice):
+    """
+    Parámetros de persistencia de un índice de `REGISTRO`: (`condicion`,
+    `umbral_inferior`, `umbral_superior`, `invertido`). El clasificador
+    mensual es una persistencia de 1 mes.
+    """
+    config = REGISTRO[indice]
+    condicion = 1 if config['clasificador'] == 'mensual' else config['condicion']
+    inferior, superior = config['umbrales_evento']
+    return condicion, inferior, superior, config['clasificador'] == 'persistencia_invertida'
 
-"""
 
-def nino12Index(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
+def classifyBatch(lote, evento=None):
+    """
+    Calcula fases, eventos e intensidad de todos los índices de `lote` (ver
+    `alignIndices`) en una pasada por regla, con los umbrales y duraciones de
+    `REGISTRO` de cada fila.
 
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
+    Args:
+        lote (dict): Lote de `alignIndices`.
+        evento (np.ndarray): Matriz de códigos de evento ya calculada (p. ej.
+            por el detector incremental). Si es None se calcula por persistencia.
 
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
+    Returns:
+        dict: `lote` con las matrices `int8` `fase` (posición en `FASES`, o en
+        `CATEGORIAS_IMT` para las filas del IMT), `evento` (posición en
+        `EVENTOS`) y `tipo` (posición en `TIPOS`).
+    """
+    valores = lote['valores']
+    configs = [REGISTRO[indice] for indice in lote['indices']]
+    reglas = np.array(_porFila(configs, 'fase'))
+
+    # Fases: un bloque de filas por regla
+    with instrument.stage('clasificar:fase', filas_entrada=valores.size):
+        fase = np.full(valores.shape, 2, dtype=np.int8)
+        for regla in np.unique(reglas):
+            filas = reglas == regla
+            if regla == 'imt':
+                fase[filas] = imtCodes(valores[filas])
+            else:
+                umbrales = np.array(_porFila(configs, 'umbrales_fase', (-0.5, 0.5)))[filas]
+                fase[filas] = phaseCodes(valores[filas], regla, (umbrales[:, :1], umbrales[:, 1:]))
+
+    # Eventos: una sola pasada de persistencia con los parámetros de cada fila
+    if evento is None:
+        with instrument.stage('clasificar:evento', filas_entrada=valores.size):
+            condicion, inferior, superior, invertido = zip(*(eventParameters(indice) for indice in lote['indices']))
+            evento = persistenceMatrix(valores, condicion, inferior, superior, invertido)
+
+    # Intensidad
+    with instrument.stage('clasificar:intensidad', filas_entrada=valores.size):
+        tipo = intensityCodes(valores)
+        tipo[evento == NEUTRO] = 0
+        tipo[~np.array(_porFila(configs, 'intensidad'), dtype=bool)] = len(INTENSIDADES)
+
+    lote.update(fase=fase, evento=evento, tipo=tipo)
+    return lote
+
+
+def _etiquetasFase(config):
+    """
+    Etiquetas y descripciones de fase de un índice, por código de `classifyBatch`.
+    """
+    if config['fase'] == 'imt':
+        return CATEGORIAS_IMT, [FASES_IMT[f] for f in FASE_POR_CATEGORIA]
+    return list(FASES), [config['fases'][f] for f in FASES]
+
+
+def batchToLong(lote):
+    """
+    Exporta un lote clasificado (ver `classifyBatch`) a la tabla long de
+    `processIndex`, con los índices en el orden de las filas y sin los meses
+    sin dato.
 
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
+    Returns:
+        pd.DataFrame: Tabla final en formato long de todos los índices.
+    """
+    valores = lote['valores']
+    configs = [REGISTRO[indice] for indice in lote['indices']]
+    fila, columna = np.nonzero(~np.isnan(valores))
+
+    # Tablas de textos (filas x códigos); cada columna se arma con un solo
+    # indexado por (fila, código)
+    fases = [_etiquetasFase(config) for config in configs]
+    ancho = max(len(etiquetas) for etiquetas, _ in fases)
+    fase_texto = np.full((len(configs), ancho), None, dtype=object)
+    fase_descripcion = np.full((len(configs), ancho), None, dtype=object)
+    for i, (etiquetas, descripciones) in enumerate(fases):
+        fase_texto[i, :len(etiquetas)] = etiquetas
+        fase_descripcion[i, :len(descripciones)] = descripciones
+    evento_descripcion = np.array([[config['eventos'][e] for e in EVENTOS] for config in configs], dtype=object)
+
+    codigo_fase = lote['fase'][fila, columna]
+    codigo_evento = lote['evento'][fila, columna]
+
+    return pd.DataFrame({
+        'date': monthAxis.toDatetime(lote['calendario'][columna]),
+        'value': valores[fila, columna],
+        'index_name': np.array(_porFila(configs, 'index_name'), dtype=object)[fila],
+        'index_description': np.array(_porFila(configs, 'index_description'), dtype=object)[fila],
+        'unit': np.array(_porFila(configs, 'unit'), dtype=object)[fila],
+        'phase': fase_texto[fila, codigo_fase],
+        'phase_description': fase_descripcion[fila, codigo_fase],
+        'event': EVENTOS.astype(object)[codigo_evento],
+        'event_description': evento_descripcion[fila, codigo_evento],
+        'type': TIPOS.astype(object)[lote['tipo'][fila, columna]],
+    })
+
+
+def sweepIndex(df, nombre, ajustes=None):
+    """
+    Compara los catálogos de eventos de un índice bajo una grilla de
+    definiciones alternativas (ver `eventClassifier.persistenceSweep`).
 
-    df_long['index_name'] = 'Niño 1+2'
-    df_long['index_description'] = 'Índice Niño 1+2: representa las anomalías mensuales de la temperatura superficial del mar (TSM) en la región más oriental del Pacífico ecuatorial, delimitada entre los 0°–10°S y 80°W–90°W, frente a las costas de Perú y Ecuador. Calculada a partir del ERSST V5 (en NOAA/CPC).'
-    df_long['unit'] = '°C'
+    Args:
+        df (pd.DataFrame): Tabla wide o long del índice.
+        nombre (str): Clave del índice en `REGISTRO`; de ella se toma la polaridad.
+        ajustes (np.ndarray): Matriz `(g, 3)` de (inferior, superior,
+            duración). Por defecto +/-0.5, +/-0.7 y +/-1.0 con 3 a 7 meses.
 
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza porque las anomalías de TSM en la región 1+2 son inferiores a -0.5 °C' 
-                                                    if x == 'Fría' else ('Esta fase se caracteriza porque las anomalías de TSM en la región 1+2 son superiores a 0.5 °C' 
-                                                                      if x == 'Cálida'  else 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'))
+    Returns:
+        dict: Resultado de `persistenceSweep` más `meses` (ordinales de
+        `monthAxis` de las columnas de `codigos`).
+    """
+    lote = alignIndices({nombre: df}, {nombre: nombre})
+    invertido = eventParameters(nombre)[3]
+    resultado = persistenceSweep(lote['valores'][0], sweepGrid() if ajustes is None else ajustes, invertido)
+    resultado['meses'] = lote['calendario']
+    return resultado
 
-    # Identificar eventos
-    event_total = Classifier(df_long, 5, -0.5, 0.5) # entradas de la función para el evenClassifier
 
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
+# Funciones por índice (se mantienen por compatibilidad)
 
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos' 
-                                                                         if x == 'Niño' else 'Condiciones neutras'))
-    
-    df_long = columnEvaluation(df_long, 'event', 'value', 'type')
-   
+def oniIndex(df):
+    return processIndex(df, 'ONI')
 
-    return df_long
 
+def meiIndex(df):
+    return processIndex(df, 'MEI')
 
-"""
-ÍNDICE NIÑO 3
 
-Niño 3 Index: From NOAA Climate Prediction Center (CPC)
-Eastern Tropical Pacific SST (5N-5S,150W-90W): From NOAA Climate Prediction Center(CPC)
-CPC uses the NOAA ERSST V5 anomalies. Now uses https://www.cpc.ncep.noaa.gov/data/indices/ersst5.nino.mth.91-20.ascii. Mean values also available.   
+def nino12Index(df):
+    return processIndex(df, 'Niño 1+2')
 
-"""
 
 def nino3Index(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
-
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
+    return processIndex(df, 'Niño 3')
 
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
-
-    df_long['index_name'] = 'Niño 3'
-    df_long['index_description'] = 'Índice Niño 3: El índice Niño 3 corresponde a las anomalías mensuales de la temperatura superficial del mar (TSM) en la región del Pacífico ecuatorial comprendida entre los 5°N–5°S y 90°W–150°W. Calculada a partir del ERSST V5 (en NOAA/CPC).'
-    df_long['unit'] = '°C'
-
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza porque las anomalías de TSM en la región 3 son inferiores a -0.5 °C' 
-                                                    if x == 'Fría' else ('Esta fase se caracteriza porque las anomalías de TSM en la región 3 son superiores a 0.5 °C' 
-                                                                      if x == 'Cálida'  else 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'))
-
-    # Identificar eventos
-    event_total = Classifier(df_long, 5, -0.5, 0.5) # entradas de la función para el evenClassifier
-
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
-
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos' 
-                                                                         if x == 'Niño' else 'Condiciones neutras'))
-    
-    df_long = columnEvaluation(df_long, 'event', 'value', 'type')
-   
-
-    return df_long
-
-
-"""
-ÍNDICE NIÑO 3.4
-
-Niño 3 Index: From NOAA Climate Prediction Center (CPC)
-East Central Tropical Pacific SST (5N-5S)(170-120W): From CPC
-CPC uses the NOAA ERSST V5 anomalies. Now uses https://www.cpc.ncep.noaa.gov/data/indices/ersst5.nino.mth.91-20.ascii. Mean values also available. 
-"""
 
 def nino34Index(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
-
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
-
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
+    return processIndex(df, 'Niño 3.4')
 
-    df_long['index_name'] = 'Niño 3.4'
-    df_long['index_description'] = 'Índice Niño 3.4: El índice Niño 3.4 mide las anomalías mensuales de la temperatura superficial del mar (TSM) en la región comprendida entre los 5°N–5°S y 120°W–170°W del Pacífico central ecuatorial. Calculada a partir del ERSST V5 (en NOAA/CPC).'
-    df_long['unit'] = '°C'
-
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza porque las anomalías de TSM en la región 3.4 son inferiores a -0.5 °C' 
-                                                    if x == 'Fría' else ('Esta fase se caracteriza porque las anomalías de TSM en la región 3.4 son superiores a 0.5 °C' 
-                                                                      if x == 'Cálida'  else 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'))
-
-    # Identificar eventos
-    event_total = Classifier(df_long, 5, -0.5, 0.5) # entradas de la función para el evenClassifier
-
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
-
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos' 
-                                                                         if x == 'Niño' else 'Condiciones neutras'))
-    
-    df_long = columnEvaluation(df_long, 'event', 'value', 'type')
-   
-
-    return df_long
-
-"""
-ÍNDICE NIÑO 4
-
-Central Tropical Pacific SST (5N-5S) (160E-150W): From CPC
-CPC uses the NOAA ERSST V5 anomalies. Now uses https://www.cpc.ncep.noaa.gov/data/indices/ersst5.nino.mth.91-20.ascii. Mean values also available. 
-
-"""
 
 def nino4Index(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
-
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
-
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
-
-    df_long['index_name'] = 'Niño 4'
-    df_long['index_description'] = 'Índice Niño 4: El índice Niño 4 representa las anomalías mensuales de la temperatura superficial del mar (TSM) en la región del Pacífico ecuatorial occidental, delimitada entre los 5°N–5°S y 160°E–150°W. Calculada a partir del ERSST V5 (en NOAA/CPC).'
-    df_long['unit'] = '°C'
+    return processIndex(df, 'Niño 4')
 
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza porque las anomalías de TSM en la región 4 son inferiores a -0.5 °C' 
-                                                    if x == 'Fría' else ('Esta fase se caracteriza porque las anomalías de TSM en la región 4 son superiores a 0.5 °C' 
-                                                                      if x == 'Cálida'  else 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'))
-
-    # Identificar eventos
-    event_total = Classifier(df_long, 5, -0.5, 0.5) # entradas de la función para el evenClassifier
-
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
-
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos' 
-                                                                         if x == 'Niño' else 'Condiciones neutras'))
-    
-    df_long = columnEvaluation(df_long, 'event', 'value', 'type')
-   
-
-    return df_long
-
-
-"""
-ÍNDICE SOI
-
-"""
 
 def soiIndex(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
-
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
-
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
-    
-    df_long['index_name'] = 'SOI'
-    df_long['index_description'] = 'Southern Oscillation Index: El Índice de la Oscilación del Sur es un indicador climático que mide la diferencia de presión atmosférica a nivel del mar entre dos estaciones del Pacífico tropical: Tahití (Polinesia Francesa) y Darwin (Australia). Calculada a partir del ERSST V5 (en NOAA/CPC https://www.psl.noaa.gov/data/timeseries/month/DS/SOI/).'
-    df_long['unit'] = 'dmLess'
-
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x > 0 else ('Cálida' if x < 0 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza por presiones más bajas en Tahití y más altas en Darwin, típicas de El Niño (SOI negativo)' 
-                                                    if x == 'Cálida' else ('Esta fase se caracteriza por presiones más altas en Tahití y más bajas en Darwin, típicas de La Niña (SOI positivo)'       
-                                                                           if x == 'Fría' else 'Esta fase se caracteriza por condiciones neutrales, sin predominancia de El Niño ni La Niña'))
-    # Identificar eventos
-    event_total = SOIClassifier (df_long, 5, -0.7, 0.7) # entradas de la función para el evenClassifier
-
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
-
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque el valor del índice para el mes es positivo' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque el valor del índice para el mes es negativo' 
-                                                                         if x == 'Niño' else 'Este evento se caracteriza porque el valor del índice para el mes es cero'))
-    
-    df_long['type'] = 'No aplicable'
-   
-
-    return df_long
-
-"""
-ÍNDICE IMT
+    return processIndex(df, 'SOI')
 
-"""
 
 def IMTIndex(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
-
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
-
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
-    
-    df_long['index_name'] = 'IMT'
-    df_long['index_description'] = 'El Índice Multivariado de Tumaco (IMT) es un indicador climático utilizado para monitorear las condiciones oceánicas y atmosféricas en la región del Pacífico colombiano, específicamente en la ensenada de Tumaco. Este índice integra múltiples variables meteorológicas y oceanográficas para evaluar fenómenos como El Niño y La Niña, así como condiciones neutras en la zona. (en DIMAR/CCCP https://cccp.dimar.mil.co/IMT).'
-    df_long['unit'] = 'dmLess'
-
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = IMTClassifier(df_long['value'])
-    
-    
-    fase_descripcion = {
-        'C5': 'Fase cálida muy fuerte',
-        'C4': 'Fase cálida muy fuerte',
-        'C3': 'Fase cálida fuerte',
-        'C2': 'Fase cálida moderada',
-        'C1': 'Fase cálida neutra',
-        'F1': 'Fase fría neutra',
-        'F2': 'Fase fría moderada',
-        'F3': 'Fase fría fuerte',
-        'F4': 'Fase fría muy fuerte',
-        'F5': 'Fase fría muy fuerte'
-    }
-
-    
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: fase_descripcion.get(x, 'Fase desconocida'))
-
-
-    # Identificar eventos
-    event_total = SOIClassifier (df_long, 5, -0.7, 0.7) # entradas de la función para el evenClassifier
-
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
-
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque el valor del índice para el mes es positivo' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque el valor del índice para el mes es negativo' 
-                                                                         if x == 'Niño' else 'Este evento se caracteriza porque el valor del índice para el mes es cero'))
-    
-    df_long['type'] = 'No aplicable'
-   
-
-    return df_long
-
-
-"""
-ÍNDICE RONI
+    return processIndex(df, 'IMT')
 
-Warm (red) and cold (blue) periods based on a threshold of +/- 0.5°C for the Relative Oceanic Niño Index (RONI), 
-using the 1991–2020 base period [3 month running mean of ERSST.v5 SST anomalies in the Niño 3.4 region (5°N–5°S, 120°–170°W) 
-with average tropical mean (20°N–20°S) SST anomalies subtracted. The difference is then adjusted so the variance equals the 
-original Niño 3.4 index].
-
-For historical purposes, periods of below and above normal SSTs are colored in blue and red when the threshold is met 
-for a minimum of five (5) consecutive overlapping seasons. The RONI is one measure of the El Niño Southern Oscillation, 
-and other indices can confirm whether features consistent with a coupled ocean-atmosphere phenomenon accompanied these periods.
-
-"""
 
 def roniIndex(df):
-    # Transformar el DataFrame
-    df_long = df.melt(id_vars=['year'], var_name='month', value_name='value')
-    df_long['year'] = df_long['year'].astype(str)
-    #initial_line = pd.DataFrame({'year': ['1949'], 'month': ['12'], 'value': [-0.5]})
-    #df_long = pd.concat([initial_line, df_long], ignore_index=True)
-
-    df_long['day'] = 1
-    df_long['day'] = df_long['day'].astype(str)
-
-    df_long = df_long[df_long['value'] != -99.9]
-    df_long['value'] = df_long['value'].round(1)
-
-    df_long['date'] = pd.to_datetime(df_long[['year', 'month', 'day']])
-    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
-    df_long = df_long[['date', 'value']]
-    df_long = df_long.sort_values(by='date')
-    df_long['date'] = pd.to_datetime(df_long['date'])
-
-    df_long['index_name'] = 'RONI'
-    df_long['index_description'] = 'Índice Oceánico Relativo El Niño  : Media móvil de 3 meses de las anomalías de la TSM ERSST.v5 calculadas usando el período base 1991–2020 [promedio móvil de 3 meses de las anomalías de la temperatura superficial del mar (SST) ERSST.v5 en la región Niño 3.4 (5°N - 5°S, 120° - 170°O), con las anomalías promedio de SST de los trópicos (20°N - 20°S) restadas. Luego, la diferencia se ajusta para que la varianza sea igual a la del índice original de Niño 3.4] (en NOAA/CPC).'
-    df_long['unit'] = '°C'
-
-    # Crear una nueva columna 'Phase' con condiciones basadas en los valores de 'value'
-    df_long['phase'] = df_long['value'].apply(lambda x: 'Fría' if x <= -0.5 else ('Cálida' if x >= 0.5 else 'Neutra'))
-    df_long['phase_description'] = df_long['phase'].apply(lambda x: 'Esta fase se caracteriza porque las anomalías de TSM en la región 3.4 son inferiores a -0.5 °C' 
-                                                    if x == 'Fría' else ('Esta fase se caracteriza porque las anomalías de TSM en la región 3.4 son superiores a 0.5 °C' 
-                                                                      if x == 'Cálida'  else 'Esta fase se caracteriza porque las anomalías de TSM son inferiores a 0.5 °C y superiores a -0.5 °C'))
-
-    # Identificar eventos
-    event_total = Classifier(df_long, 5, -0.5, 0.5) # entradas de la función para el evenClassifier
-
-    # Unir los eventos con el DataFrame original
-    df_long = pd.merge(df_long, event_total, on='date')
-
-    df_long['event_description'] = df_long['event'].apply(lambda x: 'Este evento se caracteriza porque la fase fría persiste durante al menos 5 meses consecutivos' 
-                                                    if x == 'Niña' else ('Este evento se caracteriza porque la fase cálida persiste durante al menos 5 meses consecutivos' 
-                                                                         if x == 'Niño' else 'Condiciones neutras'))
-    
-    df_long = columnEvaluation(df_long, 'event', 'value', 'type')
-   
-
-    return df_long
-
-
+    return processIndex(df, 'RONI')
@@ -0,0 +1,236 @@
+"""
+instrument.py
+=================
+
+Este módulo mide las etapas del ETL (ingesta, procesamiento de cada índice,
+clasificadores, concatenación y exportaciones): tiempo de reloj, tiempo de
+CPU, filas de entrada y de salida y pico de memoria, y guarda un reporte
+JSON por ejecución.
+
+Descripción:
+------------
+- `startReport` / `stopReport`: Inician y cierran el reporte de una ejecución.
+- `stage`: Contexto que mide una etapa (no hace nada si no hay reporte activo).
+- `wrap`: Envuelve una función en una etapa y cuenta sus filas de entrada y
+  salida; opcionalmente la perfila con `cProfile`.
+- `writeReport`: Guarda el reporte en JSON.
+- `summary`: Resumen en texto de las etapas más lentas.
+
+Reporte:
+--------
+    {"inicio": "...", "segundos": 2.1, "cpu_segundos": 2.0, "rss_pico_mb": 180.3,
+     "etapas": [{"nombre": "clasificar", "padre": null, "hilo": "...",
+                 "inicio": 0.12, "segundos": 0.05, "cpu_segundos": 0.05,
+                 "filas_entrada": 76, "filas_salida": 912, "memoria_pico_mb": 1.2,
+                 "perfil": "..."}, ...]}
+
+Notas:
+------
+- Las etapas anidadas (p. ej. las fases dentro de `clasificar`)
+  llevan el nombre de la etapa que las contiene en `padre`.
+- El tiempo de CPU es el del hilo de la etapa (`time.thread_time`).
+- La memoria por etapa se mide con `tracemalloc` (memoria de Python y de
+  NumPy), que hace más lentas las etapas con muchos objetos de Python (p. ej.
+  la exportación a `.xlsx`); por eso es opcional. El pico de `tracemalloc`
+  es de todo el proceso: con varias etapas en paralelo se mezclan entre
+  ellas, así que `cli` ejecuta las tareas en un solo hilo cuando se mide la
+  memoria. El pico de RSS del proceso (`rss_pico_mb`) se registra siempre
+  que el sistema lo permita.
+- Los perfiles (`.prof`) se abren con `pstats`, `snakeviz` o se convierten
+  a flamegraph con `flameprof`.
+
+Librerías requeridas:
+---------------------
+- Sólo la librería estándar.
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import json
+import time
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager
+from functools import wraps
+
+from modules.atomicWrite import writeAtomic
+
+_activo = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def startReport(memoria=False, perfil_dir=None):
+    """
+    Inicia el reporte de una ejecución; las etapas que se midan desde ahora
+    se agregan a él.
+
+    Args:
+        memoria (bool): Mide el pico de memoria con `tracemalloc`.
+        perfil_dir (str): Carpeta donde `wrap` guarda un `.prof` por etapa.
+            Si es None no se perfila.
+
+    Returns:
+        dict: Reporte activo.
+    """
+    global _activo
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if perfil_dir is not None:
+        os.makedirs(perfil_dir, exist_ok=True)
+    _activo = {'inicio': datetime.now().isoformat(timespec='seconds'), 'etapas': [],
+               '_t0': time.perf_counter(), '_cpu0': time.process_time(),
+               '_memoria': memoria, '_perfil_dir': perfil_dir}
+    return _activo
+
+
+def stopReport():
+    """
+    Cierra el reporte activo.
+
+    Returns:
+        dict: Reporte con los totales de la ejecución y sus etapas.
+    """
+    global _activo
+    reporte, _activo = _activo, None
+    if reporte is None:
+        return None
+    reporte['segundos'] = round(time.perf_counter() - reporte.pop('_t0'), 4)
+    reporte['cpu_segundos'] = round(time.process_time() - reporte.pop('_cpu0'), 4)
+    if reporte.pop('_memoria'):
+        reporte['memoria_pico_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    try:
+        import resource
+        # `ru_maxrss` está en KB en Linux
+        reporte['rss_pico_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+    except ImportError:
+        pass
+    reporte.pop('_perfil_dir')
+    return reporte
+
+
+def _pila():
+    if not hasattr(_local, 'pila'):
+        _local.pila = []
+    return _local.pila
+
+
+@contextmanager
+def stage(nombre, filas_entrada=None):
+    """
+    Mide una etapa. El registro que entrega admite `filas_salida` (y
+    cualquier otro dato) para completarlo dentro del bloque.
+
+        with instrument.stage('clasificar:persistencia', filas_entrada=n) as registro:
+            ...
+            registro['filas_salida'] = len(codigos)
+    """
+    reporte = _activo
+    registro = {'nombre': nombre, 'filas_entrada': filas_entrada, 'filas_salida': None}
+    if reporte is None:
+        yield registro
+        return
+
+    pila = _pila()
+    registro['padre'] = pila[-1]['registro']['nombre'] if pila else None
+    registro['hilo'] = threading.current_thread().name
+    marca = {'registro': registro, 'pico': 0}
+
+    if reporte['_memoria']:
+        # El pico de `tracemalloc` es uno solo: antes de reiniciarlo se
+        # traspasa a las etapas que contienen a esta
+        actual, pico = tracemalloc.get_traced_memory()
+        for abierta in pila:
+            abierta['pico'] = max(abierta['pico'], pico)
+        tracemalloc.reset_peak()
+        marca['base'], marca['pico'] = actual, actual
+
+    pila.append(marca)
+    t0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield registro
+    finally:
+        registro['inicio'] = round(t0 - reporte['_t0'], 4)
+        registro['segundos'] = round(time.perf_counter() - t0, 4)
+        registro['cpu_segundos'] = round(time.thread_time() - cpu0, 4)
+        pila.pop()
+        if reporte['_memoria']:
+            pico = max(tracemalloc.get_traced_memory()[1], marca['pico'])
+            registro['memoria_pico_mb'] = round((pico - marca['base']) / 2**20, 2)
+            for abierta in pila:
+                abierta['pico'] = max(abierta['pico'], pico)
+        with _lock:
+            reporte['etapas'].append(registro)
+
+
+def _filas(objeto):
+    # Filas de una tabla, un arreglo o una colección de ellos
+    if hasattr(objeto, 'shape') and len(getattr(objeto, 'shape', ())) > 0:
+        return int(objeto.shape[0])
+    if isinstance(objeto, dict):
+        objeto = list(objeto.values())
+    if isinstance(objeto, (list, tuple)):
+        conteos = [_filas(x) for x in objeto]
+        conteos = [c for c in conteos if c is not None]
+        return sum(conteos) if conteos else None
+    return None
+
+
+def wrap(nombre, funcion):
+    """
+    Envuelve `funcion` en la etapa `nombre`: cuenta las filas de sus
+    argumentos y de su resultado y, si el reporte se inició con
+    `perfil_dir`, guarda su perfil en `<perfil_dir>/<nombre>.prof`.
+    """
+    @wraps(funcion)
+    def envuelta(*args, **kwargs):
+        with stage(nombre, filas_entrada=_filas(args)) as registro:
+            perfil_dir = _activo['_perfil_dir'] if _activo is not None else None
+            if perfil_dir is None:
+                resultado = funcion(*args, **kwargs)
+            else:
+                perfil = cProfile.Profile()
+                resultado = perfil.runcall(funcion, *args, **kwargs)
+                registro['perfil'] = os.path.join(perfil_dir, nombre.replace(':', '__') + ".prof")
+                perfil.dump_stats(registro['perfil'])
+            registro['filas_salida'] = _filas(resultado)
+        return resultado
+    return envuelta
+
+
+def writeReport(reporte, path):
+    """
+    Guarda el reporte en JSON (crea la carpeta si hace falta).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return writeAtomic(lambda tmp: json.dump(reporte, tmp, indent=2, ensure_ascii=False), path,
+                       encoding='UTF-8')
+
+
+def summary(reporte, n=10):
+    """
+    Resumen en texto de las `n` etapas de primer nivel más lentas.
+    """
+    etapas = sorted((e for e in reporte['etapas'] if e.get('padre') is None),
+                    key=lambda e: e['segundos'], reverse=True)[:n]
+    lineas = [f"{'etapa':<22} {'seg':>8} {'cpu':>8} {'filas':>9} {'MB':>8}"]
+    for etapa in etapas:
+        filas = etapa['filas_salida'] if etapa['filas_salida'] is not None else '-'
+        lineas.append(f"{etapa['nombre']:<22} {etapa['segundos']:>8.3f} {etapa['cpu_segundos']:>8.3f} "
+                      f"{filas:>9} {etapa.get('memoria_pico_mb', '-'):>8}")
+    lineas.append(f"Total: {reporte['segundos']:.3f} s, CPU {reporte['cpu_segundos']:.3f} s")
+    return "\n".join(lineas)
@@ -0,0 +1,330 @@
+"""
+kernels.py
+=================
+
+Este módulo reúne los núcleos numéricos de la clasificación (rachas de
+persistencia, intensidad y suavizado de intensidad por evento) detrás de una
+misma interfaz con dos implementaciones intercambiables:
+
+- `numpy`: implementación de referencia con operaciones vectorizadas.
+- `numba`: bucles de una sola pasada compilados con Numba. Sólo está
+  disponible si Numba está instalado y se compila la primera vez que se elige.
+
+Descripción:
+------------
+- `persistence`: Códigos de evento por persistencia de una matriz `(series, meses)`.
+- `intensity`: Códigos de intensidad según `abs(valor)` y unos bordes.
+- `strength`: Suavizado de intensidad por evento (ver `eventClassifier.strengthCodes`).
+- `setBackend` / `getBackend` / `availableBackends`: Selección de la implementación.
+- `checkParity`: Compara las etiquetas de todas las implementaciones disponibles.
+
+Notas:
+------
+- Las funciones de `eventClassifier` (`persistenceMatrix`, `intensityCodes`,
+  `strengthCodes`) llaman a estos núcleos, así que cambiar la implementación
+  afecta a todo el ETL.
+- `python -m modules.kernels` ejecuta `checkParity` con datos sintéticos y
+  termina con código 1 si alguna implementación no coincide.
+
+Librerías requeridas:
+---------------------
+- `numpy >= 1.24.3`
+- `numba` (opcional)
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import numpy as np
+
+# Códigos de evento (posiciones de `eventClassifier.EVENTOS`)
+NINA, NINO, NEUTRO = 0, 1, 2
+
+
+# Implementación NumPy (referencia)
+
+def _runsPersistentes(mask, condicion, ancho=None):
+    """
+    Marca las posiciones de `mask` que pertenecen a una racha de al menos
+    `condicion` valores True consecutivos.
+
+    Si `ancho` no es None, `mask` es una matriz aplanada con filas de `ancho`
+    posiciones y `condicion` trae un valor por fila.
+    """
+    bordes = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).view(np.int8)))
+    inicios, fines = bordes[0::2], bordes[1::2]
+    if ancho is not None:
+        condicion = np.asarray(condicion)[inicios // ancho]
+    largas = (fines - inicios) >= condicion
+
+    # +1 al inicio y -1 al final de cada racha larga; la suma acumulada
+    # vale 1 dentro de ellas
+    marca = np.zeros(len(mask) + 1, dtype=np.int8)
+    marca[inicios[largas]] = 1
+    marca[fines[largas]] = -1
+    return np.cumsum(marca[:-1], dtype=np.int8).astype(bool)
+
+
+def _persistenceNumpy(values, condicion, inferior, superior, invertido):
+    n, m = values.shape
+    plano = np.full((n, m + 1), np.nan)
+    plano[:, :m] = values
+    with np.errstate(invalid='ignore'):
+        bajo = _runsPersistentes((plano <= inferior[:, None]).ravel(), condicion, m + 1).reshape(n, m + 1)[:, :m]
+        alto = _runsPersistentes((plano >= superior[:, None]).ravel(), condicion, m + 1).reshape(n, m + 1)[:, :m]
+
+    invertido = invertido[:, None]
+    codigos = np.where(bajo, np.where(invertido, NINO, NINA), NEUTRO)
+    codigos = np.where(alto, np.where(invertido, NINA, NINO), codigos)
+    return codigos.astype(np.int8)
+
+
+def _intensityNumpy(values, bordes):
+    return np.digitize(np.abs(values), bordes).astype(np.int8)
+
+
+def _strengthNumpy(codes, repeticiones, grupos):
+    n = len(codes)
+    nuevo_grupo = np.zeros(n, dtype=bool)
+    nuevo_grupo[1:] = grupos[1:] != grupos[:-1]
+
+    # Segmentos de eventos: id creciente en cada inicio de tramo distinto de 0
+    activo = codes > 0
+    inicio_segmento = activo & (np.r_[True, ~activo[:-1]] | nuevo_grupo)
+    segmento = np.cumsum(inicio_segmento) - 1
+
+    # Rachas de un mismo código dentro de un segmento y su largo
+    inicio_racha = np.r_[True, codes[1:] != codes[:-1]] | nuevo_grupo
+    inicios = np.flatnonzero(inicio_racha)
+    largos = np.diff(np.r_[inicios, n])
+    validas = activo[inicios] & (largos >= repeticiones)
+
+    # Máximo por segmento de los códigos de las rachas válidas
+    maximo = np.full(inicio_segmento.sum(), -1, dtype=np.int64)
+    np.maximum.at(maximo, segmento[inicios[validas]], codes[inicios[validas]])
+
+    salida = codes.copy()
+    posiciones = np.flatnonzero(activo)
+    nivel = maximo[segmento[posiciones]]
+    salida[posiciones[nivel >= 0]] = nivel[nivel >= 0]
+    return salida
+
+
+# Implementación Numba (se compila al elegirla)
+
+def _compilarNumba():
+    from numba import njit
+
+    @njit(cache=True)
+    def lado(valor, inferior, superior):
+        if valor <= inferior:
+            return -1
+        if valor >= superior:
+            return 1
+        return 0
+
+    @njit(cache=True)
+    def persistence(values, condicion, inferior, superior, invertido):
+        n, m = values.shape
+        codigos = np.full((n, m), NEUTRO, dtype=np.int8)
+        for i in range(n):
+            j = 0
+            while j < m:
+                actual = lado(values[i, j], inferior[i], superior[i])
+                if actual == 0:
+                    j += 1
+                    continue
+                k = j
+                while k + 1 < m and lado(values[i, k + 1], inferior[i], superior[i]) == actual:
+                    k += 1
+                if k - j + 1 >= condicion[i]:
+                    if (actual < 0) != invertido[i]:
+                        codigos[i, j:k + 1] = NINA
+                    else:
+                        codigos[i, j:k + 1] = NINO
+                j = k + 1
+        return codigos
+
+    @njit(cache=True)
+    def intensity(values, bordes):
+        planos = values.ravel()
+        codigos = np.empty(planos.size, dtype=np.int8)
+        for i in range(planos.size):
+            x = abs(planos[i])
+            if np.isnan(x):
+                codigos[i] = len(bordes)
+                continue
+            c = 0
+            while c < len(bordes) and x >= bordes[c]:
+                c += 1
+            codigos[i] = c
+        return codigos.reshape(values.shape)
+
+    @njit(cache=True)
+    def strength(codes, repeticiones, grupos):
+        n = len(codes)
+        salida = codes.copy()
+        i = 0
+        while i < n:
+            if codes[i] <= 0:
+                i += 1
+                continue
+            # Segmento [i, j] de códigos > 0 del mismo grupo
+            j = i
+            while j + 1 < n and codes[j + 1] > 0 and grupos[j + 1] == grupos[i]:
+                j += 1
+            maximo = -1
+            k = i
+            while k <= j:
+                fin = k
+                while fin + 1 <= j and codes[fin + 1] == codes[k]:
+                    fin += 1
+                if fin - k + 1 >= repeticiones and codes[k] > maximo:
+                    maximo = codes[k]
+                k = fin + 1
+            if maximo >= 0:
+                salida[i:j + 1] = maximo
+            i = j + 1
+        return salida
+
+    return {'persistence': persistence, 'intensity': intensity, 'strength': strength}
+
+
+_BACKENDS = {
+    'numpy': {'persistence': _persistenceNumpy, 'intensity': _intensityNumpy, 'strength': _strengthNumpy},
+}
+_actual = 'numpy'
+
+
+def availableBackends():
+    """
+    Implementaciones que se pueden elegir en este entorno.
+    """
+    disponibles = ['numpy']
+    try:
+        import numba  # noqa: F401
+        disponibles.append('numba')
+    except ImportError:
+        pass
+    return disponibles
+
+
+def setBackend(nombre):
+    """
+    Elige la implementación de los núcleos: `numpy`, `numba` o `auto`
+    (Numba si está instalado y, si no, NumPy).
+
+    Raises:
+        ValueError: Si la implementación no existe o no está disponible.
+    """
+    global _actual
+    if nombre == 'auto':
+        nombre = 'numba' if 'numba' in availableBackends() else 'numpy'
+    if nombre not in ('numpy', 'numba'):
+        raise ValueError(f"Implementación desconocida: {nombre}")
+    if nombre == 'numba' and 'numba' not in _BACKENDS:
+        if 'numba' not in availableBackends():
+            raise ValueError("La implementación 'numba' requiere instalar numba")
+        _BACKENDS['numba'] = _compilarNumba()
+    _actual = nombre
+    return _actual
+
+
+def getBackend():
+    """
+    Nombre de la implementación en uso.
+    """
+    return _actual
+
+
+def persistence(values, condicion, inferior, superior, invertido):
+    """
+    Códigos de evento por persistencia de una matriz `(n, m)`.
+
+    Args:
+        values (np.ndarray): Matriz float `(n, m)` ordenada en el tiempo por fila.
+        condicion, inferior, superior, invertido (np.ndarray): Un valor por fila.
+
+    Returns:
+        np.ndarray: Matriz `int8` de códigos (0 Niña, 1 Niño, 2 Neutro).
+    """
+    return _BACKENDS[_actual]['persistence'](
+        np.ascontiguousarray(values, dtype=np.float64), np.asarray(condicion, dtype=np.int64),
+        np.asarray(inferior, dtype=np.float64), np.asarray(superior, dtype=np.float64),
+        np.asarray(invertido, dtype=np.bool_))
+
+
+def intensity(values, bordes):
+    """
+    Códigos de intensidad (`np.digitize` de `abs(values)`) de un arreglo de
+    cualquier forma; los NaN quedan en la última categoría.
+    """
+    return _BACKENDS[_actual]['intensity'](np.asarray(values, dtype=np.float64),
+                                           np.asarray(bordes, dtype=np.float64))
+
+
+def strength(codes, repeticiones, grupos):
+    """
+    Suavizado de intensidad por evento de un arreglo 1-D de códigos, con los
+    grupos (series) como enteros.
+    """
+    return _BACKENDS[_actual]['strength'](np.asarray(codes, dtype=np.int64), int(repeticiones),
+                                          np.asarray(grupos, dtype=np.int64))
+
+
+def checkParity(n_series=50, n_meses=900, semilla=0):
+    """
+    Compara las etiquetas de todas las implementaciones disponibles con la de
+    NumPy sobre datos sintéticos (caminatas aleatorias con NaN).
+
+    Returns:
+        dict: Por implementación, un diccionario núcleo -> True si las
+        etiquetas son idénticas.
+    """
+    rng = np.random.default_rng(semilla)
+    valores = np.round(np.cumsum(rng.normal(0, 0.3, (n_series, n_meses)), axis=1) * 0.5, 1)
+    valores[rng.random(valores.shape) < 0.02] = np.nan
+    condicion = rng.integers(1, 8, n_series)
+    inferior = -rng.uniform(0.3, 1.0, n_series)
+    superior = rng.uniform(0.3, 1.0, n_series)
+    invertido = rng.random(n_series) < 0.5
+    bordes = np.array([0.5, 1.0, 1.5, 2.0])
+    codigos = rng.choice([-1, 0, 1, 2, 3, 4], n_series * n_meses)
+    grupos = np.repeat(np.arange(n_series), n_meses)
+
+    anterior = _actual
+    resultados = {}
+    try:
+        referencia = None
+        for nombre in availableBackends():
+            setBackend(nombre)
+            salida = {
+                'persistence': persistence(valores, condicion, inferior, superior, invertido),
+                'intensity': intensity(valores, bordes),
+                'strength': strength(codigos, 3, grupos),
+            }
+            if referencia is None:
+                referencia = salida
+            resultados[nombre] = {k: bool(np.array_equal(salida[k], referencia[k])) for k in salida}
+    finally:
+        setBackend(anterior)
+
+    return resultados
+
+
+if __name__ == '__main__':
+    import sys
+    paridad = checkParity()
+    for nombre, resultado in paridad.items():
+        print(nombre, resultado)
+    # Código de salida 1 si alguna implementación no coincide con NumPy
+    sys.exit(0 if all(all(r.values()) for r in paridad.values()) else 1)
@@ -0,0 +1,138 @@
+"""
+manifest.py
+=================
+
+Este módulo mantiene el manifiesto de ingesta: un archivo `.json` con la firma
+(hash del contenido, tamaño y fecha de modificación) de cada archivo de
+entrada ya procesado. Con él, `dataprocesser` y `longtowide` sólo vuelven a
+procesar los archivos cuyo contenido cambió desde la última ejecución.
+
+Descripción:
+------------
+- `fileSignature`: Calcula la firma de un archivo.
+- `loadManifest` / `saveManifest`: Leen y escriben el manifiesto.
+- `changedFiles`: Devuelve los archivos cuya firma no coincide con la guardada.
+- `updateManifest`: Registra la firma actual de los archivos procesados.
+
+Notas:
+------
+- Si el tamaño y la fecha de modificación coinciden con los guardados, el
+  archivo se considera sin cambios y no se calcula el hash; así una ejecución
+  sin cambios cuesta sólo un `stat` por archivo.
+- Las claves del manifiesto son rutas relativas a la carpeta de datos
+  (`raw/oni.data`, `raw/RONI/RONI.ascii.txt`).
+
+Librerías requeridas:
+---------------------
+- Sólo la librería estándar.
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import json
+import hashlib
+
+from modules.atomicWrite import writeAtomic
+
+MANIFEST_NAME = "manifest.json"
+
+
+def manifestPath(folder_path):
+    """
+    Ruta del manifiesto de ingesta para una carpeta de datos (`./data`).
+    """
+    return os.path.join(folder_path, "processed", MANIFEST_NAME)
+
+
+def _clave(file_path, folder_path):
+    return os.path.relpath(file_path, folder_path).replace(os.sep, "/")
+
+
+def fileSignature(file_path, chunk_size=1 << 20):
+    """
+    Calcula la firma de un archivo.
+
+    Returns:
+        dict: `sha256` del contenido, `size` en bytes y `mtime_ns`.
+    """
+    info = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for bloque in iter(lambda: file.read(chunk_size), b""):
+            digest.update(bloque)
+
+    return {'sha256': digest.hexdigest(), 'size': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+
+def loadManifest(path):
+    """
+    Lee el manifiesto. Si no existe o está dañado devuelve un manifiesto vacío.
+    """
+    try:
+        with open(path, 'r', encoding='UTF-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def saveManifest(manifest, path):
+    """
+    Escribe el manifiesto de forma atómica.
+    """
+    writeAtomic(lambda tmp: json.dump(manifest, tmp, indent=2, sort_keys=True), path, encoding='UTF-8')
+
+
+def changedFiles(file_paths, manifest, folder_path):
+    """
+    Filtra los archivos que cambiaron respecto al manifiesto.
+
+    Args:
+        file_paths (list): Rutas de los archivos de entrada.
+        manifest (dict): Manifiesto cargado con `loadManifest`.
+        folder_path (str): Carpeta de datos a la que son relativas las claves.
+
+    Returns:
+        list: Rutas de los archivos nuevos o con contenido distinto. Los
+        archivos con fecha distinta pero el mismo hash se actualizan en
+        `manifest` y no se consideran cambiados.
+    """
+    cambiados = []
+    for file_path in file_paths:
+        guardada = manifest.get(_clave(file_path, folder_path))
+        if guardada is None:
+            cambiados.append(file_path)
+            continue
+
+        info = os.stat(file_path)
+        if info.st_size == guardada['size'] and info.st_mtime_ns == guardada['mtime_ns']:
+            continue
+
+        # Tamaño o fecha distintos: sólo el hash decide (p. ej. un `curl` que
+        # vuelve a descargar el mismo contenido cambia la fecha, no los datos)
+        firma = fileSignature(file_path)
+        if firma['sha256'] != guardada['sha256']:
+            cambiados.append(file_path)
+        else:
+            manifest[_clave(file_path, folder_path)] = firma
+
+    return cambiados
+
+
+def updateManifest(manifest, file_paths, folder_path):
+    """
+    Registra en el manifiesto la firma actual de los archivos procesados.
+    """
+    for file_path in file_paths:
+        manifest[_clave(file_path, folder_path)] = fileSignature(file_path)
+    return manifest
@@ -0,0 +1,104 @@
+"""
+monthAxis.py
+=================
+
+Este módulo define el eje temporal mensual compartido por todo el ETL. Cada
+fecha se representa como un ordinal `int32` de meses desde enero de 1970
+(`1970-01` -> 0, `1950-01` -> -240), que es exactamente la representación
+interna de `datetime64[M]` en NumPy.
+
+Descripción:
+------------
+- `toOrdinal`: Año y mes -> ordinal.
+- `fromOrdinal`: Ordinal -> año y mes.
+- `fromDatetime`: Fechas (`datetime64`, `pd.Series`, `DatetimeIndex`) -> ordinal.
+- `toDatetime`: Ordinal -> `datetime64[ns]` (día 1 del mes), sólo para exportar.
+- `calendar`: Ordinales consecutivos entre dos meses.
+- `align`: Ubica valores sobre un calendario por su ordinal.
+
+Notas:
+------
+- Ordenar, alinear y unir series por el ordinal evita convertir fechas a
+  texto y de vuelta, y los desfases de mes que eso produce.
+
+Librerías requeridas:
+---------------------
+- `numpy >= 1.24.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import numpy as np
+
+EPOCA = 1970
+
+
+def toOrdinal(year, month):
+    """
+    Convierte año y mes (1-12) en el ordinal de meses desde 1970-01.
+    """
+    year = np.asarray(year, dtype=np.int32)
+    month = np.asarray(month, dtype=np.int32)
+    return ((year - EPOCA) * 12 + (month - 1)).astype(np.int32)
+
+
+def fromOrdinal(ordinal):
+    """
+    Convierte el ordinal en una tupla (año, mes) de arreglos.
+    """
+    anio, mes = np.divmod(np.asarray(ordinal, dtype=np.int32), 12)
+    return (anio + EPOCA).astype(np.int32), (mes + 1).astype(np.int32)
+
+
+def fromDatetime(dates):
+    """
+    Convierte fechas en ordinales (se descarta el día).
+    """
+    return np.asarray(dates, dtype='datetime64[ns]').astype('datetime64[M]').astype(np.int32)
+
+
+def toDatetime(ordinal):
+    """
+    Convierte ordinales en fechas `datetime64[ns]` al día 1 de cada mes.
+    """
+    return np.asarray(ordinal, dtype=np.int64).astype('datetime64[M]').astype('datetime64[ns]')
+
+
+def calendar(inicio, fin):
+    """
+    Devuelve los ordinales consecutivos desde `inicio` hasta `fin`, ambos incluidos.
+    """
+    return np.arange(inicio, fin + 1, dtype=np.int32)
+
+
+def align(ordinal, values, calendario, fill_value=np.nan):
+    """
+    Ubica `values` sobre `calendario` según su ordinal.
+
+    Args:
+        ordinal (np.ndarray): Ordinal de cada valor.
+        values (np.ndarray): Valores a ubicar.
+        calendario (np.ndarray): Ordinales consecutivos (ver `calendar`).
+        fill_value: Valor para los meses sin dato.
+
+    Returns:
+        np.ndarray: Arreglo del largo de `calendario`. Los valores fuera del
+        calendario se descartan.
+    """
+    ordinal = np.asarray(ordinal)
+    values = np.asarray(values)
+    salida = np.full(len(calendario), fill_value, dtype=np.result_type(values, np.asarray(fill_value)))
+    posicion = ordinal - calendario[0]
+    dentro = (posicion >= 0) & (posicion < len(calendario))
+    salida[posicion[dentro]] = values[dentro]
+    return salida
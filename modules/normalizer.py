@@ -0,0 +1,290 @@
+"""
+normalizer.py
+=================
+
+Este módulo normaliza la tabla final (`Indices_Total`) en las seis tablas
+del modelo entidad-relación de `base_datos` (ver `bd_Indices.drawio`):
+
+    units(id, unit)
+    events(id, event, event_description)
+    dates(id, date)
+    phases(id, phase, phase_description, id_event)
+    indexes(id, index_name, index_description, id_unit)
+    indexes_values(id, value, id_phase, id_index, id_date)
+
+Descripción:
+------------
+- `normalize`: Construye las seis tablas de todos los índices en una sola
+  pasada sobre la tabla long.
+- `normalizeIncremental`: Igual que `normalize`, pero conserva los ids de
+  las ejecuciones anteriores y entrega sólo las filas nuevas o modificadas.
+- `loadKeys` / `saveKeys`: Leen y guardan los diccionarios de llaves.
+- `checkedMerge`: `pd.merge` que falla si la unión multiplica filas.
+- `exportTables`: Escribe las tablas como `.csv` en `base_datos`.
+- `exportChanges`: Agrega las filas nuevas o modificadas a los `.csv` de
+  cambios pendientes de cargar (`base_datos/cambios`).
+
+Notas:
+------
+- Las llaves se asignan con `pd.factorize` sobre las columnas de cada
+  dimensión, en el orden de aparición (igual que `drop_duplicates` +
+  `range(1, n + 1)`), y la tabla de hechos toma los códigos directamente,
+  sin uniones por texto. El costo es lineal en el número de filas.
+- Una fase se identifica por (`phase`, `phase_description`, evento); unir
+  los valores con las fases sólo por `phase` repetía cada fila una vez por
+  evento con esa fase.
+- La tabla de hechos tiene exactamente una fila por fila de entrada. Se
+  verifica además que no haya fechas repetidas en un índice y que cada
+  índice tenga una sola descripción y unidad; si no, se lanza `ValueError`.
+  Las uniones que queden por hacer con estas tablas (p. ej. al cargarlas en
+  la base de datos) pueden usar `checkedMerge`, que falla si multiplican filas.
+- Los diccionarios de llaves (`base_datos/claves`) son las tablas completas
+  con sus ids, guardadas con `store.saveTable`. Cada fila se reconoce por su
+  llave natural (`LLAVES`); si ya existía conserva su id y, si no, recibe el
+  siguiente al mayor usado, así que los ids nunca se reutilizan. Un índice
+  o un valor con otra descripción, unidad, valor o fase es una fila
+  modificada con el mismo id.
+- Las filas que dejan de aparecer se mantienen en los diccionarios (y en la
+  base de datos); sólo se agregan o actualizan filas.
+- Los cambios se acumulan en `base_datos/cambios` hasta que
+  `scripts/migracion.py` los carga y borra, así que una carga fallida no
+  pierde los cambios de esa ejecución.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `numpy >= 1.24.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from modules import store
+
+TABLAS = ['units', 'events', 'dates', 'phases', 'indexes', 'indexes_values']
+# Llave natural de cada tabla; el resto de columnas (sin `id`) son atributos
+LLAVES = {
+    'units': ['unit'],
+    'events': ['event', 'event_description'],
+    'dates': ['date'],
+    'phases': ['phase', 'phase_description', 'id_event'],
+    'indexes': ['index_name'],
+    'indexes_values': ['id_index', 'id_date'],
+}
+# Llaves foráneas: columna -> tabla a la que apunta
+FORANEAS = {
+    'phases': {'id_event': 'events'},
+    'indexes': {'id_unit': 'units'},
+    'indexes_values': {'id_phase': 'phases', 'id_index': 'indexes', 'id_date': 'dates'},
+}
+
+
+def _codigos(columnas):
+    """
+    Código (desde 0, en orden de aparición) de cada combinación de los
+    arreglos de `columnas` y posición de la primera fila de cada código.
+    """
+    codigos = np.zeros(len(columnas[0]), dtype=np.int64)
+    for valores in columnas:
+        codigo, unicos = pd.factorize(valores, use_na_sentinel=False)
+        codigos, _ = pd.factorize(codigos * len(unicos) + codigo)
+    primeras = np.flatnonzero(~pd.Series(codigos).duplicated().to_numpy())
+    return codigos, primeras
+
+
+def _dimension(tabla, columnas, extra=None):
+    """
+    Tabla de una dimensión (`id` + `columnas` + `extra`) y el id de cada fila de `tabla`.
+    """
+    claves = [tabla[c] for c in columnas] + ([extra[1]] if extra is not None else [])
+    codigos, primeras = _codigos(claves)
+    dimension = pd.DataFrame({'id': np.arange(1, len(primeras) + 1)})
+    for columna in columnas:
+        dimension[columna] = tabla[columna].to_numpy()[primeras]
+    if extra is not None:
+        dimension[extra[0]] = extra[1][primeras]
+    return dimension, codigos + 1
+
+
+def checkedMerge(left, right, on, how='left', **kwargs):
+    """
+    `pd.merge` de una tabla de hechos con una dimensión que falla si la
+    unión multiplica filas (claves repetidas en `right`).
+
+    Raises:
+        ValueError: Con las claves repetidas de `right`.
+    """
+    claves = [on] if isinstance(on, str) else list(on)
+    repetidas = right[right.duplicated(claves, keep=False)]
+    if len(repetidas):
+        muestra = repetidas[claves].drop_duplicates().head(5).to_dict('records')
+        raise ValueError(f"La unión por {claves} multiplica filas; claves repetidas en la dimensión: {muestra}")
+    return pd.merge(left, right, on=on, how=how, validate='many_to_one', **kwargs)
+
+
+def normalize(tabla):
+    """
+    Normaliza la tabla final en las tablas del modelo entidad-relación.
+
+    Args:
+        tabla (pd.DataFrame): Tabla long con las columnas de `indexes.COLUMNAS`.
+
+    Returns:
+        dict: Nombre de la tabla (`TABLAS`) -> pd.DataFrame.
+
+    Raises:
+        ValueError: Si un índice tiene fechas repetidas o más de una
+            descripción o unidad.
+    """
+    tabla = tabla.reset_index(drop=True)
+    repetidas = tabla.duplicated(['index_name', 'date'])
+    if repetidas.any():
+        muestra = tabla.loc[repetidas, ['index_name', 'date']].head(5).to_dict('records')
+        raise ValueError(f"Fechas repetidas en un mismo índice: {muestra}")
+
+    units, id_unit = _dimension(tabla, ['unit'])
+    events, id_event = _dimension(tabla, ['event', 'event_description'])
+    dates, id_date = _dimension(tabla, ['date'])
+    phases, id_phase = _dimension(tabla, ['phase', 'phase_description'], extra=('id_event', id_event))
+    indexes, id_index = _dimension(tabla, ['index_name', 'index_description'], extra=('id_unit', id_unit))
+
+    nombres = indexes['index_name']
+    if nombres.duplicated().any():
+        raise ValueError(f"Índices con más de una descripción o unidad: {sorted(set(nombres[nombres.duplicated()]))}")
+
+    indexes_values = pd.DataFrame({
+        'id': np.arange(1, len(tabla) + 1),
+        'value': tabla['value'].to_numpy(),
+        'id_phase': id_phase,
+        'id_index': id_index,
+        'id_date': id_date,
+    })
+    return {'units': units, 'events': events, 'dates': dates, 'phases': phases,
+            'indexes': indexes, 'indexes_values': indexes_values}
+
+
+def loadKeys(folder='./base_datos/claves'):
+    """
+    Lee los diccionarios de llaves guardados con `saveKeys`.
+
+    Returns:
+        dict: Nombre de la tabla -> pd.DataFrame (sólo las que existen).
+    """
+    claves = {}
+    for nombre in TABLAS:
+        carpeta = os.path.join(folder, nombre)
+        if store.loadMetadata(carpeta):
+            tabla = store.loadTable(carpeta, mmap=False)
+            claves[nombre] = tabla.astype({c: object for c in tabla.columns
+                                           if isinstance(tabla[c].dtype, pd.CategoricalDtype)})
+    return claves
+
+
+def saveKeys(tablas, folder='./base_datos/claves'):
+    """
+    Guarda las tablas completas de `normalizeIncremental` como diccionarios
+    de llaves (una carpeta de `store` por tabla).
+    """
+    for nombre, tabla in tablas.items():
+        store.saveTable(tabla, os.path.join(folder, nombre))
+    return folder
+
+
+def _estabilizar(nueva, anterior, llaves):
+    # Ids estables de `nueva` (ids 1..n de `normalize`) según `anterior`.
+    # Devuelve la tabla completa, las filas nuevas o modificadas y el id
+    # estable de cada id de `nueva` (posición id - 1)
+    if anterior is None or anterior.empty:
+        return nueva, nueva, nueva['id'].to_numpy()
+
+    atributos = [c for c in nueva.columns if c not in llaves and c != 'id']
+    unida = checkedMerge(nueva, anterior, on=llaves, suffixes=('', '_anterior'))
+    existe = unida['id_anterior'].notna().to_numpy()
+    ids = unida['id_anterior'].fillna(0).to_numpy(dtype=np.int64)
+    siguiente = int(anterior['id'].max()) + 1
+    ids[~existe] = np.arange(siguiente, siguiente + (~existe).sum())
+
+    cambia = ~existe
+    for columna in atributos:
+        a = unida[f"{columna}_anterior"].to_numpy(dtype=object)
+        n = unida[columna].to_numpy(dtype=object)
+        cambia |= ~((a == n) | (pd.isna(a) & pd.isna(n)))
+
+    estable = nueva.assign(id=ids)
+    completa = pd.concat([anterior.loc[~anterior['id'].isin(ids)], estable], ignore_index=True)
+    completa = completa.sort_values('id', kind='stable', ignore_index=True)
+    return completa, estable.loc[cambia].reset_index(drop=True), ids
+
+
+def normalizeIncremental(tabla, claves=None):
+    """
+    Normaliza la tabla final con ids estables entre ejecuciones.
+
+    Args:
+        tabla (pd.DataFrame): Tabla long con las columnas de `indexes.COLUMNAS`.
+        claves (dict): Diccionarios de llaves de la ejecución anterior
+            (`loadKeys`). Si es None o está vacío, los ids empiezan en 1,
+            como en `normalize`.
+
+    Returns:
+        tuple: (`completas`, `cambios`): nombre de la tabla -> tabla completa
+        con ids estables (para `saveKeys` y `exportTables`) y nombre de la
+        tabla -> filas nuevas o modificadas (para cargar en la base de datos).
+
+    Raises:
+        ValueError: Como `normalize`.
+    """
+    claves = claves or {}
+    tablas = normalize(tabla)
+    completas, cambios, mapas = {}, {}, {}
+
+    for nombre in TABLAS:
+        nueva = tablas[nombre]
+        # Las llaves foráneas pasan primero a los ids estables de su tabla
+        for columna, destino in FORANEAS.get(nombre, {}).items():
+            nueva[columna] = mapas[destino][nueva[columna].to_numpy() - 1]
+        completas[nombre], cambios[nombre], mapas[nombre] = _estabilizar(nueva, claves.get(nombre), LLAVES[nombre])
+    return completas, cambios
+
+
+def exportTables(tablas, folder='./base_datos'):
+    """
+    Escribe cada tabla como `<folder>/<nombre>.csv`.
+    """
+    os.makedirs(folder, exist_ok=True)
+    for nombre, df in tablas.items():
+        df.to_csv(os.path.join(folder, f"{nombre}.csv"), index=False, encoding='UTF-8')
+    return folder
+
+
+def exportChanges(cambios, folder='./base_datos/cambios'):
+    """
+    Agrega las filas de `cambios` a `<folder>/<nombre>.csv`. Si ya había
+    cambios pendientes de una ejecución anterior, una fila con el mismo `id`
+    se reemplaza por la nueva.
+    """
+    os.makedirs(folder, exist_ok=True)
+    for nombre, df in cambios.items():
+        path = os.path.join(folder, f"{nombre}.csv")
+        if os.path.exists(path):
+            fechas = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+            pendientes = pd.read_csv(path, parse_dates=fechas)
+            df = pd.concat([p for p in (pendientes, df) if len(p)] or [df], ignore_index=True)
+            df = df.drop_duplicates('id', keep='last')
+        elif df.empty:
+            continue
+        df.to_csv(path, index=False, encoding='UTF-8')
+    return folder
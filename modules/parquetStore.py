@@ -0,0 +1,164 @@
+"""
+parquetStore.py
+=================
+
+Este módulo guarda la tabla final (`Indices_Total`) como un conjunto de
+archivos Parquet particionado por índice (y opcionalmente por década), y la
+consulta leyendo sólo las particiones, grupos de filas y columnas que
+cumplen los filtros.
+
+Descripción:
+------------
+- `available`: Indica si pyarrow está instalado.
+- `writeDataset`: Escribe la tabla particionada por `index_name` (y `decade`).
+- `query`: Lee la tabla filtrando por índice, rango de fechas y columnas.
+
+Estructura de la carpeta:
+-------------------------
+    Indices_Total_parquet/
+    ├─ _metadata.json                     (columnas y particiones)
+    ├─ index_name=ONI/
+    │  ├─ decade=1950/part-0.parquet      (con `por_decada=True`)
+    │  └─ ...
+    └─ index_name=Ni%C3%B1o%203.4/...
+
+Notas:
+------
+- Dentro de cada partición las filas van ordenadas por fecha y en grupos de
+  `filas_por_grupo` filas, así que las estadísticas mín./máx. de `date` de
+  cada grupo permiten saltar los que quedan fuera del rango consultado.
+- El filtro por índice (y por década) descarta carpetas completas sin
+  abrirlas; el costo de una consulta depende de lo que devuelve y no del
+  tamaño de la historia completa.
+- La carpeta se escribe en un temporal y se reemplaza al final.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `pyarrow` (opcional; sin él no se escribe el Parquet)
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import json
+import shutil
+import pandas as pd
+
+METADATA_NAME = "_metadata.json"
+
+
+def available():
+    """
+    Indica si pyarrow está instalado.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def writeDataset(tabla, folder, por_decada=False, filas_por_grupo=240):
+    """
+    Escribe la tabla final como Parquet particionado.
+
+    Args:
+        tabla (pd.DataFrame): Tabla final con `index_name` y `date`.
+        folder (str): Carpeta de salida (se reemplaza completa).
+        por_decada (bool): Particiona también por década (`decade=1950`, ...).
+        filas_por_grupo (int): Filas por grupo de filas de cada archivo.
+
+    Returns:
+        str: Carpeta escrita.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    columnas = [str(c) for c in tabla.columns]
+    particiones = ['index_name'] + (['decade'] if por_decada else [])
+
+    datos = tabla.reset_index(drop=True)
+    datos['date'] = pd.to_datetime(datos['date'])
+    if por_decada:
+        datos['decade'] = (datos['date'].dt.year // 10 * 10).astype('int32')
+    datos = datos.sort_values(particiones + ['date'], kind='stable')
+
+    # Se escribe en un temporal junto a la carpeta y se reemplaza al final
+    tmp_folder = f"{folder}.tmp"
+    shutil.rmtree(tmp_folder, ignore_errors=True)
+    ds.write_dataset(pa.Table.from_pandas(datos, preserve_index=False), tmp_folder, format='parquet',
+                     partitioning=particiones, partitioning_flavor='hive',
+                     max_rows_per_group=filas_por_grupo, min_rows_per_group=0,
+                     basename_template="part-{i}.parquet")
+    with open(os.path.join(tmp_folder, METADATA_NAME), 'w', encoding='UTF-8') as file:
+        json.dump({'filas': len(datos), 'columnas': columnas, 'particiones': particiones}, file,
+                  indent=2, ensure_ascii=False)
+
+    if os.path.exists(folder):
+        anterior = f"{folder}.old"
+        shutil.rmtree(anterior, ignore_errors=True)
+        os.replace(folder, anterior)
+        os.replace(tmp_folder, folder)
+        shutil.rmtree(anterior)
+    else:
+        os.replace(tmp_folder, folder)
+    return folder
+
+
+def query(folder, indices=None, desde=None, hasta=None, columnas=None):
+    """
+    Lee la tabla guardada con `writeDataset` aplicando los filtros en los archivos.
+
+    Args:
+        folder (str): Carpeta del Parquet.
+        indices (list): Valores de `index_name` a leer. Por defecto, todos.
+        desde, hasta (str | pd.Timestamp): Rango de fechas, ambos incluidos.
+        columnas (list): Columnas a devolver. Por defecto, las de la tabla.
+
+    Returns:
+        pd.DataFrame: Filas que cumplen los filtros, ordenadas por índice y fecha.
+    """
+    import pyarrow.dataset as ds
+
+    with open(os.path.join(folder, METADATA_NAME), 'r', encoding='UTF-8') as file:
+        metadata = json.load(file)
+    dataset = ds.dataset(folder, format='parquet', partitioning='hive')
+
+    filtros = []
+    if indices is not None:
+        filtros.append(ds.field('index_name').isin(list(indices)))
+    # Con particiones por década, además se descartan las carpetas fuera del rango
+    por_decada = 'decade' in metadata['particiones']
+    if desde is not None:
+        desde = pd.Timestamp(desde)
+        filtros.append(ds.field('date') >= desde)
+        if por_decada:
+            filtros.append(ds.field('decade') >= desde.year // 10 * 10)
+    if hasta is not None:
+        hasta = pd.Timestamp(hasta)
+        filtros.append(ds.field('date') <= hasta)
+        if por_decada:
+            filtros.append(ds.field('decade') <= hasta.year // 10 * 10)
+    filtro = None
+    for expresion in filtros:
+        filtro = expresion if filtro is None else filtro & expresion
+
+    columnas = list(columnas or metadata['columnas'])
+    tabla = dataset.to_table(columns=columnas, filter=filtro).to_pandas()
+    if 'index_name' in tabla.columns:
+        tabla['index_name'] = tabla['index_name'].astype(object)
+    orden = [c for c in ('index_name', 'date') if c in tabla.columns]
+    if orden:
+        tabla = tabla.sort_values(orden, kind='stable')
+    return tabla.reset_index(drop=True)
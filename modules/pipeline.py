@@ -0,0 +1,364 @@
+"""
+pipeline.py
+=================
+
+Este módulo orquesta el ETL de los índices climáticos: ingesta de los
+archivos de la NOAA, transformación de cada índice con el motor de
+`indexes` y concatenación en la tabla final.
+
+Descripción:
+------------
+- `ingest`: Lee los archivos de `raw` y devuelve las tablas en memoria.
+- `buildTable`: Clasifica todos los índices en un solo lote (o uno a uno con
+  `indexes.processIndex`) y devuelve la tabla final.
+- `updateDetector`: Pasa los meses nuevos por el detector incremental de
+  eventos y devuelve sólo las filas nuevas o reetiquetadas.
+- `run`: Ejecuta `ingest` y `buildTable`.
+- `inputFiles`: Archivos de entrada de cada índice.
+- `buildGraph`: Declara el ETL completo como grafo de tareas (`taskgraph`):
+  ingesta de cada índice en ramas independientes, clasificación de todos
+  los índices en un solo lote y exportaciones.
+
+Notas:
+------
+- Si pyarrow está instalado, la tabla final también se escribe como Parquet
+  particionado por índice (ver `parquetStore.query` para consultarla).
+- El `.xlsx` se escribe en modo `write_only` con una sola hoja `indices`
+  (con `xlsx_por_indice`, una hoja por índice y las descripciones aparte, ver
+  `excelExport`); con varios hilos se escribe a la vez que el `.csv`.
+- Las tablas pasan de la ingesta a `indexes.classifyBatch` en memoria; los `.csv`
+  de `data/processed` son sólo una salida opcional.
+- Con `suavizar`, la tabla final lleva además la columna `type_event`: la
+  intensidad (`type`) de cada evento llevada a la más alta que se mantuvo
+  al menos 3 meses (`eventClassifier.strengthSmoothing`). `type` no cambia.
+- En modo incremental los índices sin cambios se leen desde la copia
+  binaria de `data/processed/store` (ver `store`) o, si no está, desde los
+  `.csv` de `data/processed`.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+from functools import partial
+import pandas as pd
+
+from modules import convertirCSV
+from modules import LongtoWide
+from modules import indexes
+from modules import eventClassifier
+from modules import store
+from modules import detector
+from modules import manifest
+from modules import taskgraph
+from modules import excelExport
+from modules import parquetStore
+from modules import deltaExport
+from modules.atomicWrite import writeAtomic
+
+# Nombre del archivo procesado -> índice de `indexes.REGISTRO`.
+# El orden es el de la tabla final.
+INDICES = {
+    'oni': 'ONI',
+    'nina1': 'Niño 1+2',
+    'nina3': 'Niño 3',
+    'nina34': 'Niño 3.4',
+    'nina4': 'Niño 4',
+    'soi': 'SOI',
+    'meiv2': 'MEI',
+    'roni': 'RONI',
+}
+
+# Productos estacionales de la CPC (SEAS/YR/ANOM) que se leen directamente
+# en formato long: nombre del índice -> ruta relativa a la carpeta de datos
+CPC_ESTACIONALES = {
+    'roni': os.path.join('raw', 'RONI', 'RONI.ascii.txt'),
+}
+STORE_PATH = os.path.join('processed', 'store')
+
+# Índices que sólo se procesan si se indica la carpeta de sus archivos
+# (`ingest(imt_folder=...)`); van al final de la tabla
+INDICES_OPCIONALES = {
+    'imt': 'IMT',
+}
+
+# Columna opcional con la intensidad suavizada por evento (`buildTable(suavizar=True)`)
+COLUMNA_SUAVIZADA = 'type_event'
+
+
+def ingest(folder_path='./data', workers=1, incremental=False, escribir_csv=True, escribir_store=True,
+           imt_folder=None):
+    """
+    Lee todos los archivos de entrada y devuelve sus tablas wide.
+
+    Args:
+        folder_path (str): Carpeta que contiene `raw` y `processed`.
+        workers (int): Número de procesos para `dataprocesser`.
+        incremental (bool): Sólo procesa los archivos que cambiaron.
+        escribir_csv (bool): Escribe los `.csv` de `processed`.
+        escribir_store (bool): Escribe la copia binaria en `processed/store`.
+        imt_folder (str): Carpeta con los archivos `Valores_mensuales_*.xlsx`
+            del IMT. Si es None el IMT no se procesa.
+
+    Returns:
+        tuple: (`datos`, `modificados`): tablas de todos los índices (wide para
+        los archivos de la PSL, long para los productos estacionales de la CPC) con
+        el nombre del archivo como clave y la lista de índices que se
+        volvieron a procesar en esta ejecución.
+    """
+    datos = convertirCSV.dataprocesser(folder_path, workers=workers, incremental=incremental,
+                                       escribir_csv=escribir_csv)
+    for nombre, ruta in CPC_ESTACIONALES.items():
+        datos.update(LongtoWide.cpcIngest(os.path.join(folder_path, ruta),
+                                          output_file=os.path.join(folder_path, 'processed', f'{nombre}.csv'),
+                                          incremental=incremental, escribir_csv=escribir_csv))
+    if imt_folder is not None:
+        datos.update(convertirCSV.imtIngest(imt_folder, output_file=os.path.join(folder_path, 'processed', 'imt.csv'),
+                                            incremental=incremental, escribir_csv=escribir_csv))
+    modificados = list(datos)
+
+    # Los índices sin cambios se toman de la última ingesta: primero de la
+    # copia binaria y, si no está, del .csv
+    store_path = os.path.join(folder_path, STORE_PATH)
+    esperados = list(INDICES) + (list(INDICES_OPCIONALES) if imt_folder is not None else [])
+    pendientes = [nombre for nombre in esperados if nombre not in datos]
+    en_store = store.loadMetadata(store_path).get('series', {})
+    datos.update(store.loadSeries(store_path, [n for n in pendientes if n in en_store]))
+    faltantes = {nombre: pd.read_csv(os.path.join(folder_path, 'processed', f'{nombre}.csv'))
+                 for nombre in pendientes if nombre not in en_store}
+    datos.update(faltantes)
+
+    if escribir_store:
+        # Las series long de la CPC se guardan en wide, como las demás
+        store.saveSeries({nombre: LongtoWide.seasonalToWide(datos[nombre]) if 'value' in datos[nombre].columns
+                          else datos[nombre] for nombre in modificados + list(faltantes)}, store_path)
+
+    return datos, modificados
+
+
+def buildTable(datos, batch=True, suavizar=False):
+    """
+    Transforma cada índice con el motor de `indexes` y concatena la tabla final.
+
+    Args:
+        datos (dict): Tablas wide con el nombre del archivo como clave. Los
+            índices de `INDICES_OPCIONALES` se incluyen sólo si están en `datos`.
+        batch (bool): Clasifica todos los índices en una sola matriz
+            (`indexes.alignIndices` / `classifyBatch` / `batchToLong`). Si es
+            False, procesa un índice a la vez con `indexes.processIndex`.
+        suavizar (bool): Agrega la columna `type_event` con la intensidad
+            suavizada por evento (`eventClassifier.strengthSmoothing`).
+
+    Returns:
+        pd.DataFrame: Tabla final en formato long de todos los índices.
+    """
+    nombres = {nombre: indice for nombre, indice in {**INDICES, **INDICES_OPCIONALES}.items() if nombre in datos}
+
+    if batch:
+        tabla = indexes.batchToLong(indexes.classifyBatch(indexes.alignIndices(datos, nombres)))
+    else:
+        tablas = []
+        for nombre, indice in nombres.items():
+            df_long = indexes.processIndex(datos[nombre], indice)
+            df_long.dropna(subset=['value'], inplace=True)
+            tablas.append(df_long)
+        tabla = pd.concat(tablas, axis=0)
+
+    if suavizar:
+        tabla = eventClassifier.strengthSmoothing(tabla, nueva_col=COLUMNA_SUAVIZADA)
+    return tabla
+
+
+def updateDetector(datos, folder_path='./data'):
+    """
+    Actualiza el detector incremental de eventos con los meses nuevos de
+    cada índice y guarda su estado en `processed/detector.json`.
+
+    Args:
+        datos (dict): Tablas wide o long con el nombre del archivo como clave.
+        folder_path (str): Carpeta que contiene `processed`.
+
+    Returns:
+        pd.DataFrame: Filas de la tabla final nuevas o cuyo evento cambió.
+    """
+    nombres = {nombre: indice for nombre, indice in {**INDICES, **INDICES_OPCIONALES}.items() if nombre in datos}
+    ruta = detector.statePath(folder_path)
+    estados = detector.loadState(ruta)
+    delta = detector.update(estados, datos, nombres)
+    detector.saveState(estados, ruta)
+    return delta
+
+
+def run(folder_path='./data', workers=1, incremental=False, escribir_csv=True, escribir_store=True,
+        imt_folder=None):
+    """
+    Ejecuta la ingesta y la construcción de la tabla final.
+
+    Returns:
+        pd.DataFrame: Tabla final en formato long de todos los índices.
+    """
+    datos, _ = ingest(folder_path, workers=workers, incremental=incremental,
+                      escribir_csv=escribir_csv, escribir_store=escribir_store, imt_folder=imt_folder)
+    return buildTable(datos)
+
+
+# Tareas del grafo (funciones de módulo para que su firma de código sea estable)
+
+def _ingestarPSL(file_path, file_outpath):
+    return convertirCSV.processFile(file_path, file_outpath)[0]
+
+
+def _ingestarCPC(path, output_file):
+    return next(iter(LongtoWide.cpcIngest(path, output_file).values()))
+
+
+def _ingestarIMT(imt_folder, output_file):
+    return next(iter(convertirCSV.imtIngest(imt_folder, output_file).values()))
+
+
+def _registrarIngesta(folder_path, nombres, rutas, *tablas):
+    # Copia binaria de las series y registro de los archivos leídos en el
+    # manifiesto de ingesta (una sola tarea escribe ambos)
+    store.saveSeries({nombre: LongtoWide.seasonalToWide(df) if 'value' in df.columns else df
+                      for nombre, df in zip(nombres, tablas)}, os.path.join(folder_path, STORE_PATH))
+    ruta_manifest = manifest.manifestPath(folder_path)
+    manifest.saveManifest(manifest.updateManifest(manifest.loadManifest(ruta_manifest), rutas, folder_path),
+                          ruta_manifest)
+    return os.path.join(folder_path, STORE_PATH)
+
+
+def _detector(folder_path, nombres, *tablas):
+    datos = dict(zip(nombres, tablas))
+    return updateDetector(datos, folder_path)
+
+
+def _clasificar(nombres, suavizar, *tablas):
+    # Todos los índices en una sola matriz (`buildTable(batch=True)`)
+    return buildTable(dict(zip(nombres, tablas)), batch=True, suavizar=suavizar)
+
+
+def _exportarCSV(path, tabla):
+    writeAtomic(lambda tmp: tabla.to_csv(tmp, index=False), path, encoding='UTF-8', newline='')
+    return path
+
+
+def _exportarDelta(salida, tabla):
+    deltaExport.exportDelta(tabla, salida)
+    return f"{salida}.csv"
+
+
+def _exportarXLSX(path, por_indice, tabla):
+    return excelExport.writeXLSX(tabla, path, por_indice=por_indice, descripciones_aparte=por_indice)
+
+
+def _exportarStore(folder, tabla):
+    store.saveTable(tabla, folder)
+    return folder
+
+
+def _exportarParquet(folder, tabla):
+    return parquetStore.writeDataset(tabla, folder)
+
+
+def inputFiles(folder_path='./data', imt_folder=None):
+    """
+    Archivos de entrada del ETL: nombre del índice -> ruta.
+    """
+    folder_raw = os.path.join(folder_path, 'raw')
+    entradas = {}
+    for file_name in sorted(os.listdir(folder_raw)):
+        nombre, file_path = os.path.splitext(file_name)[0], os.path.join(folder_raw, file_name)
+        if nombre in INDICES and os.path.isfile(file_path):
+            entradas[nombre] = file_path
+    for nombre, ruta in CPC_ESTACIONALES.items():
+        entradas[nombre] = os.path.join(folder_path, ruta)
+    if imt_folder is not None and convertirCSV.latestIMT(imt_folder) is not None:
+        entradas['imt'] = convertirCSV.latestIMT(imt_folder)
+    return entradas
+
+
+def buildGraph(folder_path='./data', imt_folder=None, salida='Indices_Total', delta=False,
+               xlsx_por_indice=False, suavizar=False):
+    """
+    Declara el ETL como grafo de tareas para `taskgraph.run`.
+
+        ingesta:<índice> -> clasificar -> exportar:csv / xlsx / store / parquet
+                         -> series (copia binaria de processed y manifiesto) y detector
+
+    Las ingestas son independientes y se ejecutan en paralelo; `clasificar`
+    recibe todas las series y las clasifica en una sola pasada matricial
+    (`indexes.classifyBatch`). La firma de cada tarea de ingesta es el hash
+    de su archivo de entrada.
+
+    Args:
+        folder_path (str): Carpeta que contiene `raw` y `processed`.
+        imt_folder (str): Carpeta con los archivos mensuales del IMT (opcional).
+        salida (str): Nombre base de la tabla final (`.csv`, `.xlsx`, `_store`
+            y `_parquet`; este último sólo si pyarrow está instalado).
+        delta (bool): `exportar:csv` además escribe las filas que cambiaron
+            en `<salida>_deltas` (ver `deltaExport`).
+        xlsx_por_indice (bool): El `.xlsx` lleva una hoja por índice y las
+            descripciones en una hoja aparte en lugar de la hoja `indices`.
+        suavizar (bool): La tabla final lleva la columna `type_event` (ver
+            `buildTable`).
+
+    Returns:
+        list: Tareas del grafo.
+    """
+    processed = os.path.join(folder_path, 'processed')
+    tareas = []
+    entradas = {}
+    for nombre, file_path in inputFiles(folder_path, imt_folder).items():
+        if nombre in CPC_ESTACIONALES:
+            funcion = partial(_ingestarCPC, file_path, os.path.join(processed, f'{nombre}.csv'))
+        elif nombre in INDICES_OPCIONALES:
+            funcion = partial(_ingestarIMT, imt_folder, os.path.join(processed, f'{nombre}.csv'))
+        else:
+            funcion = partial(_ingestarPSL, file_path, processed)
+        entradas[nombre] = (funcion, file_path)
+
+    nombres = [nombre for nombre in {**INDICES, **INDICES_OPCIONALES} if nombre in entradas]
+    for nombre in nombres:
+        funcion, file_path = entradas[nombre]
+        firma = f"{file_path}:{manifest.fileSignature(file_path)['sha256']}"
+        tareas.append(taskgraph.task(f'ingesta:{nombre}', funcion, firma=firma))
+
+    ingestas = [f'ingesta:{nombre}' for nombre in nombres]
+    if delta:
+        exportar_csv = taskgraph.task('exportar:csv', partial(_exportarDelta, salida), deps=['clasificar'],
+                                      firma='delta', salidas=[f"{salida}.csv"])
+    else:
+        exportar_csv = taskgraph.task('exportar:csv', partial(_exportarCSV, f"{salida}.csv"), deps=['clasificar'],
+                                      salidas=[f"{salida}.csv"])
+    tareas += [
+        taskgraph.task('series', partial(_registrarIngesta, folder_path, nombres,
+                                         [entradas[nombre][1] for nombre in nombres]),
+                       deps=ingestas, salidas=[os.path.join(folder_path, STORE_PATH)]),
+        taskgraph.task('detector', partial(_detector, folder_path, nombres), deps=ingestas,
+                       salidas=[detector.statePath(folder_path)]),
+        taskgraph.task('clasificar', partial(_clasificar, nombres, suavizar), deps=ingestas,
+                       firma='suavizar' if suavizar else ''),
+        exportar_csv,
+        taskgraph.task('exportar:xlsx', partial(_exportarXLSX, f"{salida}.xlsx", xlsx_por_indice),
+                       deps=['clasificar'], firma='por_indice' if xlsx_por_indice else '',
+                       salidas=[f"{salida}.xlsx"]),
+        taskgraph.task('exportar:store', partial(_exportarStore, f"{salida}_store"), deps=['clasificar'],
+                       salidas=[f"{salida}_store"]),
+    ]
+    if parquetStore.available():
+        tareas.append(taskgraph.task('exportar:parquet', partial(_exportarParquet, f"{salida}_parquet"),
+                                     deps=['clasificar'], salidas=[f"{salida}_parquet"]))
+    return tareas
@@ -0,0 +1,196 @@
+"""
+store.py
+=================
+
+Este módulo guarda y carga las series de los índices en un formato binario
+columnar (archivos `.npy` de NumPy y un `metadata.json`), para que los
+notebooks, scripts y servicios abran los datos con `np.load(mmap_mode='r')`
+en lugar de volver a interpretar los `.csv` como texto.
+
+Descripción:
+------------
+- `saveSeries` / `loadSeries`: Tablas wide de la capa `processed` (un
+  arreglo `(años, 12)` y un arreglo de años por índice).
+- `saveTable` / `loadTable`: Tabla final en formato long (`Indices_Total`),
+  una columna por archivo. Las columnas de texto se guardan como códigos
+  enteros de una variable categórica y sus categorías van en el `metadata.json`.
+
+Estructura de una carpeta de almacenamiento:
+--------------------------------------------
+    store/
+    ├─ metadata.json
+    ├─ oni.npy          (valores, float64 (años, 12))
+    ├─ oni.year.npy     (años, int32)
+    └─ ...
+
+Notas:
+------
+- Cada archivo se escribe en un temporal y se renombra al final; el
+  `metadata.json` se escribe al último, así que un lector nunca ve una
+  carpeta a medio escribir como válida.
+- Los arreglos devueltos por los cargadores son de sólo lectura cuando se
+  usa `mmap=True`.
+
+Librerías requeridas:
+---------------------
+- `pandas >=  1.5.3`
+- `numpy >= 1.24.3`
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from modules.atomicWrite import writeAtomic
+
+METADATA_NAME = "metadata.json"
+
+
+def _guardarArreglo(arreglo, path):
+    writeAtomic(lambda tmp: np.save(tmp, arreglo, allow_pickle=False), path, 'wb')
+
+
+def _guardarMetadata(metadata, folder):
+    writeAtomic(lambda tmp: json.dump(metadata, tmp, indent=2, ensure_ascii=False),
+                os.path.join(folder, METADATA_NAME), encoding='UTF-8')
+
+
+def loadMetadata(folder):
+    """
+    Lee el `metadata.json` de una carpeta de almacenamiento. Si no existe
+    devuelve un diccionario vacío.
+    """
+    try:
+        with open(os.path.join(folder, METADATA_NAME), 'r', encoding='UTF-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def saveSeries(datos, folder):
+    """
+    Guarda las tablas wide de los índices en formato binario.
+
+    Args:
+        datos (dict): Tablas wide (`year`, `01` ... `12`) con el nombre del
+            índice como clave. Los índices que ya estén en la carpeta y no
+            vengan en `datos` se conservan.
+        folder (str): Carpeta de almacenamiento (p. ej. `data/processed/store`).
+    """
+    os.makedirs(folder, exist_ok=True)
+    metadata = loadMetadata(folder)
+    series = metadata.setdefault('series', {})
+
+    for nombre, df in datos.items():
+        columnas = [c for c in df.columns if c != 'year']
+        _guardarArreglo(df[columnas].to_numpy(dtype=np.float64), os.path.join(folder, f"{nombre}.npy"))
+        _guardarArreglo(df['year'].to_numpy(dtype=np.int32), os.path.join(folder, f"{nombre}.year.npy"))
+        series[nombre] = {'columnas': [str(c) for c in columnas], 'filas': len(df)}
+
+    _guardarMetadata(metadata, folder)
+
+
+def loadSeries(folder, nombres=None, mmap=True, as_frame=True):
+    """
+    Carga las series guardadas con `saveSeries`.
+
+    Args:
+        folder (str): Carpeta de almacenamiento.
+        nombres (list): Índices a cargar. Por defecto, todos.
+        mmap (bool): Abre los `.npy` con `mmap_mode='r'` (sin copiarlos a memoria).
+        as_frame (bool): Devuelve tablas wide; si es False devuelve tuplas
+            `(anios, valores)` de arreglos de NumPy.
+
+    Returns:
+        dict: Series con el nombre del índice como clave.
+    """
+    metadata = loadMetadata(folder).get('series', {})
+    modo = 'r' if mmap else None
+    datos = {}
+
+    for nombre in (nombres or metadata):
+        info = metadata[nombre]
+        valores = np.load(os.path.join(folder, f"{nombre}.npy"), mmap_mode=modo)
+        anios = np.load(os.path.join(folder, f"{nombre}.year.npy"), mmap_mode=modo)
+        if as_frame:
+            df = pd.DataFrame(valores, columns=info['columnas'], copy=False)
+            df.insert(0, 'year', anios)
+            datos[nombre] = df
+        else:
+            datos[nombre] = (anios, valores)
+
+    return datos
+
+
+def saveTable(tabla, folder):
+    """
+    Guarda una tabla en formato long columna por columna.
+
+    Las columnas numéricas y de fechas se guardan tal cual; las de texto se
+    guardan como códigos de una variable categórica (`int8`/`int16`/`int32`
+    según el número de categorías).
+
+    Args:
+        tabla (pd.DataFrame): Tabla a guardar (p. ej. `Indices_Total`).
+        folder (str): Carpeta de almacenamiento.
+    """
+    os.makedirs(folder, exist_ok=True)
+    columnas = {}
+
+    for columna in tabla.columns:
+        serie = tabla[columna]
+        archivo = f"{columna}.npy"
+
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            _guardarArreglo(serie.to_numpy(dtype='datetime64[ns]'), os.path.join(folder, archivo))
+            columnas[columna] = {'tipo': 'fecha', 'archivo': archivo}
+        elif pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            _guardarArreglo(serie.to_numpy(), os.path.join(folder, archivo))
+            columnas[columna] = {'tipo': 'numerico', 'archivo': archivo}
+        else:
+            categorica = serie.astype('category').cat
+            _guardarArreglo(np.asarray(categorica.codes), os.path.join(folder, archivo))
+            columnas[columna] = {'tipo': 'categorico', 'archivo': archivo,
+                                 'categorias': [str(c) for c in categorica.categories]}
+
+    _guardarMetadata({'filas': len(tabla), 'columnas': columnas}, folder)
+
+
+def loadTable(folder, columnas=None, mmap=True):
+    """
+    Carga una tabla guardada con `saveTable`.
+
+    Args:
+        folder (str): Carpeta de almacenamiento.
+        columnas (list): Columnas a cargar. Por defecto, todas.
+        mmap (bool): Abre los `.npy` con `mmap_mode='r'`.
+
+    Returns:
+        pd.DataFrame: Tabla con las columnas de texto como `category`.
+    """
+    metadata = loadMetadata(folder)
+    modo = 'r' if mmap else None
+    datos = {}
+
+    for columna in (columnas or metadata['columnas']):
+        info = metadata['columnas'][columna]
+        arreglo = np.load(os.path.join(folder, info['archivo']), mmap_mode=modo)
+        if info['tipo'] == 'categorico':
+            datos[columna] = pd.Categorical.from_codes(arreglo, categories=info['categorias'])
+        else:
+            datos[columna] = arreglo
+
+    return pd.DataFrame(datos, copy=False)
@@ -0,0 +1,288 @@
+"""
+taskgraph.py
+=================
+
+Este módulo ejecuta un grafo de tareas (p. ej. ingesta -> índice ->
+concatenación -> exportación) respetando sus dependencias. Las tareas
+independientes corren en paralelo en un grupo de hilos y el resultado de
+cada tarea se guarda en caché con la firma de sus entradas.
+
+Descripción:
+------------
+- `task`: Declara una tarea del grafo.
+- `plan`: Ordena las tareas por niveles (las de un mismo nivel son independientes).
+- `taskKeys`: Calcula la firma de cada tarea.
+- `cacheStatus`: Indica qué tareas se tomarían de la caché.
+- `run`: Ejecuta el grafo (o sólo muestra el plan con `dry_run=True`).
+
+Firma de una tarea:
+-------------------
+`sha256` del nombre de la tarea, del código del paquete de su función
+(todos los `.py` de su carpeta), de su `firma` propia (p. ej. el hash del archivo de entrada) y de
+las firmas de sus dependencias. Si una entrada cambia, cambian las firmas de
+la tarea y de todas las que dependen de ella; las demás se toman de la caché.
+
+Notas:
+------
+- Los hilos bastan porque el trabajo de cada tarea es lectura de archivos,
+  NumPy y pandas, que liberan el GIL en sus partes pesadas.
+- La caché es una carpeta con un `.pkl` por tarea y un `index.json` con la
+  firma de cada una. Una tarea con `salidas` sólo se toma de la caché si
+  esos archivos existen.
+
+Librerías requeridas:
+---------------------
+- Sólo la librería estándar.
+
+Autor:
+------
+Christian Bermúdez Rivas
+
+Versión:
+--------
+1.0
+
+Fecha de creación:
+------------------
+17 de octubre de 2026
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from modules.atomicWrite import writeAtomic
+
+INDEX_NAME = "index.json"
+
+_firmas_codigo = {}
+
+
+def task(nombre, funcion, deps=(), firma="", cache=True, salidas=()):
+    """
+    Declara una tarea del grafo.
+
+    Args:
+        nombre (str): Nombre único de la tarea (p. ej. 'ingesta:oni').
+        funcion (callable): Recibe los resultados de `deps`, en orden, como argumentos.
+        deps (tuple): Nombres de las tareas de las que depende.
+        firma (str): Firma de las entradas externas de la tarea (p. ej. el
+            hash del archivo que lee).
+        cache (bool): Guarda y reutiliza el resultado de la tarea.
+        salidas (tuple): Archivos que escribe la tarea.
+
+    Returns:
+        dict: Tarea.
+    """
+    return {'nombre': nombre, 'funcion': funcion, 'deps': tuple(deps), 'firma': str(firma),
+            'cache': cache, 'salidas': tuple(salidas)}
+
+
+def plan(tareas):
+    """
+    Ordena las tareas por niveles: cada nivel sólo depende de los anteriores.
+
+    Returns:
+        list: Lista de niveles, cada uno con los nombres de sus tareas.
+
+    Raises:
+        ValueError: Si una dependencia no existe o el grafo tiene ciclos.
+    """
+    por_nombre = {t['nombre']: t for t in tareas}
+    pendientes = {nombre: set(t['deps']) for nombre, t in por_nombre.items()}
+    for nombre, deps in pendientes.items():
+        faltantes = deps - set(por_nombre)
+        if faltantes:
+            raise ValueError(f"La tarea {nombre} depende de tareas inexistentes: {sorted(faltantes)}")
+
+    niveles = []
+    hechas = set()
+    while pendientes:
+        nivel = [nombre for nombre, deps in pendientes.items() if deps <= hechas]
+        if not nivel:
+            raise ValueError(f"El grafo tiene ciclos entre: {sorted(pendientes)}")
+        niveles.append(nivel)
+        hechas.update(nivel)
+        for nombre in nivel:
+            del pendientes[nombre]
+    return niveles
+
+
+def _firmaCodigo(funcion):
+    # Hash de los `.py` de la carpeta donde está definida la función (su
+    # paquete), para que un cambio en cualquier módulo que use invalide la
+    # caché. Los `functools.partial` se resuelven a la función que envuelven.
+    funcion = getattr(funcion, 'func', funcion)
+    modulo = sys.modules.get(getattr(funcion, '__module__', None))
+    ruta = getattr(modulo, '__file__', None)
+    if ruta is None:
+        return getattr(funcion, '__qualname__', repr(funcion))
+
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    if carpeta not in _firmas_codigo:
+        digest = hashlib.sha256()
+        for file_name in sorted(os.listdir(carpeta)):
+            if file_name.endswith(".py"):
+                with open(os.path.join(carpeta, file_name), 'rb') as file:
+                    digest.update(file.read())
+        _firmas_codigo[carpeta] = digest.hexdigest()
+    return _firmas_codigo[carpeta]
+
+
+def taskKeys(tareas):
+    """
+    Calcula la firma de cada tarea (ver la descripción del módulo).
+
+    Returns:
+        dict: Nombre de la tarea -> firma (`sha256` en hexadecimal).
+    """
+    por_nombre = {t['nombre']: t for t in tareas}
+    claves = {}
+    for nivel in plan(tareas):
+        for nombre in nivel:
+            tarea = por_nombre[nombre]
+            digest = hashlib.sha256()
+            for parte in (nombre, _firmaCodigo(tarea['funcion']), tarea['firma'],
+                          *(claves[dep] for dep in tarea['deps'])):
+                digest.update(parte.encode('UTF-8'))
+                digest.update(b"\0")
+            claves[nombre] = digest.hexdigest()
+    return claves
+
+
+def _archivoCache(cache_dir, nombre):
+    return os.path.join(cache_dir, nombre.replace(':', '__').replace(os.sep, '_') + ".pkl")
+
+
+def _cargarIndice(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_NAME), 'r', encoding='UTF-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _enCache(tarea, clave, indice, cache_dir):
+    return (cache_dir is not None and tarea['cache'] and indice.get(tarea['nombre']) == clave
+            and os.path.exists(_archivoCache(cache_dir, tarea['nombre']))
+            and all(os.path.exists(salida) for salida in tarea['salidas']))
+
+
+def cacheStatus(tareas, cache_dir):
+    """
+    Indica qué tareas se tomarían de la caché en una ejecución.
+
+    Returns:
+        dict: Nombre de la tarea -> True si su resultado vigente está en caché.
+    """
+    claves = taskKeys(tareas)
+    indice = _cargarIndice(cache_dir) if cache_dir is not None else {}
+    return {t['nombre']: _enCache(t, claves[t['nombre']], indice, cache_dir) for t in tareas}
+
+
+def run(tareas, jobs=1, cache_dir=None, dry_run=False, objetivos=None, envolver=None):
+    """
+    Ejecuta el grafo de tareas.
+
+    Args:
+        tareas (list): Tareas creadas con `task`.
+        jobs (int): Número de hilos para las tareas independientes.
+        cache_dir (str): Carpeta de la caché. Si es None no se usa caché.
+        dry_run (bool): Sólo imprime el plan (niveles y si cada tarea se
+            ejecuta o se toma de la caché) sin ejecutar nada.
+        objetivos (list): Tareas a obtener; por defecto, todas. Sólo se
+            ejecutan sus dependencias.
+        envolver (callable): Recibe el nombre y la función de cada tarea que
+            se ejecuta y devuelve la función a llamar (p. ej. `instrument.wrap`).
+
+    Returns:
+        dict: Nombre de la tarea -> resultado de las tareas ejecutadas y de
+        los objetivos. Las estadísticas de la ejecución (segundos y origen
+        de cada tarea) van en la clave `'_stats'`.
+        Con `dry_run=True` devuelve el plan como lista de niveles.
+    """
+    por_nombre = {t['nombre']: t for t in tareas}
+    if objetivos is not None:
+        necesarias, pila = set(), list(objetivos)
+        while pila:
+            nombre = pila.pop()
+            if nombre not in necesarias:
+                necesarias.add(nombre)
+                pila.extend(por_nombre[nombre]['deps'])
+        tareas = [t for t in tareas if t['nombre'] in necesarias]
+        por_nombre = {t['nombre']: t for t in tareas}
+
+    niveles = plan(tareas)
+    claves = taskKeys(tareas)
+    indice = _cargarIndice(cache_dir) if cache_dir is not None else {}
+    en_cache = {nombre for nombre in por_nombre if _enCache(por_nombre[nombre], claves[nombre], indice, cache_dir)}
+
+    if dry_run:
+        for i, nivel in enumerate(niveles):
+            print(f"Nivel {i}:")
+            for nombre in nivel:
+                estado = "caché" if nombre in en_cache else "ejecutar"
+                deps = ", ".join(por_nombre[nombre]['deps']) or "-"
+                print(f"  {nombre:<22} [{estado}] <- {deps}")
+        return niveles
+
+    resultados = {}
+    stats = {}
+
+    def cargar(nombre):
+        if nombre not in resultados:
+            with open(_archivoCache(cache_dir, nombre), 'rb') as file:
+                resultados[nombre] = pickle.load(file)
+        return resultados[nombre]
+
+    def ejecutar(nombre):
+        tarea = por_nombre[nombre]
+        funcion = tarea['funcion'] if envolver is None else envolver(nombre, tarea['funcion'])
+        t0 = time.perf_counter()
+        resultado = funcion(*(resultados[dep] for dep in tarea['deps']))
+        return nombre, resultado, time.perf_counter() - t0
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    faltan = {nombre: set(por_nombre[nombre]['deps']) for nombre in por_nombre if nombre not in en_cache}
+    for nombre in en_cache:
+        stats[nombre] = {'origen': 'caché', 'segundos': 0.0}
+    # Sólo se cargan los resultados en caché que necesitan las tareas a
+    # ejecutar o que se pidieron como objetivo
+    for nombre in en_cache:
+        if any(nombre in deps for deps in faltan.values()) or (objetivos is not None and nombre in objetivos):
+            cargar(nombre)
+
+    hechas = set(en_cache)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        en_curso = {}
+        while faltan or en_curso:
+            listas = [nombre for nombre, deps in faltan.items() if deps <= hechas]
+            for nombre in listas:
+                del faltan[nombre]
+                en_curso[pool.submit(ejecutar, nombre)] = nombre
+            if not en_curso:
+                break
+            terminadas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminadas:
+                del en_curso[futuro]
+                nombre, resultado, segundos = futuro.result()
+                resultados[nombre] = resultado
+                stats[nombre] = {'origen': 'ejecutada', 'segundos': segundos}
+                hechas.add(nombre)
+                if cache_dir is not None and por_nombre[nombre]['cache']:
+                    writeAtomic(lambda tmp: pickle.dump(resultado, tmp, protocol=pickle.HIGHEST_PROTOCOL),
+                                _archivoCache(cache_dir, nombre), 'wb')
+                    indice[nombre] = claves[nombre]
+
+    if cache_dir is not None:
+        writeAtomic(lambda tmp: json.dump(indice, tmp, indent=2, sort_keys=True),
+                    os.path.join(cache_dir, INDEX_NAME), encoding='UTF-8')
+
+    resultados['_stats'] = stats
+    return resultados
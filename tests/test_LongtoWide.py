@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import LongtoWide
+from modules import manifest
+
+DATA = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+def test_readCPCSeasonal_ordena_por_mes_central(tmp_path):
+    path = tmp_path / 'cpc.txt'
+    path.write_text("SEAS YR TOTAL ANOM\nFMA 2000 27.0 0.3\nDJF 2000 26.0 0.1\nNDJ 1999 25.0 -0.2\n")
+    long = LongtoWide.readCPCSeasonal(str(path))
+    assert long['year'].tolist() == [1999, 2000, 2000]
+    assert long['month'].tolist() == ['12', '01', '03']
+    assert long['value'].tolist() == [-0.2, 0.1, 0.3]
+    assert long['total'].tolist() == [25.0, 26.0, 27.0]
+
+
+def test_readCPCSeasonal_estacion_desconocida(tmp_path):
+    path = tmp_path / 'cpc.txt'
+    path.write_text("SEAS YR ANOM\nXYZ 2000 0.1\n")
+    with pytest.raises(ValueError):
+        LongtoWide.readCPCSeasonal(str(path))
+
+
+def test_roni_igual_a_processed():
+    # `data/processed/roni.csv` es la salida de la versión anterior de `longtowide`
+    long = LongtoWide.readCPCSeasonal(os.path.join(DATA, 'raw', 'RONI', 'RONI.ascii.txt'))
+    wide = LongtoWide.seasonalToWide(long)
+    anterior = pd.read_csv(os.path.join(DATA, 'processed', 'roni.csv'))
+    assert wide.columns.tolist() == anterior.columns.tolist()
+    assert wide['year'].tolist() == anterior['year'].tolist()
+    np.testing.assert_array_equal(wide.iloc[:, 1:].to_numpy(), anterior.iloc[:, 1:].to_numpy())
+
+
+def test_cpcIngest_incremental(tmp_path, capsys):
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    (tmp_path / 'processed').mkdir()
+    path = raw / 'roni.txt'
+    path.write_text("SEAS YR ANOM\nDJF 2000 0.1\nJFM 2000 0.2\n")
+    salida = str(tmp_path / 'processed' / 'roni.csv')
+
+    assert list(LongtoWide.cpcIngest(str(path), salida, incremental=True)) == ['roni']
+    assert os.path.exists(salida)
+    assert 'raw/roni.txt' in manifest.loadManifest(manifest.manifestPath(str(tmp_path)))
+    assert LongtoWide.cpcIngest(str(path), salida, incremental=True) == {}
+    assert "Sin cambios" in capsys.readouterr().out
@@ -0,0 +1,37 @@
+import os
+import stat
+
+import pytest
+
+from modules import atomicWrite
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="permisos POSIX")
+def test_permisos_segun_umask(tmp_path):
+    anterior = os.umask(0o027)
+    try:
+        atomicWrite._umask = None
+        path = atomicWrite.writeAtomic(lambda f: f.write("a,b\n"), str(tmp_path / "tabla.csv"))
+    finally:
+        os.umask(anterior)
+        atomicWrite._umask = None
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_error_conserva_el_archivo_anterior(tmp_path):
+    path = tmp_path / "tabla.csv"
+    path.write_text("anterior\n")
+
+    def escribir(f):
+        f.write("a medias")
+        raise RuntimeError("corte")
+
+    with pytest.raises(RuntimeError):
+        atomicWrite.writeAtomic(escribir, str(path))
+    assert path.read_text() == "anterior\n"
+    assert os.listdir(tmp_path) == ["tabla.csv"]
+
+
+def test_modo_binario(tmp_path):
+    path = atomicWrite.writeAtomic(lambda f: f.write(b"\x00\x01"), str(tmp_path / "datos.bin"), 'wb')
+    assert open(path, 'rb').read() == b"\x00\x01"
@@ -0,0 +1,45 @@
+import os
+import json
+
+from modules import cli
+
+
+def test_opciones_antes_del_subcomando():
+    args = cli._parser().parse_args(['--jobs', '3', 'ingest'])
+    assert args.comando == 'ingest'
+    assert args.jobs == 3
+
+
+def test_opcion_booleana_antes_del_subcomando():
+    args = cli._parser().parse_args(['--delta', 'build'])
+    assert args.delta is True
+
+
+def test_opciones_despues_del_subcomando():
+    args = cli._parser().parse_args(['--jobs', '3', 'ingest', '--jobs', '5', '--data', 'otra'])
+    assert args.jobs == 5
+    assert args.data == 'otra'
+
+
+def test_valores_por_defecto():
+    args = cli._parser().parse_args(['status'])
+    assert args.data == './data'
+    assert args.delta is False
+
+
+def _grafoMinimo(*args, **kwargs):
+    from modules import taskgraph
+    return [taskgraph.task('a', lambda: list(range(1000))), taskgraph.task('b', len, deps=['a'])]
+
+
+def test_memory_implica_report(tmp_path, monkeypatch):
+    from modules import pipeline
+    monkeypatch.setattr(pipeline, 'buildGraph', _grafoMinimo)
+    assert cli.main(['--memory', '--data', str(tmp_path)]) == 0
+
+    reportes = os.listdir(tmp_path / 'processed' / 'reports')
+    assert len(reportes) == 1
+    with open(tmp_path / 'processed' / 'reports' / reportes[0], encoding='UTF-8') as file:
+        reporte = json.load(file)
+    assert reporte['jobs'] == 1
+    assert 'memoria_pico_mb' in reporte
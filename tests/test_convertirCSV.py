@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import convertirCSV
+
+RAW = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
+PROCESSED = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed')
+
+
+def _escribir(tmp_path, texto, nombre='serie.data'):
+    path = tmp_path / nombre
+    path.write_text(texto)
+    return str(path)
+
+
+def test_parsePSL_bloque_y_centinelas(tmp_path):
+    path = _escribir(tmp_path, (
+        " 2000 2001\n"
+        " 2000  " + "  0.10" * 11 + " -99.99\n"
+        " 2001  " + "  0.20" * 10 + " -77.77 -99.90\n"
+        "  -77.77\n"
+        "  Nota de la fuente\n"
+    ))
+    anios, valores, bad_rows = convertirCSV.parsePSL(path)
+    assert anios.tolist() == [2000, 2001]
+    assert bad_rows == 0
+    assert np.isnan(valores[0, 11]) and np.isnan(valores[1, 10]) and np.isnan(valores[1, 11])
+    assert valores[1, 0] == pytest.approx(0.2)
+
+
+def test_parsePSL_con_encabezado(tmp_path):
+    path = _escribir(tmp_path, (
+        "Índice sintético\n"
+        "fuente: pruebas\n"
+        "\n"
+        " 2000 2000\n"
+        " 2000  " + "  1.00" * 12 + "\n"
+        "  -99.99\n"
+    ))
+    anios, valores, _ = convertirCSV.parsePSL(path)
+    assert anios.tolist() == [2000]
+    assert np.allclose(valores, 1.0)
+
+
+def test_parsePSL_filas_irregulares(tmp_path):
+    path = _escribir(tmp_path, (
+        " 2000 2002\n"
+        " 2000  " + "  1.00" * 12 + "\n"
+        " 2001  " + "  2.00" * 5 + "\n"
+        " xxxx  " + "  3.00" * 12 + "\n"
+        "  -99.99\n"
+    ))
+    anios, valores, bad_rows = convertirCSV.parsePSL(path)
+    assert anios.tolist() == [2000, 2001]
+    assert bad_rows == 1
+    assert np.isnan(valores[1, 5:]).all()
+
+
+def test_parsePSL_sin_rango_de_anios(tmp_path, capsys):
+    path = _escribir(tmp_path, "sin datos\notra línea\n")
+    assert convertirCSV.parsePSL(path) is None
+    assert "Sin línea de rango de años" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('nombre', ['oni', 'nina1', 'nina3', 'nina34', 'nina4', 'soi', 'meiv2'])
+def test_parsePSL_igual_a_processed(nombre):
+    # Los `.csv` de `processed` del repositorio son la salida del lector
+    # anterior, con la línea de rango de años como primera fila
+    anios, valores, _ = convertirCSV.parsePSL(os.path.join(RAW, f"{nombre}.data"))
+    anterior = pd.read_csv(os.path.join(PROCESSED, f"{nombre}.csv"), skiprows=[1])
+    anterior = anterior.mask(anterior.isin(convertirCSV.SENTINELAS))
+    assert anios.tolist() == anterior['year'].tolist()
+    np.testing.assert_array_equal(valores, anterior.drop(columns='year').to_numpy(dtype=float))
+
+
+def test_dataprocesser_paralelo_igual_a_serie(tmp_path):
+    carpeta = tmp_path / 'datos'
+    (carpeta / 'raw').mkdir(parents=True)
+    (carpeta / 'processed').mkdir()
+    for nombre in ['oni', 'soi', 'nina4']:
+        (carpeta / 'raw' / f"{nombre}.data").write_bytes(open(os.path.join(RAW, f"{nombre}.data"), 'rb').read())
+    serie = convertirCSV.dataprocesser(str(carpeta), workers=1, escribir_csv=False)
+    paralelo = convertirCSV.dataprocesser(str(carpeta), workers=2, escribir_csv=False)
+    assert sorted(serie) == sorted(paralelo) == ['nina4', 'oni', 'soi']
+    for nombre in serie:
+        pd.testing.assert_frame_equal(serie[nombre], paralelo[nombre])
@@ -0,0 +1,65 @@
+import os
+
+import pandas as pd
+import pytest
+
+from modules import deltaExport
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+
+
+@pytest.fixture(scope='module')
+def tabla():
+    return pd.read_csv(os.path.join(RAIZ, 'Indices_Total.csv'), parse_dates=['date'])
+
+
+def _cambiar(tabla):
+    # Una fila modificada, dos eliminadas y una nueva
+    nueva = tabla.iloc[2:].copy()
+    nueva.loc[nueva.index[0], 'value'] = 9.99
+    agregada = nueva.iloc[[-1]].assign(date=nueva['date'].max() + pd.DateOffset(months=1), value=0.1)
+    return pd.concat([nueva, agregada], ignore_index=True)
+
+
+def _ordenar(tabla):
+    return tabla.sort_values(list(deltaExport.CLAVES)).reset_index(drop=True)
+
+
+def test_diff_y_apply_ida_y_vuelta(tabla):
+    nueva = _cambiar(tabla)
+    delta = deltaExport.diffTables(tabla, nueva)
+    assert delta['cambio'].value_counts().to_dict() == {'nueva': 1, 'modificada': 1, 'eliminada': 2}
+
+    aplicada = deltaExport.applyDelta(tabla, delta)
+    pd.testing.assert_frame_equal(_ordenar(aplicada), _ordenar(nueva), check_dtype=False)
+    # Aplicar dos veces el mismo delta no cambia el resultado
+    pd.testing.assert_frame_equal(deltaExport.applyDelta(aplicada, delta), aplicada)
+
+
+def test_sin_cambios_delta_vacio(tabla):
+    assert deltaExport.diffTables(tabla, tabla.copy()).empty
+
+
+def test_csv_al_dia_entre_compactaciones(tabla, tmp_path):
+    salida = str(tmp_path / 'Indices_Total')
+    primera = deltaExport.exportDelta(tabla, salida)
+    assert primera['tabla']['version'] == primera['base']['version'] == 1
+
+    nueva = _cambiar(tabla)
+    datos = deltaExport.exportDelta(nueva, salida, compactar_cada=30)
+    assert datos['version'] == 2 and len(datos['deltas']) == 1
+    assert datos['tabla']['version'] == 2 and datos['base']['version'] == 1
+    leida = pd.read_csv(f"{salida}.csv", parse_dates=['date'])
+    pd.testing.assert_frame_equal(_ordenar(leida), _ordenar(nueva), check_dtype=False)
+
+    # El consumidor que tiene la base llega a la misma tabla aplicando los deltas
+    delta = pd.read_csv(os.path.join(f"{salida}_deltas", datos['deltas'][0]['archivo']))
+    pd.testing.assert_frame_equal(_ordenar(deltaExport.applyDelta(tabla, delta)), _ordenar(leida),
+                                  check_dtype=False)
+
+    # Compactar sólo borra los deltas
+    antes = open(f"{salida}.csv", 'rb').read()
+    datos = deltaExport.compact(salida)
+    assert datos['deltas'] == [] and datos['base']['version'] == 2
+    assert open(f"{salida}.csv", 'rb').read() == antes
+    assert not [f for f in os.listdir(f"{salida}_deltas") if f.startswith('delta_')]
@@ -0,0 +1,147 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import eventClassifier
+
+
+def _strengthEscalar(codes, repeticiones, grupos):
+    # Definición de `strengthCodes`, un segmento a la vez
+    salida = list(codes)
+    i = 0
+    while i < len(codes):
+        if codes[i] <= 0:
+            i += 1
+            continue
+        j = i
+        while j + 1 < len(codes) and codes[j + 1] > 0 and grupos[j + 1] == grupos[i]:
+            j += 1
+        maximo, k = None, i
+        while k <= j:
+            fin = k
+            while fin + 1 <= j and codes[fin + 1] == codes[k]:
+                fin += 1
+            if fin - k + 1 >= repeticiones and (maximo is None or codes[k] > maximo):
+                maximo = codes[k]
+            k = fin + 1
+        if maximo is not None:
+            salida[i:j + 1] = [maximo] * (j - i + 1)
+        i = j + 1
+    return salida
+
+
+def test_strength_casos():
+    codes = np.array([0, 1, 1, 1, 3, 2, 2, 2, 0, 4, 4, 1, 0])
+    esperado = [0, 2, 2, 2, 2, 2, 2, 2, 0, 4, 4, 1, 0]
+    np.testing.assert_array_equal(eventClassifier.strengthCodes(codes), esperado)
+    # Con repeticiones=2 el segmento 4, 4, 1 pasa a 4
+    np.testing.assert_array_equal(eventClassifier.strengthCodes(codes, repeticiones=2)[9:12], [4, 4, 4])
+
+
+def test_strength_grupos_separan_segmentos():
+    codes = np.array([2, 2, 2, 1, 1, 1])
+    grupos = np.array(['ONI', 'ONI', 'ONI', 'SOI', 'SOI', 'SOI'])
+    np.testing.assert_array_equal(eventClassifier.strengthCodes(codes, 3, grupos), codes)
+    np.testing.assert_array_equal(eventClassifier.strengthCodes(codes, 3), [2] * 6)
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_strength_igual_a_escalar(semilla):
+    rng = np.random.default_rng(semilla)
+    codes = rng.choice([-1, 0, 1, 2, 3, 4], 600, p=[0.05, 0.15, 0.3, 0.3, 0.15, 0.05])
+    grupos = np.repeat(np.arange(6), 100)
+    for repeticiones in (1, 2, 3, 5):
+        np.testing.assert_array_equal(eventClassifier.strengthCodes(codes, repeticiones, grupos),
+                                      _strengthEscalar(codes.tolist(), repeticiones, grupos.tolist()))
+
+
+def test_strength_vacio():
+    assert len(eventClassifier.strengthCodes(np.array([], dtype=np.int64))) == 0
+
+
+def test_strength_smoothing_conserva_otras_etiquetas():
+    tabla = pd.DataFrame({
+        'index_name': ['ONI'] * 6 + ['MEI'] * 2,
+        'type': ['Débil', 'Moderado', 'Moderado', 'Moderado', 'Neutro', 'Débil', 'No aplicable', 'Fuerte'],
+    })
+    eventClassifier.strengthSmoothing(tabla, nueva_col='type_event')
+    assert tabla['type_event'].tolist() == ['Moderado', 'Moderado', 'Moderado', 'Moderado', 'Neutro', 'Débil',
+                                            'No aplicable', 'Fuerte']
+
+
+def _serie(semilla, n=240, nan=0.03):
+    rng = np.random.default_rng(semilla)
+    valores = np.round(np.cumsum(rng.normal(0, 0.3, n)) * 0.5, 1)
+    valores[rng.random(n) < nan] = np.nan
+    return valores
+
+
+@pytest.mark.parametrize('invertido', [False, True])
+@pytest.mark.parametrize('semilla', range(4))
+def test_stream_igual_a_lote(semilla, invertido):
+    valores = _serie(semilla)
+    meses = np.arange(len(valores)) + 24000
+    inicial = 60
+    parametros = (5, -0.5, 0.5, invertido)
+
+    etiquetas = dict(zip(meses[:inicial].tolist(), eventClassifier.persistenceCodes(valores[:inicial], *parametros)))
+    estado = eventClassifier.streamInit(valores[:inicial], meses[:inicial], *parametros)
+    for i in range(inicial, len(valores), 7):
+        cambios_meses, _, codigos = eventClassifier.streamUpdate(estado, meses[i:i + 7], valores[i:i + 7])
+        etiquetas.update(zip(cambios_meses.tolist(), codigos.tolist()))
+
+    esperado = eventClassifier.persistenceCodes(valores, *parametros)
+    observados = ~np.isnan(valores)
+    np.testing.assert_array_equal([etiquetas[m] for m in meses[observados].tolist()], esperado[observados])
+
+
+def test_stream_reetiqueta_la_racha_al_confirmarse():
+    estado = eventClassifier.streamInit(np.array([0.1, 0.6, 0.7]), np.array([1, 2, 3]), 4, -0.5, 0.5)
+    assert estado['largo'] == 2 and not estado['confirmada']
+    meses, valores, codigos = eventClassifier.streamUpdate(estado, np.array([4, 5]), np.array([0.8, 0.9]))
+    assert meses.tolist() == [2, 3, 4, 5]
+    assert valores.tolist() == [0.6, 0.7, 0.8, 0.9]
+    assert (codigos == eventClassifier.NINO).all()
+
+
+def test_stream_estado_json():
+    estado = eventClassifier.streamInit(_serie(0), np.arange(240), 5, -0.5, 0.5)
+    assert json.loads(json.dumps(estado)) == estado
+
+
+def test_stream_mes_repetido():
+    estado = eventClassifier.streamInit(np.array([0.1, 0.2]), np.array([1, 2]), 5, -0.5, 0.5)
+    with pytest.raises(ValueError):
+        eventClassifier.streamUpdate(estado, np.array([2]), np.array([0.3]))
+
+
+@pytest.mark.parametrize('invertido', [False, True])
+def test_sweep_igual_a_persistence_codes(invertido):
+    valores = _serie(5, n=500)
+    ajustes = np.vstack([eventClassifier.sweepGrid(), [[-0.8, 0.4, 2]]])
+    barrido = eventClassifier.persistenceSweep(valores, ajustes, invertido=invertido)
+    assert barrido['codigos'].shape == (len(ajustes), len(valores))
+
+    for fila, (inferior, superior, duracion) in enumerate(ajustes):
+        codigos = eventClassifier.persistenceCodes(valores, int(duracion), inferior, superior, invertido)
+        np.testing.assert_array_equal(barrido['codigos'][fila], codigos)
+
+        nino = codigos == eventClassifier.NINO
+        nina = codigos == eventClassifier.NINA
+        assert barrido['meses_nino'][fila] == nino.sum()
+        assert barrido['meses_nina'][fila] == nina.sum()
+        assert barrido['eventos_nino'][fila] == (nino & ~np.r_[False, nino[:-1]]).sum()
+        assert barrido['eventos_nina'][fila] == (nina & ~np.r_[False, nina[:-1]]).sum()
+
+
+def test_sweep_grid():
+    grilla = eventClassifier.sweepGrid(umbrales=(0.5, 1.0), duraciones=(3, 5))
+    assert grilla.tolist() == [[-0.5, 0.5, 3], [-0.5, 0.5, 5], [-1.0, 1.0, 3], [-1.0, 1.0, 5]]
+
+
+def test_sweep_un_ajuste():
+    barrido = eventClassifier.persistenceSweep(np.array([0.6, 0.7, 0.8, 0.1]), [-0.5, 0.5, 3])
+    assert barrido['codigos'].tolist() == [[eventClassifier.NINO] * 3 + [eventClassifier.NEUTRO]]
+    assert barrido['eventos_nino'].tolist() == [1]
@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+import pytest
+
+from modules import excelExport
+
+pytest.importorskip('openpyxl')
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+
+
+@pytest.fixture(scope='module')
+def tabla():
+    # Una muestra de cada índice basta para comparar los libros
+    completa = pd.read_csv(os.path.join(RAIZ, 'Indices_Total.csv'), parse_dates=['date'])
+    return completa.groupby('index_name', sort=False).head(40).reset_index(drop=True)
+
+
+def test_por_defecto_igual_a_to_excel(tabla, tmp_path):
+    path = str(tmp_path / 'Indices_Total.xlsx')
+    referencia = str(tmp_path / 'referencia.xlsx')
+    excelExport.writeXLSX(tabla, path)
+    tabla.to_excel(referencia, sheet_name="indices", index=False)
+
+    hojas = pd.read_excel(path, sheet_name=None)
+    assert list(hojas) == ['indices']
+    pd.testing.assert_frame_equal(hojas['indices'], pd.read_excel(referencia, sheet_name='indices'))
+
+
+def test_por_indice_con_descripciones_aparte(tabla, tmp_path):
+    path = str(tmp_path / 'Indices_Total.xlsx')
+    excelExport.writeXLSX(tabla, path, por_indice=True, descripciones_aparte=True)
+
+    hojas = pd.read_excel(path, sheet_name=None)
+    assert list(hojas) == list(tabla['index_name'].unique()) + [excelExport.HOJA_DESCRIPCIONES]
+    for nombre, grupo in tabla.groupby('index_name', sort=False):
+        assert len(hojas[nombre]) == len(grupo)
+        assert not set(excelExport.DESCRIPCIONES) & set(hojas[nombre].columns)
+    descripciones = hojas[excelExport.HOJA_DESCRIPCIONES]
+    assert set(descripciones['columna']) == set(excelExport.DESCRIPCIONES)
@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import convertirCSV
+from modules import eventClassifier
+
+IMT = os.path.join(os.path.dirname(__file__), '..', 'IMT')
+
+
+def _categoriaEscalar(x):
+    # Reglas de la versión anterior de `IMTClassifier`, un valor a la vez
+    if x >= 4:
+        return 'C5'
+    for inferior, categoria in [(3, 'C4'), (2, 'C3'), (1, 'C2'), (0, 'C1'), (-1, 'F1'), (-2, 'F2'), (-3, 'F3'), (-4, 'F4')]:
+        if x >= inferior:
+            return categoria
+    if x <= -4:
+        return 'F5'
+    return 'Desconocido'
+
+
+def test_IMTClassifier_igual_a_reglas_escalares():
+    valores = np.concatenate([np.arange(-5, 5.01, 0.25), [-4.0001, 3.9999, np.nan]])
+    resultado = eventClassifier.IMTClassifier(valores)
+    assert list(resultado['intensidad']) == [_categoriaEscalar(x) for x in valores]
+
+
+def test_IMTClassifier_escalar():
+    assert eventClassifier.IMTClassifier(1.5) == {'intensidad': 'C2', 'fase': 'Fase cálida moderada'}
+    assert eventClassifier.IMTClassifier(-4.5)['fase'] == 'Fase fría muy fuerte'
+
+
+def test_latestIMT_por_fecha_del_nombre(tmp_path):
+    for nombre in ['Valores_mensuales_202407__res_OCTUBRE_2024.xlsx', 'Valores_mensuales__ENERO_2026_res.xlsx',
+                   'Valores_mensuales_202505_MAYO_2025.xlsx', 'otro.xlsx']:
+        (tmp_path / nombre).write_bytes(b"")
+    assert os.path.basename(convertirCSV.latestIMT(str(tmp_path))) == 'Valores_mensuales__ENERO_2026_res.xlsx'
+    (tmp_path / 'vacia').mkdir()
+    assert convertirCSV.latestIMT(str(tmp_path / 'vacia')) is None
+
+
+@pytest.mark.skipif(convertirCSV.latestIMT(IMT) is None, reason="sin archivos del IMT")
+def test_readIMT_tabla_wide():
+    tabla = convertirCSV.readIMT(convertirCSV.latestIMT(IMT))
+    assert tabla.columns.tolist() == ['year'] + [f"{m:02d}" for m in range(1, 13)]
+    assert tabla['year'].is_monotonic_increasing
+    assert pd.api.types.is_float_dtype(tabla['01'])
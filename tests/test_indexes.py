@@ -0,0 +1,79 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from modules import convertirCSV
+from modules import LongtoWide
+from modules import indexes
+from modules import pipeline
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+DATA = os.path.join(RAIZ, 'data')
+
+
+@pytest.fixture(scope='module')
+def datos():
+    tablas = convertirCSV.dataprocesser(DATA, escribir_csv=False)
+    tablas['roni'] = LongtoWide.readCPCSeasonal(os.path.join(DATA, pipeline.CPC_ESTACIONALES['roni']))
+    return tablas
+
+
+@pytest.fixture(scope='module')
+def anterior():
+    # `Indices_Total.csv` del repositorio: salida de la versión anterior del ETL
+    return pd.read_csv(os.path.join(RAIZ, 'Indices_Total.csv'))
+
+
+def _comoCSV(tabla):
+    # Misma representación que la tabla publicada
+    buffer = io.StringIO()
+    tabla.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+
+def test_registro_completo():
+    campos = {'index_name', 'index_description', 'unit', 'fase', 'clasificador', 'umbrales_evento',
+              'eventos', 'intensidad'}
+    for nombre, config in indexes.REGISTRO.items():
+        assert campos <= set(config), nombre
+        if config['clasificador'] != 'mensual':
+            assert config['condicion'] >= 1, nombre
+        assert set(config['eventos']) == {'Niña', 'Niño', 'Neutro'}, nombre
+    assert set(pipeline.INDICES.values()) | set(pipeline.INDICES_OPCIONALES.values()) <= set(indexes.REGISTRO)
+
+
+@pytest.mark.parametrize('archivo', ['oni', 'nina1', 'nina3', 'nina34', 'nina4', 'roni'])
+def test_processIndex_igual_a_tabla_anterior(datos, anterior, archivo):
+    indice = pipeline.INDICES[archivo]
+    nueva = _comoCSV(indexes.processIndex(datos[archivo], indice).dropna(subset=['value']))
+    esperada = anterior[anterior['index_name'] == indice].reset_index(drop=True)
+    pd.testing.assert_frame_equal(nueva, esperada)
+
+
+def test_processIndex_mei_sin_centinelas(datos, anterior):
+    # La tabla anterior conservaba los meses sin dato de la MEI como -999
+    nueva = _comoCSV(indexes.processIndex(datos['meiv2'], 'MEI').dropna(subset=['value']))
+    esperada = anterior[(anterior['index_name'] == 'MEI') & (anterior['value'] != -999)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(nueva, esperada)
+
+
+def test_processIndex_soi_solo_cambian_eventos(datos, anterior):
+    # Único cambio intencional: los eventos del SOI ya no se desplazan 36 meses
+    nueva = _comoCSV(indexes.processIndex(datos['soi'], 'SOI').dropna(subset=['value']))
+    esperada = anterior[anterior['index_name'] == 'SOI'].reset_index(drop=True)
+    columnas = [c for c in esperada.columns if c not in ('event', 'event_description')]
+    pd.testing.assert_frame_equal(nueva[columnas], esperada[columnas])
+
+
+def test_processIndex_acepta_long(datos):
+    wide = indexes.processIndex(datos['oni'], 'ONI')
+    long = indexes.processIndex(datos['oni'].melt(id_vars='year', var_name='month', value_name='value'), 'ONI')
+    pd.testing.assert_frame_equal(wide.reset_index(drop=True), long.reset_index(drop=True))
+
+
+def test_indice_desconocido(datos):
+    with pytest.raises(KeyError):
+        indexes.processIndex(datos['oni'], 'NO_EXISTE')
@@ -0,0 +1,77 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from modules import cli
+from modules import kernels
+
+BACKENDS = [
+    'numpy',
+    pytest.param('numba', marks=pytest.mark.skipif(importlib.util.find_spec('numba') is None,
+                                                   reason="numba no está instalado")),
+]
+
+
+@pytest.fixture
+def backend(request):
+    anterior = kernels.getBackend()
+    kernels.setBackend(request.param)
+    yield request.param
+    kernels.setBackend(anterior)
+
+
+def _datos(semilla, n_series, n_meses):
+    # Caminatas aleatorias con NaN, como `kernels.checkParity`
+    rng = np.random.default_rng(semilla)
+    valores = np.round(np.cumsum(rng.normal(0, 0.3, (n_series, n_meses)), axis=1) * 0.5, 1)
+    valores[rng.random(valores.shape) < 0.02] = np.nan
+    return {
+        'valores': valores,
+        'condicion': rng.integers(1, 8, n_series).astype(np.int64),
+        'inferior': -rng.uniform(0.3, 1.0, n_series),
+        'superior': rng.uniform(0.3, 1.0, n_series),
+        'invertido': rng.random(n_series) < 0.5,
+        'codigos': rng.choice([-1, 0, 1, 2, 3, 4], n_series * n_meses).astype(np.int64),
+        'grupos': np.repeat(np.arange(n_series), n_meses).astype(np.int64),
+    }
+
+
+@pytest.mark.parametrize('backend', BACKENDS, indirect=True)
+@pytest.mark.parametrize('semilla, n_series, n_meses', [(0, 50, 900), (1, 7, 13), (2, 1, 1)])
+def test_paridad(backend, semilla, n_series, n_meses):
+    d = _datos(semilla, n_series, n_meses)
+    bordes = np.array([0.5, 1.0, 1.5, 2.0])
+    assert kernels.getBackend() == backend
+
+    np.testing.assert_array_equal(
+        kernels.persistence(d['valores'], d['condicion'], d['inferior'], d['superior'], d['invertido']),
+        kernels._persistenceNumpy(d['valores'], d['condicion'], d['inferior'], d['superior'], d['invertido']))
+    np.testing.assert_array_equal(kernels.intensity(d['valores'], bordes),
+                                  kernels._intensityNumpy(d['valores'], bordes))
+    np.testing.assert_array_equal(kernels.strength(d['codigos'], 3, d['grupos']),
+                                  kernels._strengthNumpy(d['codigos'], 3, d['grupos']))
+
+
+def test_check_parity():
+    paridad = kernels.checkParity(n_series=7, n_meses=60)
+    assert set(paridad) == set(kernels.availableBackends())
+    assert all(all(r.values()) for r in paridad.values()), paridad
+
+
+def test_paridad_restaura_backend():
+    anterior = kernels.getBackend()
+    kernels.checkParity(n_series=3, n_meses=24)
+    assert kernels.getBackend() == anterior
+
+
+def test_backend_desconocido():
+    with pytest.raises(ValueError):
+        kernels.setBackend('fortran')
+
+
+def test_opcion_backend():
+    assert cli._parser().parse_args([]).backend == 'numpy'
+    assert cli._parser().parse_args(['build', '--backend', 'auto']).backend == 'auto'
+    with pytest.raises(SystemExit):
+        cli._parser().parse_args(['--backend', 'fortran'])
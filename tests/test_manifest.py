@@ -0,0 +1,52 @@
+import os
+
+from modules import manifest
+
+
+def _datos(tmp_path):
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    (tmp_path / 'processed').mkdir()
+    archivos = []
+    for nombre, texto in [('oni.data', "1950 1950\n"), ('soi.data', "1948 1948\n")]:
+        (raw / nombre).write_text(texto)
+        archivos.append(str(raw / nombre))
+    return archivos
+
+
+def test_archivos_nuevos_cambian(tmp_path):
+    archivos = _datos(tmp_path)
+    assert manifest.changedFiles(archivos, {}, str(tmp_path)) == archivos
+
+
+def test_sin_cambios_despues_de_registrar(tmp_path):
+    archivos = _datos(tmp_path)
+    ruta = manifest.manifestPath(str(tmp_path))
+    manifest.saveManifest(manifest.updateManifest({}, archivos, str(tmp_path)), ruta)
+    datos = manifest.loadManifest(ruta)
+    assert sorted(datos) == ['raw/oni.data', 'raw/soi.data']
+    assert manifest.changedFiles(archivos, datos, str(tmp_path)) == []
+
+
+def test_contenido_distinto_cambia(tmp_path):
+    archivos = _datos(tmp_path)
+    datos = manifest.updateManifest({}, archivos, str(tmp_path))
+    with open(archivos[0], 'a') as file:
+        file.write("1950 -1.5\n")
+    assert manifest.changedFiles(archivos, datos, str(tmp_path)) == [archivos[0]]
+
+
+def test_misma_firma_con_otra_fecha_no_cambia(tmp_path):
+    archivos = _datos(tmp_path)
+    datos = manifest.updateManifest({}, archivos, str(tmp_path))
+    info = os.stat(archivos[1])
+    os.utime(archivos[1], ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    assert manifest.changedFiles(archivos, datos, str(tmp_path)) == []
+    # La fecha nueva queda registrada para no volver a calcular el hash
+    assert datos['raw/soi.data']['mtime_ns'] == info.st_mtime_ns + 10**9
+
+
+def test_manifiesto_danado_es_vacio(tmp_path):
+    ruta = tmp_path / 'manifest.json'
+    ruta.write_text("{no es json")
+    assert manifest.loadManifest(str(ruta)) == {}
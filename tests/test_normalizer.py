@@ -0,0 +1,83 @@
+import os
+
+import pandas as pd
+import pytest
+
+from modules import normalizer
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+
+
+@pytest.fixture(scope='module')
+def tabla():
+    completa = pd.read_csv(os.path.join(RAIZ, 'Indices_Total.csv'), parse_dates=['date'])
+    return completa.groupby('index_name', sort=False).head(60).reset_index(drop=True)
+
+
+def _reconstruir(tablas):
+    # Tabla long a partir de las seis tablas, con `checkedMerge`
+    valores = tablas['indexes_values']
+    unida = normalizer.checkedMerge(valores, tablas['indexes'].rename(columns={'id': 'id_index'}), on='id_index')
+    unida = normalizer.checkedMerge(unida, tablas['dates'].rename(columns={'id': 'id_date'}), on='id_date')
+    unida = normalizer.checkedMerge(unida, tablas['phases'].rename(columns={'id': 'id_phase'}), on='id_phase')
+    return unida.set_index('id').sort_index()
+
+
+def _cambiar(tabla):
+    # Un valor modificado, la primera fila eliminada y un mes nuevo de ONI
+    nueva = tabla.iloc[1:].copy()
+    nueva.loc[nueva.index[5], 'value'] = 9.99
+    oni = nueva[nueva['index_name'] == 'ONI']
+    agregada = oni.iloc[[-1]].assign(date=oni['date'].max() + pd.DateOffset(months=1), value=0.3)
+    return pd.concat([nueva, agregada], ignore_index=True)
+
+
+def test_una_fila_por_fila_de_entrada(tabla):
+    tablas = normalizer.normalize(tabla)
+    assert list(tablas) == normalizer.TABLAS
+    assert len(tablas['indexes_values']) == len(tabla)
+    unida = _reconstruir(tablas)
+    assert unida['value'].tolist() == tabla['value'].tolist()
+    assert unida['index_name'].tolist() == tabla['index_name'].tolist()
+    assert unida['phase'].tolist() == tabla['phase'].tolist()
+
+
+def test_fechas_repetidas(tabla):
+    with pytest.raises(ValueError):
+        normalizer.normalize(pd.concat([tabla, tabla.iloc[[0]]], ignore_index=True))
+
+
+def test_primera_ejecucion_igual_a_normalize(tabla):
+    completas, cambios = normalizer.normalizeIncremental(tabla)
+    for nombre, df in normalizer.normalize(tabla).items():
+        pd.testing.assert_frame_equal(completas[nombre], df)
+        pd.testing.assert_frame_equal(cambios[nombre], df)
+
+
+def test_ids_estables(tabla, tmp_path):
+    completas, _ = normalizer.normalizeIncremental(tabla)
+    normalizer.saveKeys(completas, str(tmp_path))
+    claves = normalizer.loadKeys(str(tmp_path))
+    assert set(claves) == set(normalizer.TABLAS)
+
+    # Sin cambios en la tabla no hay filas que cargar y los ids no cambian
+    mismas, cambios = normalizer.normalizeIncremental(tabla, claves)
+    assert all(df.empty for df in cambios.values())
+    for nombre in normalizer.TABLAS:
+        assert mismas[nombre]['id'].tolist() == completas[nombre]['id'].tolist()
+
+    nueva = _cambiar(tabla)
+    siguientes, cambios = normalizer.normalizeIncremental(nueva, claves)
+    anterior = _reconstruir(completas)
+    actual = _reconstruir(siguientes)
+
+    # La fila eliminada se conserva y las demás mantienen su id
+    assert len(siguientes['indexes_values']) == len(completas['indexes_values']) + 1
+    assert actual.loc[anterior.index, ['index_name', 'date']].equals(anterior[['index_name', 'date']])
+
+    valores = cambios['indexes_values']
+    assert len(valores) == 2
+    modificada, agregada = valores.sort_values('id')['id'].tolist()
+    assert actual.loc[modificada, 'value'] == 9.99
+    assert agregada == completas['indexes_values']['id'].max() + 1
+    assert actual.loc[agregada, 'date'] == nueva['date'].iloc[-1]
@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+from modules import parquetStore
+
+pytest.importorskip('pyarrow')
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+
+
+@pytest.fixture(scope='module')
+def tabla():
+    return pd.read_csv(os.path.join(RAIZ, 'Indices_Total.csv'), parse_dates=['date'])
+
+
+def _filtrar(tabla, indices=None, desde=None, hasta=None):
+    mascara = pd.Series(True, index=tabla.index)
+    if indices is not None:
+        mascara &= tabla['index_name'].isin(indices)
+    if desde is not None:
+        mascara &= tabla['date'] >= pd.Timestamp(desde)
+    if hasta is not None:
+        mascara &= tabla['date'] <= pd.Timestamp(hasta)
+    return tabla[mascara].sort_values(['index_name', 'date'], kind='stable').reset_index(drop=True)
+
+
+def _comparar(leida, esperada):
+    leida = leida.assign(date=pd.to_datetime(leida['date']).astype('datetime64[ns]'))
+    pd.testing.assert_frame_equal(leida, esperada, check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize('por_decada', [False, True])
+@pytest.mark.parametrize('filtros', [
+    {},
+    {'indices': ['ONI', 'SOI']},
+    {'desde': '1997-01-01', 'hasta': '1998-12-01'},
+    {'indices': ['Niño 3.4'], 'desde': '2009-06-01', 'hasta': '2021-03-01'},
+    {'indices': ['ONI'], 'desde': '2100-01-01'},
+])
+def test_query_igual_a_filtrar(tabla, tmp_path, por_decada, filtros):
+    folder = parquetStore.writeDataset(tabla, str(tmp_path / 'Indices_Total_parquet'), por_decada=por_decada)
+    _comparar(parquetStore.query(folder, **filtros), _filtrar(tabla, **filtros))
+
+
+def test_query_columnas(tabla, tmp_path):
+    folder = parquetStore.writeDataset(tabla, str(tmp_path / 'Indices_Total_parquet'))
+    leida = parquetStore.query(folder, indices=['MEI'], columnas=['date', 'value'])
+    esperada = _filtrar(tabla, indices=['MEI'])[['date', 'value']]
+    _comparar(leida, esperada)
+
+
+def test_reescribir_reemplaza_la_carpeta(tabla, tmp_path):
+    folder = str(tmp_path / 'Indices_Total_parquet')
+    parquetStore.writeDataset(tabla, folder)
+    solo_oni = tabla[tabla['index_name'] == 'ONI']
+    parquetStore.writeDataset(solo_oni, folder)
+    assert set(parquetStore.query(folder)['index_name']) == {'ONI'}
+    assert sorted(os.listdir(tmp_path)) == ['Indices_Total_parquet']
@@ -0,0 +1,55 @@
+import io
+import os
+
+import pytest
+
+from modules import convertirCSV
+from modules import LongtoWide
+from modules import pipeline
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+DATA = os.path.join(RAIZ, 'data')
+
+
+@pytest.fixture(scope='module')
+def datos():
+    tablas = convertirCSV.dataprocesser(DATA, escribir_csv=False)
+    tablas['roni'] = LongtoWide.readCPCSeasonal(os.path.join(DATA, pipeline.CPC_ESTACIONALES['roni']))
+    return tablas
+
+
+def _csv(tabla):
+    buffer = io.StringIO()
+    tabla.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def test_lote_igual_a_por_indice(datos):
+    lote = pipeline.buildTable(datos, batch=True)
+    por_indice = pipeline.buildTable(datos, batch=False)
+    assert list(lote.dtypes) == list(por_indice.dtypes)
+    assert _csv(lote) == _csv(por_indice)
+
+
+def test_grafo_clasifica_en_lote():
+    tareas = {t['nombre']: t for t in pipeline.buildGraph(DATA)}
+    ingestas = {nombre for nombre in tareas if nombre.startswith('ingesta:')}
+    assert set(tareas['clasificar']['deps']) == ingestas
+    assert not [nombre for nombre in tareas if nombre.startswith('indice:')]
+    for nombre, tarea in tareas.items():
+        if nombre.startswith('exportar:'):
+            assert tarea['deps'] == ('clasificar',)
+
+
+def test_suavizar_agrega_columna(datos):
+    tabla = pipeline.buildTable(datos)
+    suavizada = pipeline.buildTable(datos, suavizar=True)
+    assert list(suavizada.columns) == list(tabla.columns) + [pipeline.COLUMNA_SUAVIZADA]
+    assert _csv(suavizada.drop(columns=[pipeline.COLUMNA_SUAVIZADA])) == _csv(tabla)
+    sin_intensidad = ~tabla['type'].isin(['Débil', 'Moderado', 'Fuerte', 'Muy Fuerte']).to_numpy()
+    assert (suavizada['type_event'].to_numpy()[sin_intensidad] == tabla['type'].to_numpy()[sin_intensidad]).all()
+
+
+def test_suavizar_cambia_firma_de_clasificar():
+    tareas = {t['nombre']: t for t in pipeline.buildGraph(DATA, suavizar=True)}
+    assert tareas['clasificar']['firma'] == 'suavizar'
@@ -0,0 +1,87 @@
+import pytest
+
+from modules import taskgraph
+
+
+def _grafo(llamadas, firma_a='1', salidas=()):
+    def a():
+        llamadas.append('a')
+        return 2
+
+    def b(x):
+        llamadas.append('b')
+        return x * 10
+
+    def c():
+        llamadas.append('c')
+        return 5
+
+    def d(x, y):
+        llamadas.append('d')
+        return x + y
+
+    return [
+        taskgraph.task('a', a, firma=firma_a),
+        taskgraph.task('b', b, deps=['a'], salidas=salidas),
+        taskgraph.task('c', c),
+        taskgraph.task('d', d, deps=['b', 'c']),
+    ]
+
+
+def _origenes(resultados):
+    return {nombre: stats['origen'] for nombre, stats in resultados['_stats'].items()}
+
+
+def test_segunda_ejecucion_desde_cache(tmp_path):
+    llamadas = []
+    resultados = taskgraph.run(_grafo(llamadas), jobs=2, cache_dir=str(tmp_path))
+    assert resultados['d'] == 25
+    assert sorted(llamadas) == ['a', 'b', 'c', 'd']
+
+    llamadas.clear()
+    resultados = taskgraph.run(_grafo(llamadas), jobs=2, cache_dir=str(tmp_path))
+    assert llamadas == []
+    assert set(_origenes(resultados).values()) == {'caché'}
+
+
+def test_firma_invalida_la_tarea_y_sus_dependientes(tmp_path):
+    taskgraph.run(_grafo([]), cache_dir=str(tmp_path))
+    llamadas = []
+    taskgraph.run(_grafo(llamadas, firma_a='2'), cache_dir=str(tmp_path))
+    assert sorted(llamadas) == ['a', 'b', 'd']
+    assert taskgraph.cacheStatus(_grafo([], firma_a='2'), str(tmp_path)) == {'a': True, 'b': True, 'c': True,
+                                                                            'd': True}
+    assert not taskgraph.cacheStatus(_grafo([], firma_a='3'), str(tmp_path))['d']
+
+
+def test_salida_borrada_vuelve_a_ejecutar(tmp_path):
+    salida = tmp_path / 'tabla.csv'
+    salida.write_text('x\n')
+    taskgraph.run(_grafo([], salidas=[str(salida)]), cache_dir=str(tmp_path / 'cache'))
+    salida.unlink()
+    llamadas = []
+    taskgraph.run(_grafo(llamadas, salidas=[str(salida)]), cache_dir=str(tmp_path / 'cache'))
+    assert sorted(llamadas) == ['b']
+
+
+def test_cambio_de_codigo_invalida_la_cache(tmp_path, monkeypatch):
+    taskgraph.run(_grafo([]), cache_dir=str(tmp_path))
+    original = taskgraph._firmaCodigo
+    monkeypatch.setattr(taskgraph, '_firmaCodigo', lambda funcion: original(funcion) + 'cambio')
+    llamadas = []
+    taskgraph.run(_grafo(llamadas), cache_dir=str(tmp_path))
+    assert sorted(llamadas) == ['a', 'b', 'c', 'd']
+
+
+def test_objetivos_ejecutan_solo_sus_dependencias(tmp_path):
+    llamadas = []
+    resultados = taskgraph.run(_grafo(llamadas), cache_dir=str(tmp_path), objetivos=['b'])
+    assert resultados['b'] == 20
+    assert sorted(llamadas) == ['a', 'b']
+
+
+def test_grafo_invalido():
+    with pytest.raises(ValueError):
+        taskgraph.plan([taskgraph.task('a', lambda x: x, deps=['falta'])])
+    with pytest.raises(ValueError):
+        taskgraph.plan([taskgraph.task('a', lambda x: x, deps=['b']), taskgraph.task('b', lambda x: x, deps=['a'])])